@@ -5,9 +5,9 @@ import logging
 from pathlib import Path
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 
-from .const import DOMAIN, PLATFORMS
+from .const import DOMAIN, EVENT_PAYMENTS_CHANGED, PLATFORMS
 from .coordinator import CommunalApartmentDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,6 +21,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    @callback
+    def handle_payments_changed(event: Event) -> None:
+        """Refresh sensors when the add-on reports changed payments."""
+        _LOGGER.debug("Payments changed in add-on: %s", event.data)
+        hass.async_create_task(coordinator.async_request_refresh())
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_PAYMENTS_CHANGED, handle_payments_changed))
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
@@ -31,6 +39,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await hass.async_add_executor_job(coordinator.database.close)
     
     return unload_ok
@@ -14,3 +14,6 @@ DEFAULT_DB_PATH = "/data/communal_apartment.db"
 PAYMENT_TYPE_ELECTRICITY = "electricity"
 PAYMENT_TYPE_GAS = "gas"
 PAYMENT_TYPE_WATER = "water"
+
+# Fired by the add-on after payments change - must match ha_client.py in the add-on
+EVENT_PAYMENTS_CHANGED = "wg_hassio_communal_apartment_payments_changed"
@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
+from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import DOMAIN
-from .database import CommunalApartmentDatabase
+from .database import PAYMENT_TYPES, CommunalApartmentDatabase
+from .energy_statistics import async_import_statistics
 
 _LOGGER = logging.getLogger(__name__)
 
-UPDATE_INTERVAL = timedelta(minutes=5)
+# Fallback poll; changes made in the add-on trigger a refresh through EVENT_PAYMENTS_CHANGED
+UPDATE_INTERVAL = timedelta(hours=1)
 
 
 class CommunalApartmentDataUpdateCoordinator(DataUpdateCoordinator):
@@ -27,77 +30,66 @@ class CommunalApartmentDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=UPDATE_INTERVAL,
         )
         self.hass = hass
+        self.entry = entry
         self.db_path = entry.data["db_path"]
         self.database = CommunalApartmentDatabase(self.db_path)
+        self._statistics_pending = False
+        self._data_version: int | None = None
     
     @property
     def currency(self) -> str:
         """Get currency from Home Assistant configuration."""
         return getattr(self.hass.config, "currency", "EUR")
 
+    def _refresh(self) -> dict[str, Any] | None:
+        """Read totals from the add-on's summary table. Returns None when the database has not changed."""
+        data_version = self.database.get_data_version()
+        if data_version == self._data_version:
+            return None
+
+        # One row per payment type, maintained by the add-on on every write
+        totals = self.database.get_payment_totals()
+        # Forecasts are maintained by the add-on as well, only read them here
+        forecasts = self.database.get_forecasts()
+        self._data_version = data_version
+
+        data = {}
+        for type_id, system_name in PAYMENT_TYPES.items():
+            type_totals = totals.get(type_id, {})
+            data[system_name] = {
+                "total_amount": round(type_totals.get("total_amount", 0.0), 6),
+                "total_volume": round(type_totals.get("total_volume", 0.0), 6),
+                "last_payment": type_totals.get("last_payment"),
+                "forecast": forecasts.get(system_name),
+            }
+        return data
+
     async def _async_update_data(self):
-        """Fetch data from database."""
+        """Fetch changes from database."""
         try:
-            _LOGGER.info("Fetching data from database: %s", self.db_path)
-            
-            # Fetch all payments
-            payments = await self.hass.async_add_executor_job(
-                self.database.get_all_payments
-            )
-            
-            _LOGGER.info("Retrieved %d payments from database", len(payments))
-            
-            # Calculate totals by payment type
-            data = {
-                "payments": payments,
-                "electricity": {
-                    "total_amount": 0.0,
-                    "total_volume": 0.0,
-                    "last_payment": None,
-                },
-                "gas": {
-                    "total_amount": 0.0,
-                    "total_volume": 0.0,
-                    "last_payment": None,
-                },
-                "water": {
-                    "total_amount": 0.0,
-                    "total_volume": 0.0,
-                    "last_payment": None,
-                },
-            }
-            
-            # Process payments - use system_name directly from payment
-            for payment in payments:
-                system_name = payment.get("system_name", "")
-                
-                if system_name in data:
-                    amount = payment.get("amount", 0.0) or 0.0
-                    volume = payment.get("volume") or 0.0
-                    
-                    _LOGGER.debug("Processing payment: system_name=%s, amount=%s, volume=%s", 
-                                 system_name, amount, volume)
-                    
-                    data[system_name]["total_amount"] += amount
-                    if volume:
-                        data[system_name]["total_volume"] += volume
-                    
-                    # Track last payment
-                    payment_date = payment.get("payment_date")
-                    if payment_date:
-                        if data[system_name]["last_payment"] is None:
-                            data[system_name]["last_payment"] = payment
-                        else:
-                            last_date = data[system_name]["last_payment"].get("payment_date", "")
-                            if payment_date > last_date:
-                                data[system_name]["last_payment"] = payment
-            
+            data = await self.hass.async_add_executor_job(self._refresh)
+        except Exception as err:
+            _LOGGER.error("Error communicating with database: %s", err, exc_info=True)
+            raise UpdateFailed(f"Error communicating with database: {err}")
+
+        if data is None:
+            _LOGGER.debug("Database unchanged, keeping totals")
+            data = self.data
+        else:
             _LOGGER.info("Calculated totals: electricity=%s, gas=%s, water=%s",
                         data["electricity"]["total_volume"],
                         data["gas"]["total_volume"],
                         data["water"]["total_volume"])
-            
-            return data
-        except Exception as err:
-            _LOGGER.error("Error communicating with database: %s", err, exc_info=True)
-            raise UpdateFailed(f"Error communicating with database: {err}")
+            self._statistics_pending = True
+
+        # Energy dashboard data comes from per-period long-term statistics;
+        # a failed import (e.g. recorder not ready) is retried on the next refresh
+        if self._statistics_pending:
+            try:
+                await async_import_statistics(self.hass, self.database, self.currency)
+                self._statistics_pending = False
+            except Exception as err:
+                _LOGGER.warning("Could not import long-term statistics, will retry: %s", err)
+
+        return data
+
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -16,84 +17,121 @@ PAYMENT_TYPES = {
 }
 
 
+# Columns the sensors need
+PAYMENT_COLUMNS = "id, payment_type_id, amount, volume, payment_date, period, created_at, updated_at"
+
+
+def _payment_factory(cursor: sqlite3.Cursor, row: tuple) -> dict[str, Any]:
+    """Row factory: payment dict with system_name resolved."""
+    payment = {column[0]: value for column, value in zip(cursor.description, row)}
+    payment["system_name"] = PAYMENT_TYPES.get(payment.get("payment_type_id"), "")
+    return payment
+
+
 class CommunalApartmentDatabase:
-    """Database interface for reading payment data."""
+    """Database interface for reading payment data.
+
+    Uses one read-only connection held open across refreshes, so reads never
+    take a write lock on the add-on's database.
+    """
 
     def __init__(self, db_path: str) -> None:
         """Initialize database connection."""
         self.db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def get_all_payments(self) -> list[dict[str, Any]]:
-        """Get all payments from database."""
-        try:
+        """Get read-only connection kept open between refreshes.
+
+        PRAGMA data_version only changes for commits made by other
+        connections, so change detection needs the same connection each time.
+        """
+        if self._conn is None:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._conn.row_factory = _payment_factory
+        return self._conn
+
+    def close(self) -> None:
+        """Close connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_data_version(self) -> int:
+        """Get data version; it changes whenever the add-on commits a write."""
+        with self._lock:
+            return self._get_connection().execute("PRAGMA data_version").fetchone()["data_version"]
+
+    def get_payment_totals(self) -> dict[int, dict[str, Any]]:
+        """Get total amount and volume and the last payment per payment type ID.
+
+        Reads the add-on's payment_summary table (one row per type) joined
+        with the last payment it points to.
+        """
+        with self._lock:
             conn = self._get_connection()
-            cursor = conn.cursor()
+            try:
+                cursor = conn.execute("""
+                    SELECT s.payment_type_id, s.total_amount, s.total_volume,
+                           p.id, p.amount, p.volume, p.payment_date, p.period, p.created_at, p.updated_at
+                    FROM payment_summary s
+                    LEFT JOIN payments p ON p.id = s.last_payment_id
+                """)
+            except sqlite3.OperationalError as err:
+                # Older add-on versions have no summary table: aggregate payments instead
+                _LOGGER.debug("Payment summary not available: %s", err)
+                cursor = conn.execute(f"""
+                    SELECT {PAYMENT_COLUMNS}, total_amount, total_volume
+                    FROM (
+                        SELECT {PAYMENT_COLUMNS},
+                               TOTAL(amount) OVER w AS total_amount,
+                               TOTAL(volume) OVER w AS total_volume,
+                               ROW_NUMBER() OVER (PARTITION BY payment_type_id
+                                                  ORDER BY payment_date DESC, created_at DESC, id DESC) AS row_number
+                        FROM payments
+                        WINDOW w AS (PARTITION BY payment_type_id)
+                    )
+                    WHERE row_number = 1
+                """)
+            totals = {}
+            for row in cursor.fetchall():
+                total_amount = row.pop("total_amount")
+                total_volume = row.pop("total_volume")
+                totals[row["payment_type_id"]] = {
+                    "total_amount": float(total_amount or 0.0),
+                    "total_volume": float(total_volume or 0.0),
+                    "last_payment": row if row["id"] is not None else None,
+                }
+            return totals
 
-            cursor.execute("""
-                SELECT p.*
-                FROM payments p
-                ORDER BY p.payment_date DESC, p.created_at DESC
+    def get_period_totals(self) -> list[dict[str, Any]]:
+        """Get volume and amount per payment type and period, oldest first."""
+        with self._lock:
+            cursor = self._get_connection().execute("""
+                SELECT payment_type_id, period,
+                       TOTAL(volume) AS volume, TOTAL(amount) AS amount
+                FROM payments
+                GROUP BY payment_type_id, period
+                ORDER BY payment_type_id, period
             """)
+            return cursor.fetchall()
 
-            rows = cursor.fetchall()
-            conn.close()
-
-            payments = []
-            for row in rows:
-                # Get payment_type_id and map to system_name
-                payment_type_id = row["payment_type_id"]
-                system_name = PAYMENT_TYPES.get(payment_type_id, "")
-                payment_type_name = ""  # Will be translated in coordinator if needed
-                
-                # Get optional reading fields safely
-                previous_reading = None
-                try:
-                    if row["previous_reading"] is not None:
-                        previous_reading = float(row["previous_reading"])
-                except (KeyError, TypeError, ValueError):
-                    pass
-                
-                current_reading = None
-                try:
-                    if row["current_reading"] is not None:
-                        current_reading = float(row["current_reading"])
-                except (KeyError, TypeError, ValueError):
-                    pass
-                
-                volume = None
-                try:
-                    if row["volume"] is not None:
-                        volume = float(row["volume"])
-                except (KeyError, TypeError, ValueError):
-                    pass
-                
-                payments.append({
-                    "id": row["id"],
-                    "payment_type_id": payment_type_id,
-                    "payment_type_name": payment_type_name,
-                    "system_name": system_name,
-                    "amount": float(row["amount"]) if row["amount"] else 0.0,
-                    "payment_date": row["payment_date"],
-                    "period": row["period"],
-                    "receipt_number": row["receipt_number"],
-                    "payment_method": row["payment_method"],
-                    "notes": row["notes"],
-                    "previous_reading": previous_reading,
-                    "current_reading": current_reading,
-                    "volume": volume,
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"],
-                })
-            return payments
-        except Exception as err:
-            _LOGGER.error("Error getting payments: %s", err)
-            return []
+    def get_forecasts(self) -> dict[str, dict[str, Any]]:
+        """Get next period forecast per payment type system name, computed by the add-on."""
+        with self._lock:
+            try:
+                cursor = self._get_connection().execute("""
+                    SELECT payment_type_id, period, volume, amount, unit_price, method
+                    FROM payment_forecast
+                """)
+            except sqlite3.OperationalError as err:
+                # Older add-on versions have no forecast table
+                _LOGGER.debug("Forecasts not available: %s", err)
+                return {}
+            return {row["system_name"]: row for row in cursor.fetchall()}
 
     def get_all_payment_types(self) -> list[dict[str, Any]]:
         """Get all payment types from constants (not from database)."""
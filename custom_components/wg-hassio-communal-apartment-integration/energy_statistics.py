@@ -0,0 +1,124 @@
+"""Long-term statistics import for Communal Apartment."""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant before 2025.4 only knows has_mean
+    StatisticMeanType = None
+
+from .const import DOMAIN, PAYMENT_TYPE_ELECTRICITY, PAYMENT_TYPE_GAS, PAYMENT_TYPE_WATER
+from .database import CommunalApartmentDatabase
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consumption units per payment type
+CONSUMPTION_UNITS = {
+    PAYMENT_TYPE_ELECTRICITY: "kWh",
+    PAYMENT_TYPE_GAS: "m³",
+    PAYMENT_TYPE_WATER: "m³",
+}
+
+SUM_TOLERANCE = 1e-6
+
+
+def statistic_id(system_name: str, kind: str) -> str:
+    """Get external statistic ID, e.g. <domain>:electricity_consumption."""
+    return f"{DOMAIN}:{system_name}_{kind}"
+
+
+def period_start(period: str) -> datetime | None:
+    """Get start of period ("YYYY-MM") as local midnight of its first day."""
+    try:
+        year, month = period.split("-")[:2]
+        return dt_util.start_of_local_day(date(int(year), int(month), 1))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _timestamp(value: Any) -> float:
+    """Get timestamp of a statistics row start (datetime in older HA, float in newer)."""
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+async def _async_import_series(hass: HomeAssistant, metadata: dict[str, Any],
+                               series: list[tuple[datetime, float]]) -> int:
+    """Import series of (period start, value) as cumulative statistics.
+
+    Only periods after the last imported one are sent, unless the stored
+    running sum no longer matches (a back-dated or edited payment) or the last
+    imported period has no payments any more, in which case the whole series
+    is imported again. Returns number of imported rows.
+    """
+    cumulative = 0.0
+    rows = []
+    for start, value in series:
+        cumulative += value
+        rows.append({"start": start, "state": value, "sum": cumulative})
+
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, metadata["statistic_id"], True, {"sum"}
+    )
+    last_rows = last.get(metadata["statistic_id"]) if last else None
+    if last_rows:
+        last_start = _timestamp(last_rows[0]["start"])
+        last_sum = last_rows[0].get("sum") or 0.0
+        if not any(row["start"].timestamp() == last_start for row in rows):
+            # Payments of the last imported period were deleted: it becomes an empty period
+            earlier = [row for row in rows if row["start"].timestamp() < last_start]
+            rows.append({"start": dt_util.utc_from_timestamp(last_start), "state": 0.0,
+                         "sum": earlier[-1]["sum"] if earlier else 0.0})
+            rows.sort(key=lambda row: row["start"])
+        matching = next(row for row in rows if row["start"].timestamp() == last_start)
+        if abs(matching["sum"] - last_sum) < SUM_TOLERANCE:
+            rows = [row for row in rows if row["start"].timestamp() > last_start]
+
+    if rows:
+        async_add_external_statistics(hass, metadata, rows)
+    return len(rows)
+
+
+async def async_import_statistics(hass: HomeAssistant, database: CommunalApartmentDatabase,
+                                  currency: str) -> None:
+    """Import per-period consumption and cost of every payment type into long-term statistics."""
+    totals = await hass.async_add_executor_job(database.get_period_totals)
+
+    series: dict[str, dict[str, list[tuple[datetime, float]]]] = {
+        system_name: {"consumption": [], "cost": []} for system_name in CONSUMPTION_UNITS
+    }
+    for item in totals:
+        start = period_start(item["period"])
+        if item["system_name"] not in series or start is None:
+            continue
+        series[item["system_name"]]["consumption"].append((start, item["volume"]))
+        series[item["system_name"]]["cost"].append((start, item["amount"]))
+
+    imported = 0
+    for system_name, unit in CONSUMPTION_UNITS.items():
+        for kind, unit_of_measurement in (("consumption", unit), ("cost", currency)):
+            metadata = {
+                "has_sum": True,
+                "name": f"Utilities Tracker {system_name} {kind}",
+                "source": DOMAIN,
+                "statistic_id": statistic_id(system_name, kind),
+                "unit_of_measurement": unit_of_measurement,
+            }
+            if StatisticMeanType is not None:
+                metadata["mean_type"] = StatisticMeanType.NONE
+            else:
+                metadata["has_mean"] = False
+            imported += await _async_import_series(hass, metadata, series[system_name][kind])
+
+    if imported:
+        _LOGGER.info("Imported %d long-term statistics rows", imported)
@@ -4,7 +4,6 @@ from __future__ import annotations
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
-    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -14,6 +13,17 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, PAYMENT_TYPE_ELECTRICITY, PAYMENT_TYPE_GAS, PAYMENT_TYPE_WATER
 from .coordinator import CommunalApartmentDataUpdateCoordinator
 
+# Forecast sensor kinds (key of the forecast data)
+FORECAST_VOLUME = "volume"
+FORECAST_AMOUNT = "amount"
+
+# Consumption units per payment type
+UNITS = {
+    PAYMENT_TYPE_ELECTRICITY: "kWh",
+    PAYMENT_TYPE_GAS: "m³",
+    PAYMENT_TYPE_WATER: "m³",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,14 +38,24 @@ async def async_setup_entry(
         CommunalApartmentEnergySensor(coordinator, PAYMENT_TYPE_GAS, "Газ"),
         CommunalApartmentEnergySensor(coordinator, PAYMENT_TYPE_WATER, "Вода"),
     ]
+    for payment_type, name in (
+        (PAYMENT_TYPE_ELECTRICITY, "Электроэнергия"),
+        (PAYMENT_TYPE_GAS, "Газ"),
+        (PAYMENT_TYPE_WATER, "Вода"),
+    ):
+        sensors.append(CommunalApartmentForecastSensor(coordinator, payment_type, name, FORECAST_VOLUME))
+        sensors.append(CommunalApartmentForecastSensor(coordinator, payment_type, name, FORECAST_AMOUNT))
 
     async_add_entities(sensors, update_before_add=True)
 
 
 class CommunalApartmentEnergySensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Communal Apartment energy sensor."""
+    """Representation of a Communal Apartment energy sensor.
 
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    The sensor has no state class: long-term statistics are imported per
+    period by the coordinator (see energy_statistics.py) instead of being
+    compiled from state changes.
+    """
 
     def __init__(
         self,
@@ -95,3 +115,58 @@ class CommunalApartmentEnergySensor(CoordinatorEntity, SensorEntity):
                 attrs["last_payment_period"] = last_payment.get("period")
         
         return attrs
+
+
+class CommunalApartmentForecastSensor(CoordinatorEntity, SensorEntity):
+    """Forecast of next period consumption or cost of a payment type.
+
+    Forecasts are computed by the add-on whenever a payment is written.
+    """
+
+    def __init__(
+        self,
+        coordinator: CommunalApartmentDataUpdateCoordinator,
+        payment_type: str,
+        name: str,
+        kind: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._payment_type = payment_type
+        self._kind = kind
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{payment_type}_forecast_{kind}"
+
+        if kind == FORECAST_AMOUNT:
+            self._attr_name = f"{name} прогноз стоимости"
+            self._attr_device_class = SensorDeviceClass.MONETARY
+            self._attr_native_unit_of_measurement = coordinator.currency
+        else:
+            self._attr_name = f"{name} прогноз потребления"
+            self._attr_native_unit_of_measurement = UNITS.get(payment_type)
+
+    @property
+    def _forecast(self) -> dict | None:
+        """Forecast data of the payment type."""
+        if not self.coordinator.data or self._payment_type not in self.coordinator.data:
+            return None
+        return self.coordinator.data[self._payment_type].get("forecast")
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        forecast = self._forecast
+        if not forecast or forecast.get(self._kind) is None:
+            return None
+        return float(forecast[self._kind])
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return additional state attributes."""
+        forecast = self._forecast
+        if not forecast:
+            return {}
+        return {
+            "period": forecast.get("period"),
+            "method": forecast.get("method"),
+            "unit_price": forecast.get("unit_price"),
+        }
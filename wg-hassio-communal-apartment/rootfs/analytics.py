@@ -0,0 +1,91 @@
+"""Monthly payment analytics for Communal Apartment add-on."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from database import Database
+
+_LOGGER = logging.getLogger(__name__)
+
+ROLLING_WINDOW = 3  # Periods in rolling averages
+TARIFF_CHANGE_THRESHOLD = 0.01  # Unit price change (1%) reported as a tariff change
+
+
+def _change(current: float | None, previous: float | None) -> tuple[float | None, float | None]:
+    """Get (delta, percent change) between two values."""
+    if current is None or previous is None:
+        return None, None
+    delta = current - previous
+    percent = delta / previous * 100 if previous else None
+    return round(delta, 4), round(percent, 2) if percent is not None else None
+
+
+def _round(value: float | None, digits: int = 4) -> float | None:
+    """Round value, keeping None."""
+    return round(value, digits) if value is not None else None
+
+
+class PaymentAnalytics:
+    """Per-period cost, consumption and tariff trends, cached until the next payment write."""
+
+    def __init__(self, db: Database, payment_types: dict[int, str]) -> None:
+        """Initialize analytics."""
+        self.db = db
+        self.payment_types = payment_types
+        self._cache: dict[int, tuple[int, dict[str, Any]]] = {}
+
+    def get_monthly(self, window: int = ROLLING_WINDOW) -> dict[str, Any]:
+        """Get monthly analytics grouped by payment type system name."""
+        cached = self._cache.get(window)
+        if cached and cached[0] == self.db.data_generation:
+            return cached[1]
+
+        generation = self.db.data_generation
+        result = self._compute(window)
+        self._cache[window] = (generation, result)
+        return result
+
+    def _compute(self, window: int) -> dict[str, Any]:
+        """Build analytics from SQL rollups."""
+        result: dict[str, Any] = {
+            system_name: {"periods": [], "tariff_changes": []}
+            for system_name in self.payment_types.values()
+        }
+
+        for row in self.db.get_monthly_rollups(window):
+            system_name = self.payment_types.get(row["payment_type_id"])
+            if system_name is None:
+                continue
+
+            cost_delta, cost_change = _change(row["cost"], row["previous_cost"])
+            consumption_delta, consumption_change = _change(row["consumption"], row["previous_consumption"])
+            _unit_price_delta, unit_price_change = _change(row["unit_price"], row["previous_unit_price"])
+
+            period = {
+                "period": row["period"],
+                "payment_count": row["payment_count"],
+                "cost": _round(row["cost"], 2),
+                "consumption": _round(row["consumption"]),
+                "unit_price": _round(row["unit_price"]),
+                "cost_delta": cost_delta,
+                "cost_change_percent": cost_change,
+                "consumption_delta": consumption_delta,
+                "consumption_change_percent": consumption_change,
+                "cost_average": _round(row["cost_average"], 2),
+                "consumption_average": _round(row["consumption_average"]),
+                "tariff_changed": unit_price_change is not None
+                                  and abs(unit_price_change) >= TARIFF_CHANGE_THRESHOLD * 100,
+            }
+            result[system_name]["periods"].append(period)
+
+            if period["tariff_changed"]:
+                result[system_name]["tariff_changes"].append({
+                    "period": row["period"],
+                    "unit_price": period["unit_price"],
+                    "previous_unit_price": _round(row["previous_unit_price"]),
+                    "change_percent": unit_price_change,
+                })
+
+        _LOGGER.debug("Analytics computed for window %d", window)
+        return result
@@ -7,10 +7,23 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from forecast import forecast_next_period
+
 _LOGGER = logging.getLogger(__name__)
 
 DB_FILE = "/data/communal_apartment.db"
 
+# Payment columns that can be requested through sparse field selection
+PAYMENT_FIELDS = (
+    "id", "payment_type_id", "amount", "payment_date", "period", "receipt_number",
+    "payment_method", "notes", "previous_reading", "current_reading", "volume",
+    "unit_price", "created_at", "updated_at",
+)
+EXPORT_CHUNK_SIZE = 500  # Rows fetched from the cursor per export chunk
+
+# Optional numeric columns: returned only when set
+PAYMENT_OPTIONAL_NUMBERS = ("previous_reading", "current_reading", "volume", "unit_price")
+
 
 class Database:
     """SQLite database handler for Communal Apartment add-on."""
@@ -19,6 +32,11 @@ class Database:
         """Initialize database connection."""
         self.db_path = Path(DB_FILE)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Incremented on every payment write, lets callers cache derived data
+        self.data_generation = 0
+        # Payment types whose forecast is out of date (None: all), refreshed outside writes
+        self._stale_forecasts: set[int] | None = None
+        self._forecast_generation: int | None = None
         self._init_database()
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -72,10 +90,54 @@ class Database:
             except sqlite3.OperationalError:
                 pass  # Column already exists
 
+            # Create payment_summary table (итоги по типу платежа, обновляются при каждой записи)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS payment_summary (
+                    payment_type_id INTEGER PRIMARY KEY,
+                    payment_count INTEGER NOT NULL,
+                    total_amount REAL NOT NULL,
+                    total_volume REAL NOT NULL,
+                    last_payment_id INTEGER,
+                    last_payment_date TEXT,
+                    last_payment_amount REAL,
+                    last_payment_volume REAL
+                )
+            """)
+
+            # Create payment_forecast table (прогноз следующего периода, пересчитывается после записей)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS payment_forecast (
+                    payment_type_id INTEGER PRIMARY KEY,
+                    period TEXT NOT NULL,
+                    volume REAL,
+                    amount REAL NOT NULL,
+                    unit_price REAL,
+                    method TEXT NOT NULL,
+                    history_periods INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+
             # Create indexes
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_type ON payments(payment_type_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_date ON payments(payment_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_period ON payments(period)")
+            # Latest meter reading per type is a single seek on this partial covering index
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_payments_type_reading
+                ON payments(payment_type_id, payment_date DESC, id DESC, current_reading)
+                WHERE current_reading IS NOT NULL
+            """)
+            # Keyset pagination walks payments by (payment_date, id)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_date_id ON payments(payment_date, id)")
+            # Last payment per type is a single seek
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_payments_type_latest
+                ON payments(payment_type_id, payment_date, created_at, id)
+            """)
+
+            # Rebuild summary so it is consistent with payments after upgrade or manual edits
+            self._rebuild_payment_summary(cursor)
 
             conn.commit()
             conn.close()
@@ -84,6 +146,185 @@ class Database:
             _LOGGER.error("Error initializing database: %s", err)
             raise
 
+    def _rebuild_payment_summary(self, cursor: sqlite3.Cursor) -> None:
+        """Recompute summary rows of all payment types from payments in the current transaction."""
+        cursor.execute("DELETE FROM payment_summary")
+        cursor.execute("""
+            INSERT INTO payment_summary (payment_type_id, payment_count, total_amount, total_volume,
+                                         last_payment_id, last_payment_date, last_payment_amount, last_payment_volume)
+            SELECT payment_type_id, payment_count, total_amount, total_volume,
+                   id, payment_date, amount, COALESCE(volume, 0)
+            FROM (
+                SELECT id, payment_type_id, payment_date, amount, volume,
+                       COUNT(*) OVER w AS payment_count,
+                       SUM(amount) OVER w AS total_amount,
+                       SUM(COALESCE(volume, 0)) OVER w AS total_volume,
+                       ROW_NUMBER() OVER (PARTITION BY payment_type_id
+                                          ORDER BY payment_date DESC, created_at DESC, id DESC) AS row_number
+                FROM payments
+                WINDOW w AS (PARTITION BY payment_type_id)
+            )
+            WHERE row_number = 1
+        """)
+
+    def _apply_summary_delta(self, cursor: sqlite3.Cursor, payment_type_id: int, count: int,
+                             amount: float, volume: float) -> None:
+        """Add count, amount and volume changes to the summary row of payment type."""
+        cursor.execute("""
+            INSERT INTO payment_summary (payment_type_id, payment_count, total_amount, total_volume)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(payment_type_id) DO UPDATE SET
+                payment_count = payment_count + excluded.payment_count,
+                total_amount = total_amount + excluded.total_amount,
+                total_volume = total_volume + excluded.total_volume
+        """, (payment_type_id, count, amount, volume))
+        cursor.execute("DELETE FROM payment_summary WHERE payment_type_id = ? AND payment_count <= 0",
+                       (payment_type_id,))
+        self._mark_forecast_stale(payment_type_id)
+
+    @staticmethod
+    def _offer_last_payment(cursor: sqlite3.Cursor, payment_type_id: int, payment_id: int, payment_date: str,
+                            amount: float, volume: float) -> None:
+        """Make a newly inserted payment the last payment of its type when dated on or after it.
+
+        A new payment has the latest created_at and id, so its date alone decides.
+        """
+        cursor.execute("""
+            UPDATE payment_summary
+            SET last_payment_id = ?, last_payment_date = ?, last_payment_amount = ?, last_payment_volume = ?
+            WHERE payment_type_id = ? AND (last_payment_date IS NULL OR last_payment_date <= ?)
+        """, (payment_id, payment_date, amount, volume, payment_type_id, payment_date))
+
+    @staticmethod
+    def _reread_last_payment(cursor: sqlite3.Cursor, payment_type_id: int, payment_id: int | None,
+                             payment_date: str | None = None) -> None:
+        """Re-read last payment of payment type when payment_id was it or, dated payment_date, may now be it."""
+        cursor.execute("""
+            UPDATE payment_summary
+            SET (last_payment_id, last_payment_date, last_payment_amount, last_payment_volume) = (
+                SELECT id, payment_date, amount, COALESCE(volume, 0)
+                FROM payments
+                WHERE payment_type_id = ?
+                ORDER BY payment_date DESC, created_at DESC, id DESC
+                LIMIT 1
+            )
+            WHERE payment_type_id = ?
+              AND (last_payment_id = ? OR last_payment_date IS NULL OR last_payment_date <= ?)
+        """, (payment_type_id, payment_type_id, payment_id, payment_date))
+
+    def _mark_forecast_stale(self, payment_type_id: int) -> None:
+        """Mark forecast of payment type for the next refresh_payment_forecasts."""
+        if self._stale_forecasts is not None:
+            self._stale_forecasts.add(payment_type_id)
+
+    def refresh_payment_forecasts(self) -> bool:
+        """Recompute forecasts of payment types written since the last refresh.
+
+        Writes only mark types as stale, so any number of writes costs one fit
+        per type here. Returns True when forecasts were recomputed.
+        """
+        generation = self.data_generation
+        if generation == self._forecast_generation:
+            return False
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            self._refresh_payment_forecast(cursor, self._stale_forecasts)
+            conn.commit()
+            conn.close()
+        except Exception as err:
+            _LOGGER.error("Error refreshing payment forecasts: %s", err)
+            return False
+        self._stale_forecasts = set()
+        self._forecast_generation = generation
+        return True
+
+    def _refresh_payment_forecast(self, cursor: sqlite3.Cursor, payment_type_ids: set[int] | None = None) -> None:
+        """Recompute next period forecast of payment types (all types when None) in the current transaction."""
+        where = ""
+        params: list[Any] = []
+        if payment_type_ids is not None:
+            if not payment_type_ids:
+                return
+            where = f"WHERE payment_type_id IN ({', '.join('?' * len(payment_type_ids))})"
+            params.extend(payment_type_ids)
+
+        cursor.execute(f"""
+            SELECT payment_type_id, period,
+                   SUM(CASE WHEN volume > 0 THEN volume END) AS consumption,
+                   SUM(CASE WHEN volume > 0 THEN amount END) AS consumption_cost,
+                   SUM(amount) AS cost
+            FROM payments
+            {where}
+            GROUP BY payment_type_id, period
+            ORDER BY payment_type_id, period
+        """, params)
+        history: dict[int, list[dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            # Unit price only comes from payments with consumption
+            history.setdefault(row["payment_type_id"], []).append({
+                "period": row["period"],
+                "consumption": row["consumption"],
+                "cost": row["consumption_cost"] if row["consumption"] else row["cost"]
+            })
+
+        cursor.execute(f"DELETE FROM payment_forecast {where}", params)
+        now = datetime.now().isoformat()
+        for type_id, items in history.items():
+            try:
+                forecast = forecast_next_period(items)
+            except (ValueError, ZeroDivisionError) as err:
+                _LOGGER.warning("Could not forecast payment type %s: %s", type_id, err)
+                continue
+            if forecast:
+                cursor.execute("""
+                    INSERT INTO payment_forecast (payment_type_id, period, volume, amount, unit_price,
+                                                  method, history_periods, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (type_id, forecast["period"], forecast["volume"], forecast["amount"], forecast["unit_price"],
+                      forecast["method"], forecast["history_periods"], now))
+
+    def get_payment_summary_by_type(self) -> dict[int, dict[str, Any]]:
+        """Get totals and last payment per payment type from the summary table."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM payment_summary")
+            rows = cursor.fetchall()
+            conn.close()
+
+            return {row["payment_type_id"]: {
+                "payment_count": row["payment_count"],
+                "total_amount": float(row["total_amount"]),
+                "total_volume": float(row["total_volume"]),
+                "last_payment_id": row["last_payment_id"],
+                "last_payment_date": row["last_payment_date"],
+                "last_payment_amount": float(row["last_payment_amount"] or 0.0),
+                "last_payment_volume": float(row["last_payment_volume"] or 0.0)
+            } for row in rows}
+        except Exception as err:
+            _LOGGER.error("Error getting payment summary: %s", err)
+            return {}
+
+    def get_payment_forecasts(self) -> dict[int, dict[str, Any]]:
+        """Get next period forecast per payment type from the forecast table."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT payment_type_id, period, volume, amount, unit_price, method, history_periods
+                FROM payment_forecast
+            """)
+            rows = cursor.fetchall()
+            conn.close()
+
+            return {row["payment_type_id"]: {
+                key: row[key] for key in ("period", "volume", "amount", "unit_price", "method", "history_periods")
+            } for row in rows}
+        except Exception as err:
+            _LOGGER.error("Error getting payment forecasts: %s", err)
+            return {}
+
     # ========== Payments Methods ==========
 
     def add_payment(self, payment_type_id: int, amount: float, payment_date: str, period: str,
@@ -119,8 +360,11 @@ class Database:
                   payment_method, notes, previous_reading, current_reading, volume, unit_price, now, now))
 
             payment_id = cursor.lastrowid
+            self._apply_summary_delta(cursor, payment_type_id, 1, amount, volume or 0.0)
+            self._offer_last_payment(cursor, payment_type_id, payment_id, payment_date, amount, volume or 0.0)
             conn.commit()
             conn.close()
+            self.data_generation += 1
             
             _LOGGER.info("Payment successfully saved to database: id=%s, type_id=%s, amount=%s, period=%s, "
                         "date=%s, volume=%s, unit_price=%s, readings=%s→%s",
@@ -132,6 +376,95 @@ class Database:
                          err, payment_type_id, amount, period, exc_info=True)
             return None
 
+    def add_payments(self, payments: list[dict[str, Any]]) -> int | None:
+        """Add many payments in one transaction. Returns number of added payments.
+
+        Each item has the arguments of add_payment.
+        """
+        try:
+            now = datetime.now().isoformat()
+            rows = []
+            for payment in payments:
+                volume = payment.get("volume")
+                amount = payment["amount"]
+                rows.append((
+                    payment["payment_type_id"], amount, payment["payment_date"], payment["period"],
+                    payment.get("receipt_number"), payment.get("payment_method"), payment.get("notes"),
+                    payment.get("previous_reading"), payment.get("current_reading"), volume,
+                    amount / volume if volume else None, now, now
+                ))
+
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO payments (payment_type_id, amount, payment_date, period, receipt_number,
+                                    payment_method, notes, previous_reading, current_reading, volume, unit_price,
+                                    created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            # type_id -> [count, amount, volume, latest payment_date]
+            deltas: dict[int, list[Any]] = {}
+            for row in rows:
+                delta = deltas.setdefault(row[0], [0, 0.0, 0.0, row[2]])
+                delta[0] += 1
+                delta[1] += row[1]
+                delta[2] += row[9] or 0.0
+                delta[3] = max(delta[3], row[2])
+            for type_id, (count, total_amount, total_volume, latest_date) in deltas.items():
+                self._apply_summary_delta(cursor, type_id, count, total_amount, total_volume)
+                self._reread_last_payment(cursor, type_id, None, latest_date)
+            conn.commit()
+            conn.close()
+            self.data_generation += 1
+
+            _LOGGER.info("Added %d payments in one transaction", len(rows))
+            return len(rows)
+        except Exception as err:
+            _LOGGER.error("Error adding payments: %s", err, exc_info=True)
+            return None
+
+    def get_payments_chunk(self, payment_type_id: int | None = None, period: str | None = None,
+                           date_from: str | None = None, date_to: str | None = None,
+                           after: tuple[str, int] | None = None,
+                           limit: int = EXPORT_CHUNK_SIZE) -> list[tuple]:
+        """Get chunk of payments (all PAYMENT_FIELDS as tuples), oldest first.
+
+        after is the (payment_date, id) of the last payment of the previous chunk;
+        each chunk is a separate short read, so no cursor stays open between chunks.
+        """
+        query = f"SELECT {', '.join(PAYMENT_FIELDS)} FROM payments WHERE 1=1"
+        params: list[Any] = []
+
+        if payment_type_id is not None:
+            query += " AND payment_type_id = ?"
+            params.append(payment_type_id)
+
+        if period is not None:
+            query += " AND period = ?"
+            params.append(period)
+
+        if date_from is not None:
+            query += " AND payment_date >= ?"
+            params.append(date_from)
+
+        if date_to is not None:
+            query += " AND payment_date <= ?"
+            params.append(date_to)
+
+        if after is not None:
+            query += " AND (payment_date, id) > (?, ?)"
+            params.extend(after)
+
+        query += " ORDER BY payment_date, id LIMIT ?"
+        params.append(limit)
+
+        conn = self._get_connection()
+        try:
+            return [tuple(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
     def get_all_payments(self, payment_type_id: int | None = None, period: str | None = None,
                         limit: int | None = None) -> list[dict[str, Any]]:
         """Get all payments with optional filters."""
@@ -223,6 +556,162 @@ class Database:
             _LOGGER.error("Error getting payments: %s", err)
             return []
 
+    def get_payments_page(self, payment_type_id: int | None = None, period: str | None = None,
+                          date_from: str | None = None, date_to: str | None = None,
+                          after: tuple[str, int] | None = None, limit: int = 50,
+                          fields: list[str] | None = None) -> list[dict[str, Any]]:
+        """Get page of payments, newest first.
+
+        after is the (payment_date, id) of the last payment of the previous page.
+        fields limits returned columns (id and payment_date are always included).
+        """
+        try:
+            columns = [field for field in PAYMENT_FIELDS if fields is None or field in fields
+                       or field in ("id", "payment_date")]
+
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            query = f"SELECT {', '.join(columns)} FROM payments WHERE 1=1"
+            params: list[Any] = []
+
+            if payment_type_id is not None:
+                query += " AND payment_type_id = ?"
+                params.append(payment_type_id)
+
+            if period is not None:
+                query += " AND period = ?"
+                params.append(period)
+
+            if date_from is not None:
+                query += " AND payment_date >= ?"
+                params.append(date_from)
+
+            if date_to is not None:
+                query += " AND payment_date <= ?"
+                params.append(date_to)
+
+            if after is not None:
+                query += " AND (payment_date, id) < (?, ?)"
+                params.extend(after)
+
+            query += " ORDER BY payment_date DESC, id DESC LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            conn.close()
+
+            payments = []
+            for row in rows:
+                payment = {}
+                for column in columns:
+                    value = row[column]
+                    if column in PAYMENT_OPTIONAL_NUMBERS:
+                        if value is not None:
+                            payment[column] = float(value)
+                    elif column == "amount":
+                        payment[column] = float(value)
+                    else:
+                        payment[column] = value
+                payments.append(payment)
+            return payments
+        except Exception as err:
+            _LOGGER.error("Error getting payments page: %s", err)
+            return []
+
+    def count_payments(self, payment_type_id: int | None = None, period: str | None = None,
+                       date_from: str | None = None, date_to: str | None = None) -> int:
+        """Count payments matching filters (served from payment_summary when only filtered by type)."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            if period is None and date_from is None and date_to is None:
+                query = "SELECT COALESCE(SUM(payment_count), 0) FROM payment_summary WHERE 1=1"
+                params: list[Any] = []
+                if payment_type_id is not None:
+                    query += " AND payment_type_id = ?"
+                    params.append(payment_type_id)
+            else:
+                query = "SELECT COUNT(*) FROM payments WHERE 1=1"
+                params = []
+                if payment_type_id is not None:
+                    query += " AND payment_type_id = ?"
+                    params.append(payment_type_id)
+                if period is not None:
+                    query += " AND period = ?"
+                    params.append(period)
+                if date_from is not None:
+                    query += " AND payment_date >= ?"
+                    params.append(date_from)
+                if date_to is not None:
+                    query += " AND payment_date <= ?"
+                    params.append(date_to)
+
+            cursor.execute(query, params)
+            count = cursor.fetchone()[0]
+            conn.close()
+            return count
+        except Exception as err:
+            _LOGGER.error("Error counting payments: %s", err)
+            return 0
+
+    def get_latest_reading(self, payment_type_id: int, before: str | None = None) -> dict[str, Any] | None:
+        """Get latest meter reading of payment type (on or before date when given)."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            query = """
+                SELECT id, payment_date, current_reading FROM payments
+                WHERE payment_type_id = ? AND current_reading IS NOT NULL
+            """
+            params: list[Any] = [payment_type_id]
+            if before is not None:
+                query += " AND payment_date <= ?"
+                params.append(before)
+            query += " ORDER BY payment_date DESC, id DESC LIMIT 1"
+
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            conn.close()
+
+            if row:
+                return {
+                    "payment_id": row["id"],
+                    "payment_date": row["payment_date"],
+                    "current_reading": float(row["current_reading"])
+                }
+            return None
+        except Exception as err:
+            _LOGGER.error("Error getting latest reading: %s", err)
+            return None
+
+    def get_next_reading(self, payment_type_id: int, after: str) -> dict[str, Any] | None:
+        """Get earliest meter reading of payment type after date."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, payment_date, current_reading FROM payments
+                WHERE payment_type_id = ? AND current_reading IS NOT NULL AND payment_date > ?
+                ORDER BY payment_date, id LIMIT 1
+            """, (payment_type_id, after))
+            row = cursor.fetchone()
+            conn.close()
+
+            if row:
+                return {
+                    "payment_id": row["id"],
+                    "payment_date": row["payment_date"],
+                    "current_reading": float(row["current_reading"])
+                }
+            return None
+        except Exception as err:
+            _LOGGER.error("Error getting next reading: %s", err)
+            return None
+
     def get_payment(self, payment_id: int) -> dict[str, Any] | None:
         """Get payment by ID."""
         try:
@@ -318,6 +807,12 @@ class Database:
                 params.append(notes)
 
             if updates:
+                cursor.execute("""
+                    SELECT payment_type_id, amount, COALESCE(volume, 0) AS volume, payment_date
+                    FROM payments WHERE id = ?
+                """, (payment_id,))
+                row = cursor.fetchone()
+
                 updates.append("updated_at = ?")
                 params.append(datetime.now().isoformat())
                 params.append(payment_id)
@@ -327,8 +822,22 @@ class Database:
                     params
                 )
 
+                if row:
+                    old_type_id = row["payment_type_id"]
+                    new_type_id = payment_type_id if payment_type_id is not None else old_type_id
+                    new_amount = amount if amount is not None else row["amount"]
+                    new_date = payment_date if payment_date is not None else row["payment_date"]
+                    if new_type_id != old_type_id:
+                        self._apply_summary_delta(cursor, old_type_id, -1, -row["amount"], -row["volume"])
+                        self._apply_summary_delta(cursor, new_type_id, 1, new_amount, row["volume"])
+                        self._reread_last_payment(cursor, old_type_id, payment_id)
+                    else:
+                        self._apply_summary_delta(cursor, old_type_id, 0, new_amount - row["amount"], 0.0)
+                    self._reread_last_payment(cursor, new_type_id, payment_id, new_date)
+
             conn.commit()
             conn.close()
+            self.data_generation += 1
             return True
         except Exception as err:
             _LOGGER.error("Error updating payment: %s", err)
@@ -339,9 +848,16 @@ class Database:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
+            cursor.execute("SELECT payment_type_id, amount, COALESCE(volume, 0) AS volume FROM payments WHERE id = ?",
+                           (payment_id,))
+            row = cursor.fetchone()
             cursor.execute("DELETE FROM payments WHERE id = ?", (payment_id,))
+            if row:
+                self._apply_summary_delta(cursor, row["payment_type_id"], -1, -row["amount"], -row["volume"])
+                self._reread_last_payment(cursor, row["payment_type_id"], payment_id)
             conn.commit()
             conn.close()
+            self.data_generation += 1
             return True
         except Exception as err:
             _LOGGER.error("Error deleting payment: %s", err)
@@ -371,3 +887,40 @@ class Database:
         except Exception as err:
             _LOGGER.error("Error getting payments summary: %s", err)
             return {"total_amount": 0.0, "total_count": 0}
+
+    def get_monthly_rollups(self, window: int = 3) -> list[dict[str, Any]]:
+        """Get per-type, per-period cost and consumption with deltas and rolling averages.
+
+        Deltas compare with the previous recorded period of the same type;
+        rolling averages cover the last `window` recorded periods.
+        """
+        try:
+            window = max(1, int(window))
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                WITH monthly AS (
+                    SELECT payment_type_id, period,
+                           COUNT(*) AS payment_count,
+                           SUM(amount) AS cost,
+                           SUM(volume) AS consumption,
+                           SUM(CASE WHEN volume > 0 THEN amount END) / SUM(CASE WHEN volume > 0 THEN volume END) AS unit_price
+                    FROM payments
+                    GROUP BY payment_type_id, period
+                )
+                SELECT payment_type_id, period, payment_count, cost, consumption, unit_price,
+                       LAG(cost) OVER w AS previous_cost,
+                       LAG(consumption) OVER w AS previous_consumption,
+                       LAG(unit_price) OVER w AS previous_unit_price,
+                       AVG(cost) OVER (w ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW) AS cost_average,
+                       AVG(consumption) OVER (w ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW) AS consumption_average
+                FROM monthly
+                WINDOW w AS (PARTITION BY payment_type_id ORDER BY period)
+                ORDER BY payment_type_id, period
+            """)
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        except Exception as err:
+            _LOGGER.error("Error getting monthly rollups: %s", err)
+            return []
@@ -0,0 +1,81 @@
+"""Consumption and cost forecast for Communal Apartment add-on."""
+from __future__ import annotations
+
+from typing import Any
+
+MIN_TREND_PERIODS = 3  # Fewer periods: forecast is the plain average
+MIN_SEASONAL_PERIODS = 12  # A full year of periods is needed for month-of-year effects
+
+
+def period_index(period: str) -> int:
+    """Get month number of period ("YYYY-MM") counted from year 0."""
+    year, month = period.split("-")[:2]
+    return int(year) * 12 + int(month) - 1
+
+
+def index_period(index: int) -> str:
+    """Get period ("YYYY-MM") of month number."""
+    return f"{index // 12}-{index % 12 + 1:02d}"
+
+
+def fit(points: list[tuple[int, float]], target: int) -> tuple[float, str]:
+    """Forecast value at month number target from (month number, value) points.
+
+    Least squares trend over time plus the mean residual of the target's
+    month of year once a full year is available. Returns (value, method).
+    """
+    count = len(points)
+    mean_x = sum(x for x, _y in points) / count
+    mean_y = sum(y for _x, y in points) / count
+    if count < MIN_TREND_PERIODS:
+        return max(mean_y, 0.0), "average"
+
+    variance = sum((x - mean_x) ** 2 for x, _y in points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance if variance else 0.0
+    intercept = mean_y - slope * mean_x
+    value = intercept + slope * target
+    method = "trend"
+
+    if count >= MIN_SEASONAL_PERIODS:
+        residuals = [y - (intercept + slope * x) for x, y in points if x % 12 == target % 12]
+        if residuals:
+            value += sum(residuals) / len(residuals)
+            method = "seasonal"
+
+    return max(value, 0.0), method
+
+
+def forecast_next_period(history: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Forecast consumption and cost of the period after the last one in history.
+
+    History items have period, consumption (None without readings) and cost,
+    one per period. Cost is projected at the latest unit price when consumption
+    is known, otherwise fitted on its own.
+    """
+    if not history:
+        return None
+
+    history = sorted(history, key=lambda item: item["period"])
+    target = period_index(history[-1]["period"]) + 1
+
+    consumption_points = [(period_index(item["period"]), item["consumption"])
+                          for item in history if item["consumption"]]
+    unit_prices = [item["cost"] / item["consumption"] for item in history if item["consumption"]]
+
+    volume = None
+    unit_price = None
+    if consumption_points:
+        volume, method = fit(consumption_points, target)
+        unit_price = unit_prices[-1]
+        amount = volume * unit_price
+    else:
+        amount, method = fit([(period_index(item["period"]), item["cost"]) for item in history], target)
+
+    return {
+        "period": index_period(target),
+        "volume": round(volume, 3) if volume is not None else None,
+        "amount": round(amount, 2),
+        "unit_price": round(unit_price, 4) if unit_price is not None else None,
+        "method": method,
+        "history_periods": len(history),
+    }
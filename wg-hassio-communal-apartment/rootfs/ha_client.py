@@ -0,0 +1,230 @@
+"""Home Assistant Core API client for Communal Apartment add-on."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fired after payments change so the integration refreshes its sensors right away
+EVENT_PAYMENTS_CHANGED = "wg_hassio_communal_apartment_payments_changed"
+
+REQUEST_TIMEOUT = 10  # seconds
+
+# Home Assistant config cache
+CONFIG_TTL = 3600  # seconds; core_config_updated events refresh it sooner
+RECONNECT_DELAY_MIN = 5  # seconds before the first websocket reconnect, doubled after each failure
+RECONNECT_DELAY_MAX = 600  # seconds, cap of the reconnect delay
+WS_HEARTBEAT = 55  # seconds between websocket pings
+DEFAULT_CURRENCY = "EUR"
+DEFAULT_LANGUAGE = "en"
+
+
+class HomeAssistantClient:
+    """Client for Home Assistant Core API via Supervisor."""
+
+    def __init__(self) -> None:
+        """Initialize Home Assistant client."""
+        self.ha_token = os.environ.get("SUPERVISOR_TOKEN")
+        self.ha_url = os.environ.get("HASSIO_URL", "http://supervisor/core")
+        self._session: aiohttp.ClientSession | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Authorization headers for Home Assistant API."""
+        return {"Authorization": f"Bearer {self.ha_token}"}
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get or create aiohttp session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+        return self._session
+
+    async def fire_event(self, event_type: str, data: dict[str, Any] | None = None) -> bool:
+        """Fire event on Home Assistant event bus."""
+        if not self.ha_token:
+            _LOGGER.debug("SUPERVISOR_TOKEN not found, not firing %s", event_type)
+            return False
+        try:
+            session = await self.get_session()
+            api_url = f"{self.ha_url}/api/events/{event_type}"
+            async with session.post(api_url, headers=self.headers, json=data or {}) as resp:
+                if resp.status != 200:
+                    response_text = await resp.text()
+                    _LOGGER.warning("Failed to fire %s: status %s, response: %s",
+                                    event_type, resp.status, response_text[:200])
+                    return False
+            _LOGGER.debug("Fired %s: %s", event_type, data)
+            return True
+        except Exception as err:
+            _LOGGER.warning("Error firing %s: %s", event_type, err)
+            return False
+
+    async def get_config(self) -> dict[str, Any] | None:
+        """Get Home Assistant core config (/api/config)."""
+        if not self.ha_token:
+            _LOGGER.debug("SUPERVISOR_TOKEN not found, not fetching HA config")
+            return None
+        try:
+            session = await self.get_session()
+            async with session.get(f"{self.ha_url}/api/config", headers=self.headers) as resp:
+                if resp.status != 200:
+                    response_text = await resp.text()
+                    _LOGGER.warning("Failed to get HA config: status %s, response: %s",
+                                    resp.status, response_text[:200])
+                    return None
+                return await resp.json()
+        except Exception as err:
+            _LOGGER.warning("Error getting HA config: %s", err)
+            return None
+
+    async def subscribe_events(self, event_type: str,
+                               on_subscribed: Callable[[], Awaitable[None]] | None = None
+                               ) -> AsyncIterator[dict[str, Any]]:
+        """Yield events of type from Home Assistant websocket API until the connection closes.
+
+        on_subscribed is awaited once the subscription is sent on an authenticated connection.
+        """
+        session = await self.get_session()
+        ws_url = f"{self.ha_url.replace('http', 'ws', 1)}/websocket"
+        async with session.ws_connect(ws_url, heartbeat=WS_HEARTBEAT) as ws:
+            message = await ws.receive_json()
+            if message.get("type") == "auth_required":
+                await ws.send_json({"type": "auth", "access_token": self.ha_token})
+                message = await ws.receive_json()
+            if message.get("type") != "auth_ok":
+                raise ConnectionError(f"Websocket authentication failed: {message.get('type')}")
+
+            await ws.send_json({"id": 1, "type": "subscribe_events", "event_type": event_type})
+            if on_subscribed is not None:
+                await on_subscribed()
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                message = msg.json()
+                if message.get("type") == "event":
+                    yield message.get("event", {})
+
+    def notify_payments_changed(self, payment_type_id: int | None = None) -> None:
+        """Fire payments changed event in background without delaying the caller."""
+        task = asyncio.create_task(self.fire_event(EVENT_PAYMENTS_CHANGED, {"payment_type_id": payment_type_id}))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Wait for pending events and close session."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class HomeAssistantConfig:
+    """Currency and language of Home Assistant, cached in memory.
+
+    Fetched once at startup, then refreshed on core_config_updated events
+    and, as a fallback, after CONFIG_TTL.
+    """
+
+    def __init__(self, client: HomeAssistantClient) -> None:
+        """Initialize config cache."""
+        self.client = client
+        self.currency = DEFAULT_CURRENCY
+        self.language = DEFAULT_LANGUAGE
+        self._fetched_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._listen_task: asyncio.Task | None = None
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._failures = 0  # Websocket failures since the last successful subscription
+
+    async def refresh(self) -> None:
+        """Fetch config from Home Assistant; keeps current values on failure."""
+        self._fetched_at = time.monotonic()
+        config = await self.client.get_config()
+        if not config:
+            return
+        self.currency = config.get("currency") or self.currency
+        # HA may use a full locale like "ru_RU", we need just the language code
+        ha_language = config.get("language")
+        if ha_language:
+            self.language = ha_language.split("_")[0].lower()
+        _LOGGER.debug("HA config refreshed - currency: %s, language: %s (from HA: %s)",
+                      self.currency, self.language, ha_language)
+
+    def get(self) -> dict[str, str]:
+        """Get cached config, refreshing in background once it is older than CONFIG_TTL."""
+        if time.monotonic() - self._fetched_at > CONFIG_TTL and not (self._refresh_task and not self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return {"currency": self.currency, "language": self.language}
+
+    async def _on_subscribed(self) -> None:
+        """Reset reconnect backoff; after a reconnect, fetch changes missed while disconnected."""
+        reconnected = self._failures > 0
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._failures = 0
+        if reconnected:
+            _LOGGER.debug("HA websocket reconnected")
+            await self.refresh()
+
+    async def _listen(self) -> None:
+        """Refresh config on core_config_updated events, reconnecting with exponential backoff.
+
+        Only the first failure in a row is logged as a warning, so a restart of
+        Supervisor or Home Assistant does not flood the log.
+        """
+        while True:
+            try:
+                async for _event in self.client.subscribe_events("core_config_updated", self._on_subscribed):
+                    _LOGGER.debug("Home Assistant config updated")
+                    await self.refresh()
+                error: Exception | str = "connection closed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                error = err
+            self._failures += 1
+            _LOGGER.log(logging.WARNING if self._failures == 1 else logging.DEBUG,
+                        "HA websocket disconnected, reconnecting in %d s: %s", self._reconnect_delay, error)
+            await asyncio.sleep(self._reconnect_delay)
+            self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_DELAY_MAX)
+
+    async def start(self) -> None:
+        """Fetch config and start listening for config changes."""
+        await self.refresh()
+        _LOGGER.info("Using HA config - currency: %s, language: %s", self.currency, self.language)
+        if self.client.ha_token and self._listen_task is None:
+            self._listen_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening for config changes."""
+        for task in (self._listen_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._listen_task = None
+
+
+_ha_client: HomeAssistantClient | None = None
+_ha_config: HomeAssistantConfig | None = None
+
+
+def get_ha_client() -> HomeAssistantClient:
+    """Get shared Home Assistant client instance."""
+    global _ha_client
+    if _ha_client is None:
+        _ha_client = HomeAssistantClient()
+    return _ha_client
+
+
+def get_ha_config() -> HomeAssistantConfig:
+    """Get shared Home Assistant config cache."""
+    global _ha_config
+    if _ha_config is None:
+        _ha_config = HomeAssistantConfig(get_ha_client())
+    return _ha_config
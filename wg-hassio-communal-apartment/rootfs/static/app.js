@@ -0,0 +1,434 @@
+let paymentTypes = [];
+let currency = 'EUR'; // Default currency
+let language = 'en'; // Default language (English)
+let translations = {}; // Will be loaded from API
+
+function t(key) {
+    return translations[key] || key;
+}
+
+async function loadTranslations() {
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/translations?lang=' + language;
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        if (data.success && data.translations) {
+            translations = data.translations;
+            console.log('Loaded translations for language:', language);
+            // Update UI text after translations are loaded
+            updateUIText();
+        } else {
+            console.error('Failed to load translations:', data.error);
+            // Fallback: try to load English translations
+            if (language !== 'en') {
+                const fallbackUrl = window.location.pathname.replace(/\/$/, '') + '/api/translations?lang=en';
+                const fallbackResponse = await fetch(fallbackUrl);
+                const fallbackData = await fallbackResponse.json();
+                if (fallbackData.success && fallbackData.translations) {
+                    translations = fallbackData.translations;
+                    updateUIText();
+                }
+            }
+        }
+    } catch (error) {
+        console.error('Error loading translations:', error);
+    }
+}
+
+async function loadConfig() {
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/config';
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        if (data.success) {
+            if (data.currency) {
+                currency = data.currency;
+            }
+            if (data.language) {
+                language = data.language;
+            }
+            console.log('Loaded config from HA - currency:', currency, 'language:', language);
+            // Load translations for the selected language
+            await loadTranslations();
+        }
+    } catch (error) {
+        console.error('Error loading config:', error);
+    }
+}
+
+function updateUIText() {
+    // Update page title
+    const titleEl = document.querySelector('h1');
+    if (titleEl) {
+        titleEl.innerHTML = '<span class="mdi mdi-cash-multiple"></span>' + t('title');
+    }
+
+    // Update add button
+    const addBtn = document.querySelector('.add-btn');
+    if (addBtn) {
+        addBtn.innerHTML = '<span class="mdi mdi-pencil-plus"></span>' + t('addPayment');
+    }
+
+    // Update modal title
+    const modalTitle = document.querySelector('.modal-header h2');
+    if (modalTitle) {
+        modalTitle.textContent = t('addPayment');
+    }
+
+    // Update form labels
+    const labels = {
+        'paymentType': t('paymentType'),
+        'paymentDate': t('paymentDate'),
+        'amount': t('amount'),
+        'previousReading': t('previousReading'),
+        'currentReading': t('currentReading'),
+        'volume': t('volume'),
+        'period': t('period'),
+        'receiptNumber': t('receiptNumber'),
+        'paymentMethod': t('paymentMethod'),
+        'notes': t('notes')
+    };
+
+    for (const [id, text] of Object.entries(labels)) {
+        const label = document.querySelector(`label[for="${id}"]`);
+        if (label) {
+            label.textContent = text;
+        }
+    }
+
+    // Update column headers
+    const requiredHeader = document.querySelector('.form-column:first-child h3');
+    if (requiredHeader) {
+        requiredHeader.textContent = t('requiredFields');
+    }
+    const optionalHeader = document.querySelector('.form-column:last-child h3');
+    if (optionalHeader) {
+        optionalHeader.textContent = t('optionalFields');
+    }
+
+    // Update buttons
+    const cancelBtn = document.querySelector('.btn-secondary');
+    if (cancelBtn) {
+        cancelBtn.textContent = t('cancel');
+    }
+    const submitBtn = document.querySelector('.btn-primary[type="submit"]');
+    if (submitBtn) {
+        submitBtn.textContent = t('add');
+    }
+
+    // Update load more button
+    const loadMoreText = document.getElementById('load-more-text');
+    if (loadMoreText) {
+        loadMoreText.textContent = t('loadMore');
+    }
+
+    // Update period hint
+    const periodHint = document.querySelector('#period').nextElementSibling;
+    if (periodHint && periodHint.tagName === 'SMALL') {
+        periodHint.textContent = t('periodHint');
+    }
+}
+
+async function loadPaymentTypes() {
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payment-types?lang=' + language;
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        if (data.success) {
+            paymentTypes = data.types;
+            const select = document.getElementById('paymentType');
+            select.innerHTML = '<option value="">' + t('selectPaymentType') + '</option>';
+            data.types.forEach(type => {
+                const option = document.createElement('option');
+                option.value = type.id;
+                option.textContent = type.name;
+                select.appendChild(option);
+            });
+        }
+    } catch (error) {
+        console.error('Error loading payment types:', error);
+    }
+}
+
+function calculateVolume() {
+    const previous = parseFloat(document.getElementById('previousReading').value) || 0;
+    const current = parseFloat(document.getElementById('currentReading').value) || 0;
+    const volumeInput = document.getElementById('volume');
+
+    if (previous > 0 && current > 0 && current >= previous) {
+        const volume = current - previous;
+        if (volume > 0) {
+            volumeInput.value = volume.toFixed(3);
+        } else {
+            volumeInput.value = '';
+        }
+    } else {
+        volumeInput.value = '';
+    }
+}
+
+async function loadPreviousReading() {
+    const typeId = document.getElementById('paymentType').value;
+    const paymentDate = document.getElementById('paymentDate').value;
+    const previousInput = document.getElementById('previousReading');
+    if (!typeId) {
+        return;
+    }
+
+    try {
+        let apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/readings/latest?payment_type_id=' + typeId;
+        if (paymentDate) {
+            apiUrl += '&before=' + encodeURIComponent(paymentDate);
+        }
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        if (data.success) {
+            const reading = Object.values(data.readings)[0];
+            previousInput.value = reading ? reading.current_reading : '';
+            calculateVolume();
+        }
+    } catch (error) {
+        console.error('Error loading previous reading:', error);
+    }
+}
+
+function calculatePeriod() {
+    const dateInput = document.getElementById('paymentDate');
+    const periodInput = document.getElementById('period');
+
+    if (dateInput.value) {
+        const date = new Date(dateInput.value);
+        const year = date.getFullYear();
+        const month = String(date.getMonth() + 1).padStart(2, '0');
+        periodInput.value = `${year}-${month}`;
+    } else {
+        periodInput.value = '';
+    }
+}
+
+let paymentsCursor = null;
+
+async function loadPayments(append = false) {
+    const list = document.getElementById('payments-list');
+    const moreButton = document.getElementById('load-more-btn');
+    if (!append) {
+        paymentsCursor = null;
+        list.innerHTML = '<div class="loading">' + t('loading') + '</div>';
+    }
+    moreButton.style.display = 'none';
+
+    try {
+        let apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payments?lang=' + language;
+        if (paymentsCursor) {
+            apiUrl += '&cursor=' + encodeURIComponent(paymentsCursor);
+        }
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        if (data.success) {
+            paymentsCursor = data.next_cursor;
+            moreButton.style.display = paymentsCursor ? 'flex' : 'none';
+            if (data.payments.length === 0 && !append) {
+                list.innerHTML = '<div class="loading">' + t('noPayments') + '</div>';
+            } else {
+                const html = data.payments.map(payment => {
+                    const typeName = payment.payment_type_name || t('unknown');
+                    const amount = formatAmount(payment.amount);
+                    const period = payment.period || '';
+                    const date = formatDate(payment.payment_date);
+
+                    let details = [];
+                    if (payment.receipt_number) {
+                        details.push({label: t('receipt'), value: payment.receipt_number});
+                    }
+                    if (payment.payment_method) {
+                        details.push({label: t('method'), value: payment.payment_method});
+                    }
+                    if (payment.previous_reading !== undefined && payment.current_reading !== undefined) {
+                        details.push({
+                            label: t('readings'),
+                            value: `${payment.previous_reading} → ${payment.current_reading}`
+                        });
+                    }
+                    if (payment.volume !== undefined) {
+                        details.push({label: t('volumeLabel'), value: payment.volume.toFixed(3)});
+                    }
+
+                    let unitPriceHtml = '';
+                    if (payment.unit_price !== undefined) {
+                        unitPriceHtml = `<div class="unit-price"><span class="mdi mdi-cash"></span>${formatAmount(payment.unit_price)} ${t('perUnit')}</div>`;
+                    }
+
+                    return `
+                    <div class="payment-item">
+                        <div class="payment-info">
+                            <div class="payment-type">${escapeHtml(typeName)}</div>
+                            <div class="payment-details">
+                                <div class="payment-detail">
+                                    <span class="payment-detail-label">${t('periodLabel')}</span>
+                                    <span class="payment-detail-value">${escapeHtml(period)}</span>
+                                </div>
+                                <div class="payment-detail">
+                                    <span class="payment-detail-label">${t('dateLabel')}</span>
+                                    <span class="payment-detail-value">${escapeHtml(date)}</span>
+                                </div>
+                                ${details.map(d => `
+                                    <div class="payment-detail">
+                                        <span class="payment-detail-label">${escapeHtml(d.label)}</span>
+                                        <span class="payment-detail-value">${escapeHtml(d.value)}</span>
+                                    </div>
+                                `).join('')}
+                            </div>
+                        </div>
+                        <div class="payment-amount">
+                            <div class="amount-value"><span class="mdi mdi-cash"></span>${amount}</div>
+                            ${unitPriceHtml}
+                        </div>
+                    </div>
+                `;
+                }).join('');
+                if (append) {
+                    list.insertAdjacentHTML('beforeend', html);
+                } else {
+                    list.innerHTML = html;
+                }
+            }
+        } else {
+            const errorText = language === 'ru' ? 'Ошибка: ' : 'Error: ';
+            list.innerHTML = '<div class="loading">' + errorText + escapeHtml(data.error) + '</div>';
+        }
+    } catch (error) {
+        const errorText = language === 'ru' ? 'Ошибка загрузки: ' : 'Loading error: ';
+        list.innerHTML = '<div class="loading">' + errorText + escapeHtml(error.message) + '</div>';
+    }
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function formatAmount(amount) {
+    // Format amount with currency symbol
+    try {
+        return new Intl.NumberFormat('ru-RU', {
+            style: 'currency',
+            currency: currency,
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        }).format(amount);
+    } catch (e) {
+        // Fallback if currency is not supported
+        return new Intl.NumberFormat('ru-RU', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        }).format(amount) + ' ' + currency;
+    }
+}
+
+function formatDate(dateStr) {
+    if (!dateStr) return '';
+    const date = new Date(dateStr);
+    return date.toLocaleDateString('ru-RU');
+}
+
+function openModal() {
+    // Set current date
+    const today = new Date();
+    const dateStr = today.toISOString().split('T')[0];
+    document.getElementById('paymentDate').value = dateStr;
+    calculatePeriod();
+
+    document.getElementById('addModal').style.display = 'block';
+    document.getElementById('paymentType').focus();
+}
+
+function closeModal() {
+    document.getElementById('addModal').style.display = 'none';
+    document.getElementById('addForm').reset();
+    document.getElementById('errorMessage').style.display = 'none';
+    document.getElementById('volume').value = '';
+    document.getElementById('period').value = '';
+
+    // Reset to current date
+    const today = new Date();
+    const dateStr = today.toISOString().split('T')[0];
+    document.getElementById('paymentDate').value = dateStr;
+    calculatePeriod();
+}
+
+window.onclick = function(event) {
+    const modal = document.getElementById('addModal');
+    if (event.target == modal) {
+        closeModal();
+    }
+}
+
+async function addPayment(event) {
+    event.preventDefault();
+    const errorDiv = document.getElementById('errorMessage');
+    errorDiv.style.display = 'none';
+
+    const formData = new FormData(event.target);
+    const previousReading = formData.get('previous_reading');
+    const currentReading = formData.get('current_reading');
+    const volume = formData.get('volume');
+
+    // Validate volume if readings are provided
+    if (previousReading && currentReading) {
+        const volumeValue = parseFloat(volume);
+        if (!volume || isNaN(volumeValue) || volumeValue <= 0) {
+            errorDiv.textContent = t('errorVolume');
+            errorDiv.style.display = 'block';
+            return;
+        }
+    }
+
+    const data = {
+        payment_type_id: formData.get('payment_type_id'),
+        amount: parseFloat(formData.get('amount')),
+        period: formData.get('period'),
+        payment_date: formData.get('payment_date'),
+        receipt_number: formData.get('receipt_number') || null,
+        payment_method: formData.get('payment_method') || null,
+        notes: formData.get('notes') || null,
+        previous_reading: previousReading || null,
+        current_reading: currentReading || null
+    };
+
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payments';
+        const response = await fetch(apiUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            closeModal();
+            loadPayments();
+        } else {
+            errorDiv.textContent = result.error || 'Ошибка при сохранении';
+            errorDiv.style.display = 'block';
+        }
+    } catch (error) {
+        errorDiv.textContent = 'Ошибка: ' + error.message;
+        errorDiv.style.display = 'block';
+    }
+}
+
+// Load data on page load
+loadConfig().then(() => {
+    // loadTranslations is already called in loadConfig after language is set
+    loadPaymentTypes();
+    loadPayments();
+});
@@ -2,12 +2,22 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import csv
+import functools
+import io
 import json
 import logging
+import re
 from datetime import datetime
+from typing import Any, AsyncIterator
+
 from aiohttp import web
 
-from database import Database
+from analytics import ROLLING_WINDOW, PaymentAnalytics
+from database import PAYMENT_FIELDS, Database
+from ha_client import get_ha_client, get_ha_config
+from static_assets import StaticAssets
 from translations import get_translation
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +32,28 @@ PAYMENT_TYPES = {
     3: "water"
 }
 
+# Payment types (system_name -> ID)
+PAYMENT_TYPE_IDS = {system_name: type_id for type_id, system_name in PAYMENT_TYPES.items()}
+
+# Monthly analytics (cached until the next payment write)
+analytics = PaymentAnalytics(db, PAYMENT_TYPES)
+
+# Web UI (index page and hashed static assets)
+assets = StaticAssets()
+
+# Payments page size (default and max)
+PAYMENTS_PAGE_SIZE = 50
+PAYMENTS_MAX_PAGE_SIZE = 500
+
+# Bulk import limits
+IMPORT_MAX_SIZE = 16 * 1024 * 1024  # Max request body, bytes
+IMPORT_MAX_ERRORS = 100  # Max row errors returned
+
+FORECAST_REFRESH_INTERVAL = 30  # seconds between checks for payments written since the last forecast
+
+PERIOD_PATTERN = re.compile(r"\d{4}-(0[1-9]|1[0-2])")  # Billing period, YYYY-MM
+READING_TOLERANCE = 1e-6  # Max difference between supplied and stored previous reading
+
 # Error messages translations
 ERROR_TRANSLATIONS = {
     "en": {
@@ -31,7 +63,16 @@ ERROR_TRANSLATIONS = {
         "invalid_payment_type": "Invalid payment type",
         "unknown_payment_type": "Unknown payment type",
         "invalid_date_format": "Invalid payment date format",
-        "failed_to_save": "Failed to save payment"
+        "invalid_period": "Invalid period, expected YYYY-MM",
+        "failed_to_save": "Failed to save payment",
+        "invalid_query": "Invalid query parameters",
+        "invalid_amount": "Invalid amount",
+        "invalid_reading": "Invalid meter reading",
+        "nothing_to_import": "No payments to import",
+        "import_rows_invalid": "Some rows are invalid, nothing was imported",
+        "invalid_import_format": "Could not read the import file",
+        "reading_not_monotonic": "Meter reading is lower than an earlier reading or higher than a later one",
+        "previous_reading_mismatch": "Previous reading does not match the last saved meter reading"
     },
     "ru": {
         "payment_type_not_specified": "Тип оплаты не указан",
@@ -40,7 +81,16 @@ ERROR_TRANSLATIONS = {
         "invalid_payment_type": "Неверный тип оплаты",
         "unknown_payment_type": "Неизвестный тип оплаты",
         "invalid_date_format": "Неверный формат даты оплаты",
-        "failed_to_save": "Не удалось сохранить оплату"
+        "invalid_period": "Неверный период, ожидается ГГГГ-ММ",
+        "failed_to_save": "Не удалось сохранить оплату",
+        "invalid_query": "Неверные параметры запроса",
+        "invalid_amount": "Неверная сумма",
+        "invalid_reading": "Неверное показание счётчика",
+        "nothing_to_import": "Нет платежей для импорта",
+        "import_rows_invalid": "Некоторые строки содержат ошибки, ничего не импортировано",
+        "invalid_import_format": "Не удалось прочитать файл импорта",
+        "reading_not_monotonic": "Показание счётчика меньше предыдущего или больше последующего",
+        "previous_reading_mismatch": "Предыдущее показание не совпадает с последним сохранённым показанием счётчика"
     },
     "uk": {
         "payment_type_not_specified": "Тип платежу не вказано",
@@ -49,7 +99,16 @@ ERROR_TRANSLATIONS = {
         "invalid_payment_type": "Невірний тип платежу",
         "unknown_payment_type": "Невідомий тип платежу",
         "invalid_date_format": "Невірний формат дати платежу",
-        "failed_to_save": "Не вдалося зберегти платіж"
+        "invalid_period": "Невірний період, очікується РРРР-ММ",
+        "failed_to_save": "Не вдалося зберегти платіж",
+        "invalid_query": "Невірні параметри запиту",
+        "invalid_amount": "Невірна сума",
+        "invalid_reading": "Невірне показання лічильника",
+        "nothing_to_import": "Немає платежів для імпорту",
+        "import_rows_invalid": "Деякі рядки містять помилки, нічого не імпортовано",
+        "invalid_import_format": "Не вдалося прочитати файл імпорту",
+        "reading_not_monotonic": "Показання лічильника менше за попереднє або більше за наступне",
+        "previous_reading_mismatch": "Попереднє показання не збігається з останнім збереженим показанням лічильника"
     },
     "pl": {
         "payment_type_not_specified": "Typ płatności nie został określony",
@@ -58,7 +117,16 @@ ERROR_TRANSLATIONS = {
         "invalid_payment_type": "Nieprawidłowy typ płatności",
         "unknown_payment_type": "Nieznany typ płatności",
         "invalid_date_format": "Nieprawidłowy format daty płatności",
-        "failed_to_save": "Nie udało się zapisać płatności"
+        "invalid_period": "Nieprawidłowy okres, oczekiwano RRRR-MM",
+        "failed_to_save": "Nie udało się zapisać płatności",
+        "invalid_query": "Nieprawidłowe parametry zapytania",
+        "invalid_amount": "Nieprawidłowa kwota",
+        "invalid_reading": "Nieprawidłowy odczyt licznika",
+        "nothing_to_import": "Brak płatności do zaimportowania",
+        "import_rows_invalid": "Niektóre wiersze są nieprawidłowe, nic nie zaimportowano",
+        "invalid_import_format": "Nie udało się odczytać pliku importu",
+        "reading_not_monotonic": "Odczyt licznika jest niższy od wcześniejszego lub wyższy od późniejszego",
+        "previous_reading_mismatch": "Poprzedni odczyt nie zgadza się z ostatnim zapisanym odczytem licznika"
     },
     "be": {
         "payment_type_not_specified": "Тып плацяжу не паказаны",
@@ -67,7 +135,16 @@ ERROR_TRANSLATIONS = {
         "invalid_payment_type": "Няправільны тып плацяжу",
         "unknown_payment_type": "Невядомы тып плацяжу",
         "invalid_date_format": "Няправільны фармат даты плацяжу",
-        "failed_to_save": "Не ўдалося захаваць плацяж"
+        "invalid_period": "Няправільны перыяд, чакаецца ГГГГ-ММ",
+        "failed_to_save": "Не ўдалося захаваць плацяж",
+        "invalid_query": "Няправільныя параметры запыту",
+        "invalid_amount": "Няправільная сума",
+        "invalid_reading": "Няправільнае паказанне лічыльніка",
+        "nothing_to_import": "Няма плацяжоў для імпарту",
+        "import_rows_invalid": "Некаторыя радкі змяшчаюць памылкі, нічога не імпартавана",
+        "invalid_import_format": "Не ўдалося прачытаць файл імпарту",
+        "reading_not_monotonic": "Паказанне лічыльніка меншае за папярэдняе або большае за наступнае",
+        "previous_reading_mismatch": "Папярэдняе паказанне не супадае з апошнім захаваным паказаннем лічыльніка"
     }
 }
 
@@ -77,18 +154,71 @@ def get_error_message(key: str, lang: str = "en") -> str:
     return ERROR_TRANSLATIONS.get(lang, ERROR_TRANSLATIONS["en"]).get(key, key)
 
 
+def encode_cursor(payment: dict) -> str:
+    """Encode keyset cursor from last payment of a page."""
+    raw = json.dumps([payment["payment_date"], payment["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Decode keyset cursor into (payment_date, id). Raises ValueError if malformed."""
+    try:
+        payment_date, payment_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(payment_date), int(payment_id)
+    except Exception as err:
+        raise ValueError(f"Invalid cursor: {cursor}") from err
+
+
 async def get_payments(request: web.Request) -> web.Response:
-    """Get all payments from database."""
+    """Get page of payments (newest first) with optional filters.
+
+    Query parameters: payment_type_id, period, date_from, date_to, limit,
+    cursor (next_cursor of the previous page) and fields (comma-separated).
+    """
     try:
         # Get language from query parameter or default to 'en'
         lang = request.query.get("lang", "en")
         
-        payments = db.get_all_payments()
+        try:
+            payment_type_id = request.query.get("payment_type_id")
+            payment_type_id = int(payment_type_id) if payment_type_id else None
+            limit = int(request.query.get("limit", PAYMENTS_PAGE_SIZE))
+            limit = max(1, min(limit, PAYMENTS_MAX_PAGE_SIZE))
+            cursor = request.query.get("cursor")
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("invalid_query", lang)
+            }, status=400)
+        
+        fields = request.query.get("fields")
+        fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        if fields and any(field not in PAYMENT_FIELDS for field in fields):
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("invalid_query", lang)
+            }, status=400)
+        
+        filters = {
+            "payment_type_id": payment_type_id,
+            "period": request.query.get("period") or None,
+            "date_from": request.query.get("date_from") or None,
+            "date_to": request.query.get("date_to") or None,
+        }
+        
+        # One extra row tells whether there is a next page
+        payments = db.get_payments_page(**filters, after=after, limit=limit + 1, fields=fields)
+        next_cursor = None
+        if len(payments) > limit:
+            payments = payments[:limit]
+            next_cursor = encode_cursor(payments[-1])
         
         # Map payment_type_id to system_name and translated name
         for payment in payments:
-            payment_type_id = payment["payment_type_id"]
-            system_name = PAYMENT_TYPES.get(payment_type_id)
+            if "payment_type_id" not in payment:
+                continue
+            system_name = PAYMENT_TYPES.get(payment["payment_type_id"])
             if system_name:
                 payment["system_name"] = system_name
                 payment["payment_type_name"] = get_translation(system_name, lang)
@@ -102,7 +232,9 @@ async def get_payments(request: web.Request) -> web.Response:
         
         return web.json_response({
             "success": True,
-            "payments": payments
+            "payments": payments,
+            "next_cursor": next_cursor,
+            "total": db.count_payments(**filters)
         })
     except Exception as err:
         _LOGGER.error("Error getting payments: %s", err, exc_info=True)
@@ -142,58 +274,19 @@ async def get_payment_types(request: web.Request) -> web.Response:
 async def get_sensors(request: web.Request) -> web.Response:
     """Get aggregated sensor data for Home Assistant sensors."""
     try:
-        payments = db.get_all_payments()
-        
-        # Calculate totals by payment type
-        sensors_data = {
-            "electricity": {
-                "total_volume": 0.0,
-                "total_amount": 0.0,
-                "last_payment_date": None,
-                "last_payment_amount": 0.0,
-                "last_payment_volume": 0.0,
-            },
-            "gas": {
-                "total_volume": 0.0,
-                "total_amount": 0.0,
-                "last_payment_date": None,
-                "last_payment_amount": 0.0,
-                "last_payment_volume": 0.0,
-            },
-            "water": {
-                "total_volume": 0.0,
-                "total_amount": 0.0,
-                "last_payment_date": None,
-                "last_payment_amount": 0.0,
-                "last_payment_volume": 0.0,
-            },
-        }
+        summary = db.get_payment_summary_by_type()
         
-        # Process payments
-        for payment in payments:
-            payment_type_id = payment["payment_type_id"]
-            system_name = PAYMENT_TYPES.get(payment_type_id)
-            
-            if system_name and system_name in sensors_data:
-                amount = payment.get("amount", 0.0) or 0.0
-                volume = payment.get("volume") or 0.0
-                
-                sensors_data[system_name]["total_amount"] += amount
-                if volume:
-                    sensors_data[system_name]["total_volume"] += volume
-                
-                # Track last payment
-                payment_date = payment.get("payment_date")
-                if payment_date:
-                    if sensors_data[system_name]["last_payment_date"] is None:
-                        sensors_data[system_name]["last_payment_date"] = payment_date
-                        sensors_data[system_name]["last_payment_amount"] = amount
-                        sensors_data[system_name]["last_payment_volume"] = volume or 0.0
-                    else:
-                        if payment_date > sensors_data[system_name]["last_payment_date"]:
-                            sensors_data[system_name]["last_payment_date"] = payment_date
-                            sensors_data[system_name]["last_payment_amount"] = amount
-                            sensors_data[system_name]["last_payment_volume"] = volume or 0.0
+        # Totals by payment type come from the maintained summary table
+        sensors_data = {}
+        for payment_type_id, system_name in PAYMENT_TYPES.items():
+            totals = summary.get(payment_type_id, {})
+            sensors_data[system_name] = {
+                "total_volume": totals.get("total_volume", 0.0),
+                "total_amount": totals.get("total_amount", 0.0),
+                "last_payment_date": totals.get("last_payment_date"),
+                "last_payment_amount": totals.get("last_payment_amount", 0.0),
+                "last_payment_volume": totals.get("last_payment_volume", 0.0),
+            }
         
         return web.json_response({
             "success": True,
@@ -207,6 +300,106 @@ async def get_sensors(request: web.Request) -> web.Response:
         }, status=500)
 
 
+async def get_analytics(request: web.Request) -> web.Response:
+    """Get monthly cost, consumption and tariff trends per payment type."""
+    try:
+        lang = request.query.get("lang", "en")
+        try:
+            window = max(1, min(int(request.query.get("window", ROLLING_WINDOW)), 12))
+            payment_type_id = request.query.get("payment_type_id")
+            payment_type_id = int(payment_type_id) if payment_type_id else None
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("invalid_query", lang)
+            }, status=400)
+        
+        data = analytics.get_monthly(window)
+        if payment_type_id is not None:
+            system_name = PAYMENT_TYPES.get(payment_type_id)
+            data = {system_name: data[system_name]} if system_name else {}
+        
+        return web.json_response({
+            "success": True,
+            "window": window,
+            "analytics": data
+        })
+    except Exception as err:
+        _LOGGER.error("Error getting analytics: %s", err, exc_info=True)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
+async def get_forecast(request: web.Request) -> web.Response:
+    """Get next period consumption and cost forecast per payment type."""
+    try:
+        lang = request.query.get("lang", "en")
+        try:
+            payment_type_id = request.query.get("payment_type_id")
+            payment_type_id = int(payment_type_id) if payment_type_id else None
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("invalid_query", lang)
+            }, status=400)
+        
+        # Forecasts of types written since the last background refresh are recomputed first
+        db.refresh_payment_forecasts()
+        forecasts = db.get_payment_forecasts()
+        type_ids = [payment_type_id] if payment_type_id is not None else list(PAYMENT_TYPES)
+        data = {
+            PAYMENT_TYPES[type_id]: forecasts.get(type_id)
+            for type_id in type_ids if type_id in PAYMENT_TYPES
+        }
+        
+        return web.json_response({
+            "success": True,
+            "forecast": data
+        })
+    except Exception as err:
+        _LOGGER.error("Error getting forecast: %s", err, exc_info=True)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
+async def get_latest_readings(request: web.Request) -> web.Response:
+    """Get latest meter reading per payment type (optionally on or before a date)."""
+    try:
+        lang = request.query.get("lang", "en")
+        try:
+            payment_type_id = request.query.get("payment_type_id")
+            payment_type_id = int(payment_type_id) if payment_type_id else None
+            before = request.query.get("before")
+            if before:
+                before = datetime.fromisoformat(before).date().isoformat()
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("invalid_query", lang)
+            }, status=400)
+        
+        type_ids = [payment_type_id] if payment_type_id is not None else list(PAYMENT_TYPES)
+        readings = {
+            PAYMENT_TYPES[type_id]: db.get_latest_reading(type_id, before or None)
+            for type_id in type_ids if type_id in PAYMENT_TYPES
+        }
+        
+        return web.json_response({
+            "success": True,
+            "readings": readings
+        })
+    except Exception as err:
+        _LOGGER.error("Error getting latest readings: %s", err, exc_info=True)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
 async def get_translations(request: web.Request) -> web.Response:
     """Get translations for UI."""
     try:
@@ -246,70 +439,154 @@ async def get_translations(request: web.Request) -> web.Response:
 
 
 async def get_config(request: web.Request) -> web.Response:
-    """Get configuration including currency and language from Home Assistant."""
+    """Get configuration including currency and language from Home Assistant (cached)."""
+    return web.json_response({
+        "success": True,
+        **get_ha_config().get()
+    })
+
+
+async def start_ha_config(app: web.Application) -> None:
+    """Load Home Assistant config into the cache before serving requests."""
+    await get_ha_config().start()
+
+
+async def stop_ha_config(app: web.Application) -> None:
+    """Stop Home Assistant config updates."""
+    await get_ha_config().stop()
+
+
+async def refresh_forecasts(app: web.Application) -> AsyncIterator[None]:
+    """Recompute forecasts in the background after payment writes, outside the write path."""
+    async def refresh_loop() -> None:
+        while True:
+            # The integration only re-reads the add-on database on events or its hourly poll
+            if db.refresh_payment_forecasts():
+                get_ha_client().notify_payments_changed()
+            await asyncio.sleep(FORECAST_REFRESH_INTERVAL)
+
+    task = asyncio.create_task(refresh_loop())
+    yield
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def validate_payment(data: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None]:
+    """Validate payment data from a request.
+
+    Returns (payment fields for Database.add_payment, None) or (None, error key).
+    """
+    # Get payment_type_id from request (should be numeric ID from PAYMENT_TYPES)
+    payment_type_id = data.get("payment_type_id")
+    if not payment_type_id and data.get("system_name"):
+        payment_type_id = PAYMENT_TYPE_IDS.get(data["system_name"])
+        if payment_type_id is None:
+            return None, "unknown_payment_type"
+    
+    if not payment_type_id:
+        return None, "payment_type_not_specified"
+    
+    # Validate that payment_type_id exists in PAYMENT_TYPES
     try:
-        import os
-        
-        _LOGGER.info("Requesting HA configuration (currency and language)")
-        
-        # Default values
-        currency = "EUR"
-        language = "en"  # Default to English
-        
-        # Try to get from Home Assistant API via supervisor
-        ha_token = os.environ.get("SUPERVISOR_TOKEN")
-        ha_url = os.environ.get("HASSIO_URL", "http://supervisor/core")
-        
-        if ha_token:
-            _LOGGER.debug("SUPERVISOR_TOKEN found, attempting to fetch config from HA API: %s", ha_url)
-            try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    # Try direct Home Assistant Core API access
-                    # Use Authorization header with Bearer token for Home Assistant API
-                    headers = {"Authorization": f"Bearer {ha_token}"}
-                    core_url = os.environ.get("HASSIO_URL", "http://supervisor/core")
-                    api_url = f"{core_url}/api/config"
-                    _LOGGER.debug("Making request to HA Core API: %s with Authorization header", api_url)
-                    async with session.get(api_url, headers=headers) as resp:
-                        response_text = await resp.text()
-                        _LOGGER.debug("HA Core API response status: %s, body: %s", resp.status, response_text[:200])
-                        
-                        if resp.status == 200:
-                            config_data = await resp.json()
-                            currency = config_data.get("currency", currency)
-                            # Get language from HA config
-                            ha_language = config_data.get("language", "en")
-                            # Convert HA language code to our format (e.g., "ru" -> "ru", "en" -> "en")
-                            # HA uses full locale like "ru_RU" or "en_US", we need just language code
-                            if ha_language:
-                                language = ha_language.split("_")[0].lower() if "_" in ha_language else ha_language.lower()
-                            _LOGGER.info("Successfully retrieved HA config - currency: %s, language: %s (from HA: %s)", 
-                                       currency, language, ha_language)
-                        else:
-                            _LOGGER.warning("HA Core API returned status %s, response: %s, using defaults - currency: %s, language: %s", 
-                                          resp.status, response_text[:200], currency, language)
-            except Exception as api_err:
-                _LOGGER.warning("Could not get config from HA API: %s, using defaults - currency: %s, language: %s", 
-                              api_err, currency, language, exc_info=True)
-        else:
-            _LOGGER.info("SUPERVISOR_TOKEN not found, using defaults - currency: %s, language: %s", 
-                        currency, language)
-        
-        _LOGGER.info("Returning config - currency: %s, language: %s", currency, language)
-        return web.json_response({
-            "success": True,
-            "currency": currency,
-            "language": language
-        })
-    except Exception as err:
-        _LOGGER.error("Error getting config: %s", err, exc_info=True)
-        return web.json_response({
-            "success": False,
-            "error": str(err),
-            "currency": "EUR",  # Fallback
-            "language": "en"  # Fallback
-        }, status=500)
+        payment_type_id = int(payment_type_id)
+    except (ValueError, TypeError):
+        return None, "invalid_payment_type"
+    
+    if payment_type_id not in PAYMENT_TYPES:
+        return None, "unknown_payment_type"
+    
+    # Get required fields
+    try:
+        amount = float(data.get("amount") or 0)
+    except (ValueError, TypeError):
+        return None, "invalid_amount"
+    payment_date = data.get("payment_date")
+    period = data.get("period")
+    
+    if not payment_date:
+        return None, "payment_date_required"
+    
+    # Dates are compared as text for ordering and reading checks, so store them as YYYY-MM-DD
+    try:
+        date_obj = datetime.fromisoformat(payment_date.split('T')[0])
+    except (ValueError, AttributeError):
+        return None, "invalid_date_format"
+    payment_date = date_obj.date().isoformat()
+    
+    # Calculate period from payment_date if not provided
+    if not period:
+        period = f"{date_obj.year}-{date_obj.month:02d}"
+    elif not isinstance(period, str) or not PERIOD_PATTERN.fullmatch(period):
+        return None, "invalid_period"
+    
+    # Get readings
+    previous_reading = data.get("previous_reading")
+    current_reading = data.get("current_reading")
+    
+    # Calculate volume
+    volume = None
+    if previous_reading is not None and current_reading is not None:
+        try:
+            prev = float(previous_reading) if previous_reading else 0
+            curr = float(current_reading) if current_reading else 0
+            if curr >= prev:
+                volume = curr - prev
+                # Validate that volume is greater than 0
+                if volume <= 0:
+                    return None, "volume_must_be_greater"
+        except (ValueError, TypeError):
+            pass
+    
+    try:
+        previous_reading = float(previous_reading) if previous_reading else None
+        current_reading = float(current_reading) if current_reading else None
+    except (ValueError, TypeError):
+        return None, "invalid_reading"
+    
+    return {
+        "payment_type_id": payment_type_id,
+        "amount": amount,
+        "payment_date": payment_date,
+        "period": period,
+        "receipt_number": data.get("receipt_number") or None,
+        "payment_method": data.get("payment_method") or None,
+        "notes": data.get("notes") or None,
+        "previous_reading": previous_reading,
+        "current_reading": current_reading,
+        "volume": volume
+    }, None
+
+
+def check_reading_order(payment: dict[str, Any], batch_previous: float | None = None) -> str | None:
+    """Check that current reading fits between the stored readings around its date.
+
+    Uses two index seeks instead of scanning history. Fills in missing previous
+    reading and volume from the reading before and rejects a supplied previous
+    reading that differs from it. Returns error key or None.
+    """
+    current = payment["current_reading"]
+    if current is None:
+        return None
+    
+    before = db.get_latest_reading(payment["payment_type_id"], payment["payment_date"])
+    readings = [reading for reading in (before and before["current_reading"], batch_previous) if reading is not None]
+    prior = max(readings) if readings else None
+    if prior is not None and current < prior:
+        return "reading_not_monotonic"
+    
+    after = db.get_next_reading(payment["payment_type_id"], payment["payment_date"])
+    if after and current > after["current_reading"]:
+        return "reading_not_monotonic"
+    
+    if prior is not None:
+        if payment["previous_reading"] is None:
+            payment["previous_reading"] = prior
+            if current > prior:
+                payment["volume"] = current - prior
+        elif abs(payment["previous_reading"] - prior) > READING_TOLERANCE:
+            # Volume and unit price are derived from it, so it must match the stored reading
+            return "previous_reading_mismatch"
+    return None
 
 
 async def add_payment(request: web.Request) -> web.Response:
@@ -317,103 +594,28 @@ async def add_payment(request: web.Request) -> web.Response:
     try:
         data = await request.json()
         
-        # Get payment_type_id from request (should be numeric ID from PAYMENT_TYPES)
-        payment_type_id = data.get("payment_type_id")
-        
         # Get language from query or default to 'en'
         lang = request.query.get("lang", "en")
         
-        if not payment_type_id:
-            return web.json_response({
-                "success": False,
-                "error": get_error_message("payment_type_not_specified", lang)
-            }, status=400)
-        
-        # Validate that payment_type_id exists in PAYMENT_TYPES
-        try:
-            payment_type_id = int(payment_type_id)
-        except (ValueError, TypeError):
-            return web.json_response({
-                "success": False,
-                "error": get_error_message("invalid_payment_type", lang)
-            }, status=400)
-        
-        if payment_type_id not in PAYMENT_TYPES:
+        payment, error_key = validate_payment(data)
+        if not error_key:
+            error_key = check_reading_order(payment)
+        if error_key:
             return web.json_response({
                 "success": False,
-                "error": get_error_message("unknown_payment_type", lang)
+                "error": get_error_message(error_key, lang)
             }, status=400)
         
-        # Get required fields
-        amount = float(data.get("amount", 0))
-        payment_date = data.get("payment_date")
-        period = data.get("period")
-        
-        if not payment_date:
-            return web.json_response({
-                "success": False,
-                "error": get_error_message("payment_date_required", lang)
-            }, status=400)
-        
-        # Calculate period from payment_date if not provided
-        if not period and payment_date:
-            try:
-                date_obj = datetime.fromisoformat(payment_date.split('T')[0])
-                period = f"{date_obj.year}-{date_obj.month:02d}"
-            except (ValueError, AttributeError):
-                return web.json_response({
-                    "success": False,
-                    "error": get_error_message("invalid_date_format", lang)
-                }, status=400)
-        
-        # Get optional fields
-        receipt_number = data.get("receipt_number")
-        payment_method = data.get("payment_method")
-        notes = data.get("notes")
-        
-        # Get readings
-        previous_reading = data.get("previous_reading")
-        current_reading = data.get("current_reading")
-        
-        # Calculate volume
-        volume = None
-        if previous_reading is not None and current_reading is not None:
-            try:
-                prev = float(previous_reading) if previous_reading else 0
-                curr = float(current_reading) if current_reading else 0
-                if curr >= prev:
-                    volume = curr - prev
-                    # Validate that volume is greater than 0
-                    if volume <= 0:
-                        return web.json_response({
-                            "success": False,
-                            "error": get_error_message("volume_must_be_greater", lang)
-                        }, status=400)
-            except (ValueError, TypeError):
-                pass
-        
         # Add payment
-        payment_id = db.add_payment(
-            payment_type_id=payment_type_id,
-            amount=amount,
-            payment_date=payment_date,
-            period=period,
-            receipt_number=receipt_number,
-            payment_method=payment_method,
-            notes=notes,
-            previous_reading=float(previous_reading) if previous_reading else None,
-            current_reading=float(current_reading) if current_reading else None,
-            volume=volume
-        )
+        payment_id = db.add_payment(**payment)
         
         if payment_id:
+            get_ha_client().notify_payments_changed(payment["payment_type_id"])
             return web.json_response({
                 "success": True,
                 "payment_id": payment_id
             })
         else:
-            # Get language from query or default to 'en'
-            lang = request.query.get("lang", "en")
             return web.json_response({
                 "success": False,
                 "error": get_error_message("failed_to_save", lang)
@@ -427,748 +629,164 @@ async def add_payment(request: web.Request) -> web.Response:
         }, status=500)
 
 
-async def index(request: web.Request) -> web.Response:
-    """Serve index page."""
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Коммунальные платежи</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@mdi/font@latest/css/materialdesignicons.min.css">
-        <style>
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-                background: white;
-                padding: 30px;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            h1 {
-                color: #03a9f4;
-                margin-top: 0;
-                display: flex;
-                align-items: center;
-                gap: 15px;
-            }
-            .header-actions {
-                display: flex;
-                gap: 10px;
-                margin-bottom: 20px;
-                align-items: center;
-            }
-            .add-btn {
-                background: #4caf50;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 14px;
-                display: flex;
-                align-items: center;
-                gap: 6px;
-            }
-            .add-btn:hover {
-                background: #45a049;
-            }
-            .payments-list {
-                margin-top: 30px;
-            }
-            .payment-item {
-                padding: 15px;
-                border-bottom: 1px solid #e0e0e0;
-                display: flex;
-                justify-content: space-between;
-                align-items: flex-start;
-            }
-            .payment-item:last-child {
-                border-bottom: none;
-            }
-            .payment-info {
-                flex: 1;
-            }
-            .payment-type {
-                font-weight: 600;
-                color: #333;
-                font-size: 16px;
-                margin-bottom: 8px;
-            }
-            .payment-details {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 15px;
-                font-size: 14px;
-                color: #666;
-            }
-            .payment-detail {
-                display: flex;
-                flex-direction: column;
-                gap: 2px;
-            }
-            .payment-detail-label {
-                font-size: 12px;
-                color: #999;
-            }
-            .payment-detail-value {
-                font-weight: 500;
-                color: #333;
-            }
-            .payment-amount {
-                text-align: right;
-                display: flex;
-                flex-direction: column;
-                gap: 5px;
-            }
-            .amount-value {
-                font-size: 24px;
-                font-weight: bold;
-                color: #03a9f4;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            .amount-value .mdi {
-                font-size: 20px;
-            }
-            .unit-price {
-                font-size: 12px;
-                color: #666;
-                display: flex;
-                align-items: center;
-                gap: 4px;
-            }
-            .unit-price .mdi {
-                font-size: 14px;
-            }
-            .loading {
-                text-align: center;
-                padding: 20px;
-                color: #666;
-            }
-            .modal {
-                display: none;
-                position: fixed;
-                z-index: 1000;
-                left: 0;
-                top: 0;
-                width: 100%;
-                height: 100%;
-                background-color: rgba(0,0,0,0.5);
-                overflow-y: auto;
-            }
-            .modal-content {
-                background-color: white;
-                margin: 5% auto;
-                padding: 30px;
-                border-radius: 8px;
-                width: 90%;
-                max-width: 800px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            .modal-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 20px;
-            }
-            .modal-header h2 {
-                margin: 0;
-                color: #03a9f4;
-            }
-            .close {
-                color: #aaa;
-                font-size: 28px;
-                font-weight: bold;
-                cursor: pointer;
-            }
-            .close:hover {
-                color: #000;
-            }
-            .form-group {
-                margin-bottom: 20px;
-            }
-            .form-group label {
-                display: block;
-                margin-bottom: 8px;
-                color: #333;
-                font-weight: 500;
-            }
-            .form-group input,
-            .form-group select,
-            .form-group textarea {
-                width: 100%;
-                padding: 10px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                font-size: 16px;
-                box-sizing: border-box;
-                font-family: inherit;
-            }
-            .form-group input:focus,
-            .form-group select:focus,
-            .form-group textarea:focus {
-                outline: none;
-                border-color: #03a9f4;
-            }
-            .form-group textarea {
-                resize: vertical;
-                min-height: 80px;
-            }
-            .form-group input[readonly] {
-                background-color: #f5f5f5;
-            }
-            .form-group small {
-                color: #666;
-                font-size: 12px;
-            }
-            .form-columns {
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 30px;
-            }
-            .form-column h3 {
-                margin-top: 0;
-                margin-bottom: 15px;
-                color: #333;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            .form-column:last-child h3 {
-                color: #666;
-            }
-            .form-group-full-width {
-                grid-column: 1 / -1;
-            }
-            .modal-footer {
-                display: flex;
-                justify-content: flex-end;
-                gap: 10px;
-                margin-top: 20px;
-            }
-            .btn {
-                padding: 10px 20px;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-            }
-            .btn-primary {
-                background: #03a9f4;
-                color: white;
-            }
-            .btn-primary:hover {
-                background: #0288d1;
-            }
-            .btn-secondary {
-                background: #ccc;
-                color: #333;
-            }
-            .btn-secondary:hover {
-                background: #bbb;
-            }
-            .error-message {
-                color: #f44336;
-                margin-top: 10px;
-                font-size: 14px;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>
-                <span class="mdi mdi-cash-multiple"></span>
-                Оплаты
-            </h1>
-            <div class="header-actions">
-                <button class="add-btn" onclick="openModal()">
-                    <span class="mdi mdi-pencil-plus"></span>
-                    Добавить оплату
-                </button>
-            </div>
-            <div class="payments-list" id="payments-list">
-                <div class="loading">Загрузка...</div>
-            </div>
-        </div>
+async def import_payments(request: web.Request) -> web.Response:
+    """Import many payments at once from JSON (list or {"payments": [...]}) or CSV with a header row.
+
+    All rows are validated first; nothing is saved if any row is invalid.
+    """
+    try:
+        lang = request.query.get("lang", "en")
         
-        <!-- Modal -->
-        <div id="addModal" class="modal">
-            <div class="modal-content">
-                <div class="modal-header">
-                    <h2>Добавить оплату</h2>
-                    <span class="close" onclick="closeModal()">&times;</span>
-                </div>
-                <form id="addForm" onsubmit="addPayment(event)">
-                    <div class="form-group form-group-full-width">
-                        <label for="paymentType">Тип оплаты:</label>
-                        <select id="paymentType" name="payment_type_id" required>
-                            <option value="">Выберите тип оплаты</option>
-                        </select>
-                    </div>
-                    <div class="form-columns">
-                        <div class="form-column">
-                            <h3>Обязательные поля</h3>
-                            <div class="form-group">
-                                <label for="paymentDate">Дата оплаты:</label>
-                                <input type="date" id="paymentDate" name="payment_date" required onchange="calculatePeriod()">
-                            </div>
-                            <div class="form-group">
-                                <label for="amount">Сумма:</label>
-                                <input type="number" id="amount" name="amount" step="0.01" min="0" placeholder="0.00" required>
-                            </div>
-                            <div class="form-group">
-                                <label for="previousReading">Предыдущее показание счётчика:</label>
-                                <input type="number" id="previousReading" name="previous_reading" step="0.001" min="0" placeholder="0.000" oninput="calculateVolume()">
-                            </div>
-                            <div class="form-group">
-                                <label for="currentReading">Текущее показание счётчика:</label>
-                                <input type="number" id="currentReading" name="current_reading" step="0.001" min="0" placeholder="0.000" oninput="calculateVolume()">
-                            </div>
-                            <div class="form-group">
-                                <label for="volume">Объём:</label>
-                                <input type="number" id="volume" name="volume" step="0.001" min="0.001" placeholder="0.000" readonly>
-                            </div>
-                        </div>
-                        <div class="form-column">
-                            <h3>Необязательные поля</h3>
-                            <div class="form-group">
-                                <label for="period">Период:</label>
-                                <input type="text" id="period" name="period" placeholder="2024-01" readonly>
-                                <small>Автоматически рассчитывается на основе даты оплаты</small>
-                            </div>
-                            <div class="form-group">
-                                <label for="receiptNumber">Номер квитанции:</label>
-                                <input type="text" id="receiptNumber" name="receipt_number" placeholder="">
-                            </div>
-                            <div class="form-group">
-                                <label for="paymentMethod">Способ оплаты:</label>
-                                <input type="text" id="paymentMethod" name="payment_method" placeholder="Наличные, карта, перевод">
-                            </div>
-                            <div class="form-group">
-                                <label for="notes">Заметки:</label>
-                                <textarea id="notes" name="notes" placeholder=""></textarea>
-                            </div>
-                        </div>
-                    </div>
-                    <div id="errorMessage" class="error-message" style="display: none;"></div>
-                    <div class="modal-footer">
-                        <button type="button" class="btn btn-secondary" onclick="closeModal()">Отмена</button>
-                        <button type="submit" class="btn btn-primary">Добавить</button>
-                    </div>
-                </form>
-            </div>
-        </div>
-        <script>
-            let paymentTypes = [];
-            let currency = 'EUR'; // Default currency
-            let language = 'en'; // Default language (English)
-            let translations = {}; // Will be loaded from API
-            
-            function t(key) {
-                return translations[key] || key;
-            }
-            
-            async function loadTranslations() {
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/translations?lang=' + language;
-                    const response = await fetch(apiUrl);
-                    const data = await response.json();
-                    
-                    if (data.success && data.translations) {
-                        translations = data.translations;
-                        console.log('Loaded translations for language:', language);
-                        // Update UI text after translations are loaded
-                        updateUIText();
-                    } else {
-                        console.error('Failed to load translations:', data.error);
-                        // Fallback: try to load English translations
-                        if (language !== 'en') {
-                            const fallbackUrl = window.location.pathname.replace(/\/$/, '') + '/api/translations?lang=en';
-                            const fallbackResponse = await fetch(fallbackUrl);
-                            const fallbackData = await fallbackResponse.json();
-                            if (fallbackData.success && fallbackData.translations) {
-                                translations = fallbackData.translations;
-                                updateUIText();
-                            }
-                        }
-                    }
-                } catch (error) {
-                    console.error('Error loading translations:', error);
-                }
-            }
-            
-            async function loadConfig() {
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/config';
-                    const response = await fetch(apiUrl);
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        if (data.currency) {
-                            currency = data.currency;
-                        }
-                        if (data.language) {
-                            language = data.language;
-                        }
-                        console.log('Loaded config from HA - currency:', currency, 'language:', language);
-                        // Load translations for the selected language
-                        await loadTranslations();
-                    }
-                } catch (error) {
-                    console.error('Error loading config:', error);
-                }
-            }
-            
-            function updateUIText() {
-                // Update page title
-                const titleEl = document.querySelector('h1');
-                if (titleEl) {
-                    titleEl.innerHTML = '<span class="mdi mdi-cash-multiple"></span>' + t('title');
-                }
-                
-                // Update add button
-                const addBtn = document.querySelector('.add-btn');
-                if (addBtn) {
-                    addBtn.innerHTML = '<span class="mdi mdi-pencil-plus"></span>' + t('addPayment');
-                }
-                
-                // Update modal title
-                const modalTitle = document.querySelector('.modal-header h2');
-                if (modalTitle) {
-                    modalTitle.textContent = t('addPayment');
-                }
-                
-                // Update form labels
-                const labels = {
-                    'paymentType': t('paymentType'),
-                    'paymentDate': t('paymentDate'),
-                    'amount': t('amount'),
-                    'previousReading': t('previousReading'),
-                    'currentReading': t('currentReading'),
-                    'volume': t('volume'),
-                    'period': t('period'),
-                    'receiptNumber': t('receiptNumber'),
-                    'paymentMethod': t('paymentMethod'),
-                    'notes': t('notes')
-                };
-                
-                for (const [id, text] of Object.entries(labels)) {
-                    const label = document.querySelector(`label[for="${id}"]`);
-                    if (label) {
-                        label.textContent = text;
-                    }
-                }
-                
-                // Update column headers
-                const requiredHeader = document.querySelector('.form-column:first-child h3');
-                if (requiredHeader) {
-                    requiredHeader.textContent = t('requiredFields');
-                }
-                const optionalHeader = document.querySelector('.form-column:last-child h3');
-                if (optionalHeader) {
-                    optionalHeader.textContent = t('optionalFields');
-                }
-                
-                // Update buttons
-                const cancelBtn = document.querySelector('.btn-secondary');
-                if (cancelBtn) {
-                    cancelBtn.textContent = t('cancel');
-                }
-                const submitBtn = document.querySelector('.btn-primary[type="submit"]');
-                if (submitBtn) {
-                    submitBtn.textContent = t('add');
-                }
-                
-                // Update period hint
-                const periodHint = document.querySelector('#period').nextElementSibling;
-                if (periodHint && periodHint.tagName === 'SMALL') {
-                    periodHint.textContent = t('periodHint');
-                }
-            }
-            
-            async function loadPaymentTypes() {
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payment-types?lang=' + language;
-                    const response = await fetch(apiUrl);
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        paymentTypes = data.types;
-                        const select = document.getElementById('paymentType');
-                        select.innerHTML = '<option value="">' + t('selectPaymentType') + '</option>';
-                        data.types.forEach(type => {
-                            const option = document.createElement('option');
-                            option.value = type.id;
-                            option.textContent = type.name;
-                            select.appendChild(option);
-                        });
-                    }
-                } catch (error) {
-                    console.error('Error loading payment types:', error);
-                }
-            }
-            
-            function calculateVolume() {
-                const previous = parseFloat(document.getElementById('previousReading').value) || 0;
-                const current = parseFloat(document.getElementById('currentReading').value) || 0;
-                const volumeInput = document.getElementById('volume');
-                
-                if (previous > 0 && current > 0 && current >= previous) {
-                    const volume = current - previous;
-                    if (volume > 0) {
-                        volumeInput.value = volume.toFixed(3);
-                    } else {
-                        volumeInput.value = '';
-                    }
-                } else {
-                    volumeInput.value = '';
-                }
-            }
-            
-            function calculatePeriod() {
-                const dateInput = document.getElementById('paymentDate');
-                const periodInput = document.getElementById('period');
-                
-                if (dateInput.value) {
-                    const date = new Date(dateInput.value);
-                    const year = date.getFullYear();
-                    const month = String(date.getMonth() + 1).padStart(2, '0');
-                    periodInput.value = `${year}-${month}`;
-                } else {
-                    periodInput.value = '';
-                }
-            }
-            
-            async function loadPayments() {
-                const list = document.getElementById('payments-list');
-                list.innerHTML = '<div class="loading">' + t('loading') + '</div>';
-                
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payments?lang=' + language;
-                    const response = await fetch(apiUrl);
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        if (data.payments.length === 0) {
-                            list.innerHTML = '<div class="loading">' + t('noPayments') + '</div>';
-                        } else {
-                            list.innerHTML = data.payments.map(payment => {
-                                const typeName = payment.payment_type_name || t('unknown');
-                                const amount = formatAmount(payment.amount);
-                                const period = payment.period || '';
-                                const date = formatDate(payment.payment_date);
-                                
-                                let details = [];
-                                if (payment.receipt_number) {
-                                    details.push({label: t('receipt'), value: payment.receipt_number});
-                                }
-                                if (payment.payment_method) {
-                                    details.push({label: t('method'), value: payment.payment_method});
-                                }
-                                if (payment.previous_reading !== undefined && payment.current_reading !== undefined) {
-                                    details.push({
-                                        label: t('readings'),
-                                        value: `${payment.previous_reading} → ${payment.current_reading}`
-                                    });
-                                }
-                                if (payment.volume !== undefined) {
-                                    details.push({label: t('volumeLabel'), value: payment.volume.toFixed(3)});
-                                }
-                                
-                                let unitPriceHtml = '';
-                                if (payment.unit_price !== undefined) {
-                                    unitPriceHtml = `<div class="unit-price"><span class="mdi mdi-cash"></span>${formatAmount(payment.unit_price)} ${t('perUnit')}</div>`;
-                                }
-                                
-                                return `
-                                <div class="payment-item">
-                                    <div class="payment-info">
-                                        <div class="payment-type">${escapeHtml(typeName)}</div>
-                                        <div class="payment-details">
-                                            <div class="payment-detail">
-                                                <span class="payment-detail-label">${t('periodLabel')}</span>
-                                                <span class="payment-detail-value">${escapeHtml(period)}</span>
-                                            </div>
-                                            <div class="payment-detail">
-                                                <span class="payment-detail-label">${t('dateLabel')}</span>
-                                                <span class="payment-detail-value">${escapeHtml(date)}</span>
-                                            </div>
-                                            ${details.map(d => `
-                                                <div class="payment-detail">
-                                                    <span class="payment-detail-label">${escapeHtml(d.label)}</span>
-                                                    <span class="payment-detail-value">${escapeHtml(d.value)}</span>
-                                                </div>
-                                            `).join('')}
-                                        </div>
-                                    </div>
-                                    <div class="payment-amount">
-                                        <div class="amount-value"><span class="mdi mdi-cash"></span>${amount}</div>
-                                        ${unitPriceHtml}
-                                    </div>
-                                </div>
-                            `;
-                            }).join('');
-                        }
-                    } else {
-                        const errorText = language === 'ru' ? 'Ошибка: ' : 'Error: ';
-                        list.innerHTML = '<div class="loading">' + errorText + escapeHtml(data.error) + '</div>';
-                    }
-                } catch (error) {
-                    const errorText = language === 'ru' ? 'Ошибка загрузки: ' : 'Loading error: ';
-                    list.innerHTML = '<div class="loading">' + errorText + escapeHtml(error.message) + '</div>';
-                }
-            }
-            
-            function escapeHtml(text) {
-                const div = document.createElement('div');
-                div.textContent = text;
-                return div.innerHTML;
-            }
-            
-            function formatAmount(amount) {
-                // Format amount with currency symbol
-                try {
-                    return new Intl.NumberFormat('ru-RU', {
-                        style: 'currency',
-                        currency: currency,
-                        minimumFractionDigits: 2,
-                        maximumFractionDigits: 2
-                    }).format(amount);
-                } catch (e) {
-                    // Fallback if currency is not supported
-                    return new Intl.NumberFormat('ru-RU', {
-                        minimumFractionDigits: 2,
-                        maximumFractionDigits: 2
-                    }).format(amount) + ' ' + currency;
-                }
-            }
-            
-            function formatDate(dateStr) {
-                if (!dateStr) return '';
-                const date = new Date(dateStr);
-                return date.toLocaleDateString('ru-RU');
-            }
-            
-            function openModal() {
-                // Set current date
-                const today = new Date();
-                const dateStr = today.toISOString().split('T')[0];
-                document.getElementById('paymentDate').value = dateStr;
-                calculatePeriod();
-                
-                document.getElementById('addModal').style.display = 'block';
-                document.getElementById('paymentType').focus();
-            }
-            
-            function closeModal() {
-                document.getElementById('addModal').style.display = 'none';
-                document.getElementById('addForm').reset();
-                document.getElementById('errorMessage').style.display = 'none';
-                document.getElementById('volume').value = '';
-                document.getElementById('period').value = '';
-                
-                // Reset to current date
-                const today = new Date();
-                const dateStr = today.toISOString().split('T')[0];
-                document.getElementById('paymentDate').value = dateStr;
-                calculatePeriod();
-            }
-            
-            window.onclick = function(event) {
-                const modal = document.getElementById('addModal');
-                if (event.target == modal) {
-                    closeModal();
-                }
-            }
-            
-            async function addPayment(event) {
-                event.preventDefault();
-                const errorDiv = document.getElementById('errorMessage');
-                errorDiv.style.display = 'none';
-                
-                const formData = new FormData(event.target);
-                const previousReading = formData.get('previous_reading');
-                const currentReading = formData.get('current_reading');
-                const volume = formData.get('volume');
-                
-                // Validate volume if readings are provided
-                if (previousReading && currentReading) {
-                    const volumeValue = parseFloat(volume);
-                    if (!volume || isNaN(volumeValue) || volumeValue <= 0) {
-                        errorDiv.textContent = t('errorVolume');
-                        errorDiv.style.display = 'block';
-                        return;
-                    }
-                }
-                
-                const data = {
-                    payment_type_id: formData.get('payment_type_id'),
-                    amount: parseFloat(formData.get('amount')),
-                    period: formData.get('period'),
-                    payment_date: formData.get('payment_date'),
-                    receipt_number: formData.get('receipt_number') || null,
-                    payment_method: formData.get('payment_method') || null,
-                    notes: formData.get('notes') || null,
-                    previous_reading: previousReading || null,
-                    current_reading: currentReading || null
-                };
-                
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/payments';
-                    const response = await fetch(apiUrl, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify(data)
-                    });
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {
-                        closeModal();
-                        loadPayments();
-                    } else {
-                        errorDiv.textContent = result.error || 'Ошибка при сохранении';
-                        errorDiv.style.display = 'block';
-                    }
-                } catch (error) {
-                    errorDiv.textContent = 'Ошибка: ' + error.message;
-                    errorDiv.style.display = 'block';
-                }
-            }
-            
-            // Load data on page load
-            loadConfig().then(() => {
-                // loadTranslations is already called in loadConfig after language is set
-                loadPaymentTypes();
-                loadPayments();
-            });
-        </script>
-    </body>
-    </html>
+        if request.content_type in ("text/csv", "application/csv"):
+            text = await request.text()
+            rows = [{key: value for key, value in row.items() if value != ""}
+                    for row in csv.DictReader(io.StringIO(text))]
+        else:
+            data = await request.json()
+            rows = data.get("payments", []) if isinstance(data, dict) else data
+        
+        if not isinstance(rows, list) or not rows:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("nothing_to_import", lang)
+            }, status=400)
+        
+        payments = []
+        errors = []
+        for index, row in enumerate(rows, start=1):
+            payment, error_key = validate_payment(row) if isinstance(row, dict) else (None, "invalid_query")
+            if error_key:
+                errors.append({"row": index, "error": get_error_message(error_key, lang)})
+            else:
+                payments.append((index, payment))
+        
+        # Readings must also grow within the batch, so check each type in date order
+        last_readings: dict[int, float] = {}
+        for index, payment in sorted(payments, key=lambda item: (item[1]["payment_date"], item[0])):
+            error_key = check_reading_order(payment, last_readings.get(payment["payment_type_id"]))
+            if error_key:
+                errors.append({"row": index, "error": get_error_message(error_key, lang)})
+            elif payment["current_reading"] is not None:
+                last_readings[payment["payment_type_id"]] = payment["current_reading"]
+        errors.sort(key=lambda error: error["row"])
+        
+        if errors:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("import_rows_invalid", lang),
+                "errors": errors[:IMPORT_MAX_ERRORS],
+                "error_count": len(errors)
+            }, status=400)
+        
+        imported = db.add_payments([payment for _index, payment in payments])
+        if imported is None:
+            return web.json_response({
+                "success": False,
+                "error": get_error_message("failed_to_save", lang)
+            }, status=500)
+        
+        get_ha_client().notify_payments_changed()
+        _LOGGER.info("Imported %d payments", imported)
+        return web.json_response({
+            "success": True,
+            "imported": imported
+        })
+    except (ValueError, UnicodeDecodeError, csv.Error) as err:
+        _LOGGER.warning("Could not parse payments import: %s", err)
+        return web.json_response({
+            "success": False,
+            "error": get_error_message("invalid_import_format", request.query.get("lang", "en"))
+        }, status=400)
+    except Exception as err:
+        _LOGGER.error("Error importing payments: %s", err, exc_info=True)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
+async def export_payments(request: web.Request) -> web.StreamResponse:
+    """Stream payments as CSV (default) or NDJSON, oldest first, in keyset-paged chunks.
+
+    Accepts the same filters as /api/payments.
     """
-    return web.Response(text=html, content_type="text/html")
+    lang = request.query.get("lang", "en")
+    export_format = request.query.get("format", "csv")
+    try:
+        payment_type_id = request.query.get("payment_type_id")
+        payment_type_id = int(payment_type_id) if payment_type_id else None
+    except ValueError:
+        payment_type_id = -1
+    if export_format not in ("csv", "ndjson") or payment_type_id == -1:
+        return web.json_response({
+            "success": False,
+            "error": get_error_message("invalid_query", lang)
+        }, status=400)
+    
+    if export_format == "csv":
+        content_type = "text/csv"
+    else:
+        content_type = "application/x-ndjson"
+    response = web.StreamResponse(headers={
+        "Content-Type": f"{content_type}; charset=utf-8",
+        "Content-Disposition": f'attachment; filename="payments.{export_format}"'
+    })
+    await response.prepare(request)
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(PAYMENT_FIELDS)
+    
+    filters = {
+        "payment_type_id": payment_type_id,
+        "period": request.query.get("period") or None,
+        "date_from": request.query.get("date_from") or None,
+        "date_to": request.query.get("date_to") or None
+    }
+    date_index = PAYMENT_FIELDS.index("payment_date")
+    id_index = PAYMENT_FIELDS.index("id")
+    loop = asyncio.get_running_loop()
+    after = None
+    while True:
+        # Each chunk is read in a worker thread; the event loop only writes to the client
+        chunk = await loop.run_in_executor(None, functools.partial(db.get_payments_chunk, after=after, **filters))
+        if not chunk:
+            break
+        for row in chunk:
+            if export_format == "csv":
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(dict(zip(PAYMENT_FIELDS, row)), ensure_ascii=False) + "\n")
+        await response.write(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+        after = (chunk[-1][date_index], chunk[-1][id_index])
+    
+    if buffer.tell():
+        await response.write(buffer.getvalue().encode("utf-8"))
+    await response.write_eof()
+    return response
 
 
 def create_app() -> web.Application:
     """Create web application."""
-    app = web.Application()
-    app.router.add_get("/", index)
+    app = web.Application(client_max_size=IMPORT_MAX_SIZE)
+    assets.setup(app)
+    app.on_startup.append(start_ha_config)
+    app.on_cleanup.append(stop_ha_config)
+    app.cleanup_ctx.append(refresh_forecasts)
     app.router.add_get("/api/payments", get_payments)
     app.router.add_get("/api/payment-types", get_payment_types)
     app.router.add_get("/api/config", get_config)
     app.router.add_get("/api/translations", get_translations)
     app.router.add_get("/api/sensors", get_sensors)
+    app.router.add_get("/api/analytics", get_analytics)
+    app.router.add_get("/api/forecast", get_forecast)
+    app.router.add_get("/api/readings/latest", get_latest_readings)
     app.router.add_post("/api/payments", add_payment)
+    app.router.add_post("/api/payments/import", import_payments)
+    app.router.add_get("/api/payments/export", export_payments)
     return app
 
 
@@ -1189,4 +807,5 @@ async def run_web_server(port: int = 8099):
         _LOGGER.info("Shutting down web server...")
     finally:
         await runner.cleanup()
+        await get_ha_client().close()
 
@@ -0,0 +1,264 @@
+"""Replay benchmark for the Ozon crawl -> save -> read pipeline.
+
+Serves a corpus of recorded product pages from a local stand-in server
+(with configurable latency and error injection) and runs the add-on code
+against it with a throwaway database:
+
+  crawl  - parse-all endpoint of the add-on web app over the stand-in server
+  save   - Database.save_page through the async writer
+  read   - Database.get_page back from the page store
+
+Usage:
+  python bench/replay.py --corpus /data/pages --pages 500 --latency 50 --error-rate 0.02
+  python bench/replay.py --pages 200 --json
+
+The corpus is a directory of *.html files or page store blobs (*/*.gz);
+without --corpus synthetic pages are generated.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+ROOTFS = Path(__file__).resolve().parent.parent / "rootfs"
+sys.path.insert(0, str(ROOTFS))
+
+SYNTHETIC_PAGE_SIZE = 300 * 1024  # Roughly the size of a real Ozon product page
+
+
+def load_corpus(path: str | None, count: int) -> list[str]:
+    """Load recorded pages, or generate synthetic ones."""
+    pages = []
+    if path:
+        root = Path(path)
+        for file in sorted(root.glob("*.html")):
+            pages.append(file.read_text(encoding="utf-8", errors="replace"))
+        for file in sorted(root.glob("*/*.gz")):
+            pages.append(gzip.decompress(file.read_bytes()).decode("utf-8", errors="replace"))
+        if not pages:
+            raise SystemExit(f"No pages found in {path}")
+        return pages
+
+    rng = random.Random(42)
+    words = ["товар", "цена", "доставка", "отзывы", "продавец", "характеристики", "скидка", "наличие"]
+    for index in range(min(count, 50)):
+        body = " ".join(rng.choice(words) for _ in range(SYNTHETIC_PAGE_SIZE // 10))
+        pages.append(f"<html><head><title>Товар {index}</title></head><body>{body}</body></html>")
+    return pages
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Get q-th percentile (0..100) of values."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def storage_size(data_dir: Path) -> int:
+    """Total bytes of database files and page blobs."""
+    return sum(file.stat().st_size for file in data_dir.rglob("*") if file.is_file())
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def create_replay_app(corpus: list[str], latency: float, jitter: float,
+                      error_rate: float, throttle_rate: float) -> web.Application:
+    """Create stand-in server replaying corpus pages."""
+
+    async def product_page(request: web.Request) -> web.Response:
+        delay = max(0.0, random.gauss(latency, jitter)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+        roll = random.random()
+        if roll < throttle_rate:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        if roll < throttle_rate + error_rate:
+            return web.Response(status=500, text="Internal Server Error")
+        page = corpus[int(request.match_info["product_id"]) % len(corpus)]
+        return web.Response(text=page, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/product/{product_id}/", product_page)
+    return app
+
+
+async def start_site(app: web.Application) -> tuple[web.AppRunner, int]:
+    """Start app on a free local port."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+def stage_report(name: str, count: int, elapsed: float, latencies: list[float],
+                 size_before: int, size_after: int, errors: int = 0) -> dict[str, Any]:
+    """Build report of a benchmark stage."""
+    p50 = percentile(latencies, 50)
+    p95 = percentile(latencies, 95)
+    return {
+        "stage": name,
+        "pages": count,
+        "errors": errors,
+        "elapsed": round(elapsed, 3),
+        "pages_per_sec": round(count / elapsed, 1) if elapsed else None,
+        "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "storage_growth_bytes": size_after - size_before
+    }
+
+
+async def bench_crawl(base_url: str, replay_port: int, pages: int, db: Any,
+                      data_dir: Path, endpoint: str) -> dict[str, Any]:
+    """Seed products pointing at the stand-in server and run parse-all."""
+    await db.upsert_products([{
+        "id": str(index),
+        "url": f"http://127.0.0.1:{replay_port}/product/{index}/",
+        "name": f"Товар {index}",
+        "price": 100 + index
+    } for index in range(pages)])
+
+    size_before = storage_size(data_dir)
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    async with ClientSession(timeout=ClientTimeout(total=None)) as session:
+        if endpoint == "stream":
+            async with session.post(f"{base_url}/api/parse-all/stream") as response:
+                async for line in response.content:
+                    message = json.loads(line)
+                    if message["type"] == "result":
+                        latencies.append(message["elapsed"])
+                        errors += message["status"] != "success"
+        else:
+            async with session.post(f"{base_url}/api/parse-all") as response:
+                errors = (await response.json())["error_count"]
+    elapsed = time.perf_counter() - start
+    await db.optimize()
+    return stage_report(f"crawl ({endpoint})", pages, elapsed, latencies,
+                        size_before, storage_size(data_dir), errors)
+
+
+async def bench_save(corpus: list[str], pages: int, db: Any, data_dir: Path) -> dict[str, Any]:
+    """Save pages concurrently through the async writer."""
+    size_before = storage_size(data_dir)
+    latencies = []
+
+    async def save(index: int) -> None:
+        started = time.perf_counter()
+        await db.save_page(f"save-{index}", corpus[index % len(corpus)])
+        latencies.append(time.perf_counter() - started)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(save(index) for index in range(pages)))
+    elapsed = time.perf_counter() - start
+    return stage_report("save", pages, elapsed, latencies, size_before, storage_size(data_dir))
+
+
+async def bench_read(pages: int, db: Any, data_dir: Path) -> dict[str, Any]:
+    """Read saved pages back from the page store."""
+    size_before = storage_size(data_dir)
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for index in range(pages):
+        started = time.perf_counter()
+        page = await db.get_page(f"save-{index}")
+        latencies.append(time.perf_counter() - started)
+        errors += not page or page["html"] is None
+    elapsed = time.perf_counter() - start
+    return stage_report("read", pages, elapsed, latencies, size_before, storage_size(data_dir), errors)
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Run all benchmark stages against a temporary data directory."""
+    corpus = load_corpus(args.corpus, args.pages)
+
+    with tempfile.TemporaryDirectory(prefix="ozon-bench-") as tmp:
+        data_dir = Path(tmp)
+
+        # Point the add-on at the throwaway data directory before its modules create singletons
+        import database
+        database.DB_FILE = str(data_dir / "ozon.db")
+        import fetcher
+        if not args.pacing:
+            fetcher.RATE_MIN_INTERVAL = 0.0
+        fetcher._fetcher = fetcher.OzonFetcher(str(data_dir / "cookies.pickle"))
+        import web_server
+        web_server.CRAWL_WORKERS = args.workers
+        db = web_server.db
+
+        replay_runner, replay_port = await start_site(create_replay_app(
+            corpus, args.latency, args.jitter, args.error_rate, args.throttle_rate))
+        app_runner, app_port = await start_site(web_server.create_app())
+        try:
+            reports = [
+                await bench_crawl(f"http://127.0.0.1:{app_port}", replay_port, args.pages,
+                                  db, data_dir, args.endpoint),
+                await bench_save(corpus, args.pages, db, data_dir),
+                await bench_read(args.pages, db, data_dir),
+            ]
+        finally:
+            await app_runner.cleanup()
+            await replay_runner.cleanup()
+            await fetcher.get_fetcher().close()
+            db.close()
+    return reports
+
+
+def print_reports(reports: list[dict[str, Any]]) -> None:
+    """Print reports as a table."""
+    columns = ["stage", "pages", "errors", "pages_per_sec", "p50_ms", "p95_ms", "peak_rss_mb", "storage_growth_bytes"]
+    widths = [max(len(column), *(len(str(report[column])) for report in reports)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for report in reports:
+        print("  ".join(str(report[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory with recorded pages (*.html or page store blobs)")
+    parser.add_argument("--pages", type=int, default=200, help="Number of products to crawl and save")
+    parser.add_argument("--latency", type=float, default=50.0, help="Mean stand-in server latency, ms")
+    parser.add_argument("--jitter", type=float, default=20.0, help="Latency standard deviation, ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 answers")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of HTTP 429 answers")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent crawl workers")
+    parser.add_argument("--endpoint", choices=["stream", "json"], default="stream",
+                        help="parse-all variant to drive (per-page latency needs stream)")
+    parser.add_argument("--pacing", action="store_true", help="Keep production request pacing")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("web_server").setLevel(logging.CRITICAL)
+    logging.getLogger("database").setLevel(logging.WARNING)
+    reports = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+    else:
+        print_reports(reports)
+
+
+if __name__ == "__main__":
+    main()
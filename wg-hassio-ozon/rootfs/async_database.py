@@ -0,0 +1,118 @@
+"""Async access layer over the Ozon SQLite database."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from database import Database
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_WORKERS = 4  # Reader threads (WAL allows reads alongside the writer)
+WRITE_BATCH_SIZE = 100  # Max queued writes committed in one transaction
+
+# Database methods that only read; every other method goes to the writer thread
+READ_METHODS = {"product_exists", "search_products"}
+
+
+class AsyncDatabase:
+    """Async facade over Database with the same method surface.
+
+    Reads run in a small thread pool. Writes are queued to a single writer
+    thread, which commits everything queued at that moment in one transaction,
+    each write under its own savepoint.
+    """
+
+    def __init__(self, db: Database) -> None:
+        """Initialize async database and start writer thread."""
+        self._db = db
+        self._readers = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="db-reader")
+        self._writes: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer.start()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if name.startswith("get_") or name in READ_METHODS:
+            return functools.partial(self._read, attr)
+        return functools.partial(self._write, attr)
+
+    async def _read(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run read in reader pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args, **kwargs))
+
+    async def _write(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Queue write for writer thread and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.put((func, args, kwargs, loop, future))
+        return await future
+
+    def _writer_loop(self) -> None:
+        """Writer thread: take queued writes and commit them in batches."""
+        while True:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._writes.put(None)
+                    break
+                batch.append(item)
+
+            results = []
+            try:
+                with self._db.batch():
+                    for func, args, kwargs, _loop, _future in batch:
+                        try:
+                            results.append((self._db.call_in_batch(func, *args, **kwargs), None))
+                        except Exception as err:
+                            results.append((None, err))
+            except Exception as err:
+                _LOGGER.error("Error committing batch of %d writes: %s", len(batch), err)
+                results = [(None, err)] * len(batch)
+
+            if len(batch) > 1:
+                _LOGGER.debug("Committed %d writes in one transaction", len(batch))
+            for (_func, _args, _kwargs, loop, future), (result, error) in zip(batch, results):
+                loop.call_soon_threadsafe(_set_future, future, result, error)
+
+    def close(self) -> None:
+        """Stop writer thread after pending writes and shut down reader pool."""
+        self._writes.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True)
+
+
+def _set_future(future: asyncio.Future, result: Any, error: Exception | None) -> None:
+    """Resolve future unless it was cancelled."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+_async_db: AsyncDatabase | None = None
+
+
+def get_async_database() -> AsyncDatabase:
+    """Get shared async database instance."""
+    global _async_db
+    if _async_db is None:
+        _async_db = AsyncDatabase(Database())
+    return _async_db
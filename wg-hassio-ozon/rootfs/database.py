@@ -2,14 +2,91 @@
 from __future__ import annotations
 
 import logging
+import math
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+
+from page_store import PageStore
 
 _LOGGER = logging.getLogger(__name__)
 
 DB_FILE = "/data/ozon.db"
+DB_TIMEOUT = 30  # Seconds to wait for a lock held by another connection
+PAGES_DIR = "pages"  # Page blobs directory, next to the database file
+
+# Allowed sort keys for product listing (API name -> SQL expression)
+PRODUCT_SORT_COLUMNS = {
+    "created_at": "p.created_at",
+    "updated_at": "p.updated_at",
+    "name": "p.name COLLATE NOCASE",
+    "price": "p.price",
+    "last_fetch": "f.timestamp",
+}
+
+# Price time-series settings
+PRICE_STEP_HOUR = 3600
+PRICE_STEP_DAY = 86400
+PRICE_ROLLUP_STEPS = (PRICE_STEP_HOUR, PRICE_STEP_DAY)
+PRICE_RAW_RETENTION = 90 * 86400  # Raw price points are kept for 90 days
+PRICE_HOURLY_RETENTION = 2 * 365 * 86400  # Hourly buckets are kept for 2 years, daily forever
+
+# Fetch history settings
+FETCH_HISTORY_KEEP = 50  # Raw fetch_history rows kept per product, older ones are rolled up daily
+FETCH_ERROR_MAX_LENGTH = 500  # Error messages are truncated to this length
+INCREMENTAL_VACUUM_PAGES = 2000  # Free pages returned to the OS per maintenance run
+
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# Callbacks invoked with a price change event after each new price point is committed
+_price_listeners: list[Callable[[dict[str, Any]], None]] = []
+
+
+def add_price_listener(listener: Callable[[dict[str, Any]], None]) -> None:
+    """Register callback for price change events."""
+    _price_listeners.append(listener)
+
+
+def price_to_minor(price: float) -> int:
+    """Convert price to minor currency units (kopecks)."""
+    return int(round(float(price) * 100))
+
+
+def price_from_minor(price_minor: int | None) -> float | None:
+    """Convert price from minor currency units."""
+    return price_minor / 100 if price_minor is not None else None
+
+
+class _BatchConnection:
+    """Connection proxy used inside Database.batch(): commit and close are deferred to the batch.
+
+    Rollback only undoes the current batch call (see Database.call_in_batch).
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        """Wrap connection."""
+        self._conn = conn
+        self.call_failed = False
+
+    def commit(self) -> None:
+        """Commit happens once at the end of the batch."""
+
+    def close(self) -> None:
+        """Connection is closed at the end of the batch."""
+
+    def rollback(self) -> None:
+        """Undo writes of the current batch call and mark it as failed."""
+        self._conn.execute("ROLLBACK TO batch_call")
+        self.call_failed = True
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
 
 
 class Database:
@@ -19,20 +96,84 @@ class Database:
         """Initialize database connection."""
         self.db_path = Path(DB_FILE)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.fts_enabled = False
+        self.page_store = PageStore(self.db_path.parent / PAGES_DIR)
         self._init_database()
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(str(self.db_path))
+        """Get database connection (the batch connection when called inside batch())."""
+        batch_conn = getattr(self._local, "batch_connection", None)
+        if batch_conn is not None:
+            return batch_conn
+        conn = sqlite3.connect(str(self.db_path), timeout=DB_TIMEOUT)
         conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
+        conn.execute("PRAGMA synchronous = NORMAL")
         return conn
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run all database calls made in this thread inside a single transaction.
+
+        Price change events raised inside the batch are sent after commit
+        and dropped on rollback.
+        """
+        conn = self._get_connection()
+        conn.execute("BEGIN")
+        self._local.batch_connection = _BatchConnection(conn)
+        self._local.batch_events = []
+        try:
+            yield
+            conn.commit()
+            events = self._local.batch_events
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.batch_connection = None
+            self._local.batch_events = None
+            conn.close()
+        self._notify_price_listeners(events)
+
+    def call_in_batch(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run one call of the current batch under its own savepoint.
+
+        Database methods catch their errors and roll back their connection,
+        which inside a batch only undoes this call. The call's writes and
+        price events are discarded when it rolls back or raises; the rest of
+        the batch is kept. Return values are passed through as they are.
+        """
+        conn = self._local.batch_connection
+        events = self._local.batch_events
+        mark = len(events)
+        conn.call_failed = False
+        conn.execute("SAVEPOINT batch_call")
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("RELEASE batch_call")
+            if conn.call_failed:
+                del events[mark:]
+
     def _init_database(self) -> None:
         """Initialize database tables."""
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
 
+            # Enable incremental auto-vacuum (existing databases need a one-time VACUUM)
+            cursor.execute("PRAGMA auto_vacuum")
+            if cursor.fetchone()[0] != 2:
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                cursor.execute("VACUUM")
+                _LOGGER.info("Database converted to incremental auto-vacuum")
+
+            # WAL lets readers run while the writer thread holds a transaction
+            cursor.execute("PRAGMA journal_mode = WAL")
+
             # Create products table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS products (
@@ -45,11 +186,12 @@ class Database:
                 )
             """)
 
-            # Create pages table
+            # Create pages table: page metadata only, HTML lives in the page store
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS pages (
                     product_id TEXT PRIMARY KEY,
-                    html TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
                     timestamp TEXT NOT NULL,
                     FOREIGN KEY (product_id) REFERENCES products(id)
                 )
@@ -79,6 +221,55 @@ class Database:
                 )
             """)
 
+            # Create fetch_history_daily table: per-day counters for compacted fetch history
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS fetch_history_daily (
+                    product_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    success_count INTEGER NOT NULL DEFAULT 0,
+                    error_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (product_id, day)
+                ) WITHOUT ROWID
+            """)
+
+            # Create price_points table: raw price changes, compact layout
+            # (epoch seconds and price in minor units, clustered by product and time)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_points (
+                    product_id TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    price_minor INTEGER NOT NULL,
+                    PRIMARY KEY (product_id, ts)
+                ) WITHOUT ROWID
+            """)
+
+            # Create price_rollups table: hourly/daily min/max/last buckets
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_rollups (
+                    product_id TEXT NOT NULL,
+                    step INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    min_minor INTEGER NOT NULL,
+                    max_minor INTEGER NOT NULL,
+                    last_minor INTEGER NOT NULL,
+                    last_ts INTEGER NOT NULL,
+                    samples INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (product_id, step, bucket)
+                ) WITHOUT ROWID
+            """)
+
+            # Create price_stats table: running per-product state for price alerts
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_stats (
+                    product_id TEXT PRIMARY KEY,
+                    min_minor INTEGER,
+                    min_ts INTEGER,
+                    last_minor INTEGER,
+                    last_ts INTEGER,
+                    in_stock INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+
             # Create cron_history table for storing last execution times
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS cron_history (
@@ -91,16 +282,47 @@ class Database:
                 )
             """)
 
+            # Create cron_runs table for full job run history
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cron_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_name TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    duration REAL,
+                    status TEXT,
+                    notes TEXT
+                )
+            """)
+
+            # Create product_schedule table for per-product adaptive refresh
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS product_schedule (
+                    product_id TEXT PRIMARY KEY,
+                    next_fetch_ts INTEGER NOT NULL,
+                    interval INTEGER NOT NULL,
+                    FOREIGN KEY (product_id) REFERENCES products(id)
+                )
+            """)
+
             # Create indexes
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_url ON products(url)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_timestamp ON pages(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_fetch_history_product ON fetch_history(product_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_fetch_history_timestamp ON fetch_history(timestamp)")
+            # Composite index so "latest fetch per product" is a single index seek
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_fetch_history_product_timestamp ON fetch_history(product_id, timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_product ON price_history(product_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_timestamp ON price_history(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_cron_history_job ON cron_history(job_name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cron_runs_job_started ON cron_runs(job_name, started_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_product_schedule_next ON product_schedule(next_fetch_ts)")
 
             conn.commit()
+
+            self._init_search_index(conn)
+            self._migrate_price_history(conn)
+            self._migrate_pages(conn)
+
             conn.close()
             _LOGGER.info("Database initialized successfully")
         except Exception as err:
@@ -139,19 +361,139 @@ class Database:
             _LOGGER.error("Error getting products: %s", err, exc_info=True)
             return []
 
+    def get_products_with_last_fetch(self, limit: int | None = None, offset: int = 0,
+                                     sort: str = "created_at", order: str = "desc") -> tuple[list[dict[str, Any]], int]:
+        """Get products joined with their last fetch status in a single query.
+
+        Returns a tuple of (products, total_count).
+        """
+        try:
+            sort_column = PRODUCT_SORT_COLUMNS.get(sort, PRODUCT_SORT_COLUMNS["created_at"])
+            sort_order = "ASC" if str(order).lower() == "asc" else "DESC"
+
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            query = f"""
+                SELECT p.id, p.url, p.name, p.price,
+                       f.timestamp AS last_fetch_timestamp,
+                       f.status AS last_fetch_status,
+                       f.error_message AS last_fetch_error_message
+                FROM products p
+                LEFT JOIN fetch_history f ON f.id = (
+                    SELECT fh.id FROM fetch_history fh
+                    WHERE fh.product_id = p.id
+                    ORDER BY fh.timestamp DESC
+                    LIMIT 1
+                )
+                ORDER BY {sort_column} {sort_order}, p.id ASC
+            """
+            params: list[Any] = []
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.execute("SELECT COUNT(*) AS count FROM products")
+            total = cursor.fetchone()["count"]
+            conn.close()
+
+            products = []
+            for row in rows:
+                price = row["price"]
+                try:
+                    price = float(price) if price is not None else 0.0
+                except (ValueError, TypeError):
+                    price = 0.0
+
+                last_fetch = None
+                if row["last_fetch_timestamp"] is not None:
+                    last_fetch = {
+                        "timestamp": row["last_fetch_timestamp"],
+                        "status": row["last_fetch_status"],
+                        "error_message": row["last_fetch_error_message"] or None
+                    }
+
+                products.append({
+                    "id": str(row["id"]) if row["id"] else "",
+                    "url": str(row["url"]) if row["url"] else "",
+                    "name": str(row["name"]) if row["name"] else f"Товар {row['id']}",
+                    "price": price,
+                    "last_fetch": last_fetch
+                })
+            return products, total
+        except Exception as err:
+            _LOGGER.error("Error getting products with last fetch: %s", err, exc_info=True)
+            return [], 0
+
+    def search_products(self, query: str, limit: int = 50, offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+        """Search products by name or ID with prefix matching, best matches first.
+
+        Returns a tuple of (products, total_count).
+        """
+        tokens = SEARCH_TOKEN_PATTERN.findall(query or "")
+        if not tokens:
+            return [], 0
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            if self.fts_enabled:
+                match = " ".join(f'"{token}"*' for token in tokens)
+                cursor.execute("""
+                    SELECT p.id, p.url, p.name, p.price, bm25(products_fts) AS rank
+                    FROM products_fts
+                    JOIN products p ON p.rowid = products_fts.rowid
+                    WHERE products_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ? OFFSET ?
+                """, (match, limit, offset))
+                rows = cursor.fetchall()
+                cursor.execute("SELECT COUNT(*) AS count FROM products_fts WHERE products_fts MATCH ?", (match,))
+            else:
+                conditions = " AND ".join("(name LIKE ? OR id LIKE ?)" for _ in tokens)
+                params = [value for token in tokens for value in (f"%{token}%", f"{token}%")]
+                cursor.execute(f"""
+                    SELECT id, url, name, price, 0 AS rank FROM products
+                    WHERE {conditions}
+                    ORDER BY name
+                    LIMIT ? OFFSET ?
+                """, params + [limit, offset])
+                rows = cursor.fetchall()
+                cursor.execute(f"SELECT COUNT(*) AS count FROM products WHERE {conditions}", params)
+            total = cursor.fetchone()["count"]
+            conn.close()
+
+            return [{
+                "id": str(row["id"]),
+                "url": str(row["url"]) if row["url"] else "",
+                "name": str(row["name"]) if row["name"] else f"Товар {row['id']}",
+                "price": float(row["price"]) if row["price"] is not None else 0.0,
+                "rank": row["rank"]
+            } for row in rows], total
+        except Exception as err:
+            _LOGGER.error("Error searching products: %s", err)
+            return [], 0
+
     def add_product(self, product_id: str, url: str, name: str | None = None, price: float = 0) -> bool:
         """Add product to database."""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
 
             now = datetime.now().isoformat()
+            # Upsert keeps the row (and its rowid) so the search index triggers stay consistent
             cursor.execute("""
-                INSERT OR REPLACE INTO products (id, url, name, price, created_at, updated_at)
-                VALUES (?, ?, ?, ?, 
-                    COALESCE((SELECT created_at FROM products WHERE id = ?), ?),
-                    ?)
-            """, (product_id, url, name, price, product_id, now, now))
+                INSERT INTO products (id, url, name, price, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    url = excluded.url,
+                    name = excluded.name,
+                    price = excluded.price,
+                    updated_at = excluded.updated_at
+            """, (product_id, url, name, price, now, now))
 
             conn.commit()
             conn.close()
@@ -159,11 +501,118 @@ class Database:
             return True
         except sqlite3.IntegrityError as err:
             _LOGGER.error("Product already exists or constraint violation: %s", err)
+            conn.rollback()
+            conn.close()
             return False
         except Exception as err:
             _LOGGER.error("Error adding product: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
+    def upsert_products(self, items: list[dict[str, Any]]) -> int:
+        """Insert or update products in a single transaction.
+
+        Items are dicts with id, url, name and price. Price history is recorded
+        in the same transaction for items whose price changed. Items with an
+        invalid price or with the URL of another product are skipped; for
+        duplicate IDs the last item wins.
+        Returns number of upserted products.
+        """
+        by_id: dict[str, dict[str, Any]] = {}
+        for item in items:
+            if not item.get("id") or not item.get("url"):
+                continue
+            try:
+                price = float(item.get("price") or 0)
+            except (TypeError, ValueError):
+                price = math.nan
+            if not math.isfinite(price):
+                _LOGGER.warning("Skipping product %s with invalid price: %r", item["id"], item.get("price"))
+                continue
+            by_id[str(item["id"])] = {**item, "price": price}
+        if not by_id:
+            return 0
+
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+
+            # Current prices and URL owners of the batch, fetched in chunks to stay within SQLite variable limit
+            old_prices: dict[str, float] = {}
+            url_owners: dict[str, str] = {}
+            ids = list(by_id)
+            urls = [item["url"] for item in by_id.values()]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                cursor.execute(
+                    f"SELECT id, price FROM products WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                old_prices.update((row["id"], row["price"]) for row in cursor.fetchall())
+                chunk = urls[start:start + 500]
+                cursor.execute(
+                    f"SELECT id, url FROM products WHERE url IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                url_owners.update((row["url"], row["id"]) for row in cursor.fetchall())
+
+            # URLs are unique: an item taking the URL of another product would fail the whole batch
+            products = []
+            for product_id, item in by_id.items():
+                owner = url_owners.setdefault(item["url"], product_id)
+                if owner != product_id:
+                    _LOGGER.warning("Skipping product %s: URL %s belongs to product %s", product_id, item["url"], owner)
+                    continue
+                products.append((product_id, item))
+
+            now = datetime.now().isoformat()
+            cursor.executemany("""
+                INSERT INTO products (id, url, name, price, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    url = excluded.url,
+                    name = COALESCE(excluded.name, name),
+                    price = excluded.price,
+                    updated_at = excluded.updated_at
+            """, [
+                (product_id, item["url"], item.get("name") or None, item["price"], now, now)
+                for product_id, item in products
+            ])
+
+            # Record price points for changed prices
+            ts = int(time.time())
+            events = []
+            for product_id, item in products:
+                price = item["price"]
+                if product_id in old_prices and old_prices[product_id] == price:
+                    continue
+                if product_id not in old_prices and price <= 0:
+                    continue
+                price_minor = price_to_minor(price) if price > 0 else None
+                if price_minor is not None:
+                    self._insert_price_point(cursor, product_id, ts, price_minor)
+                previous = self._update_price_stats(cursor, product_id, ts, price_minor)
+                events.append({
+                    "product_id": product_id,
+                    "name": item.get("name") or f"Товар {product_id}",
+                    "ts": ts,
+                    "price_minor": price_minor,
+                    "previous": previous
+                })
+
+            conn.commit()
+            conn.close()
+            _LOGGER.info("Upserted %d products, %d price changes", len(products), len(events))
+
+            self._notify_price_listeners(events)
+            return len(products)
+        except Exception as err:
+            _LOGGER.error("Error upserting products: %s", err)
+            conn.rollback()
+            conn.close()
+            return 0
+
     def product_exists(self, url: str) -> bool:
         """Check if product with URL already exists."""
         try:
@@ -179,8 +628,8 @@ class Database:
 
     def update_product(self, product_id: str, name: str | None = None, price: float | None = None) -> bool:
         """Update product information."""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
 
             updates = []
@@ -227,18 +676,26 @@ class Database:
             return True
         except Exception as err:
             _LOGGER.error("Error updating product: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
     def delete_product(self, product_id: str) -> bool:
         """Delete product, its page and history."""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
 
             # Delete history first
             cursor.execute("DELETE FROM fetch_history WHERE product_id = ?", (product_id,))
+            cursor.execute("DELETE FROM fetch_history_daily WHERE product_id = ?", (product_id,))
             # Delete price history
             cursor.execute("DELETE FROM price_history WHERE product_id = ?", (product_id,))
+            cursor.execute("DELETE FROM price_points WHERE product_id = ?", (product_id,))
+            cursor.execute("DELETE FROM price_rollups WHERE product_id = ?", (product_id,))
+            cursor.execute("DELETE FROM price_stats WHERE product_id = ?", (product_id,))
+            # Delete schedule
+            cursor.execute("DELETE FROM product_schedule WHERE product_id = ?", (product_id,))
             # Delete page
             cursor.execute("DELETE FROM pages WHERE product_id = ?", (product_id,))
             # Delete product
@@ -249,19 +706,381 @@ class Database:
             return True
         except Exception as err:
             _LOGGER.error("Error deleting product: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
-    def save_page(self, product_id: str, html: str) -> bool:
-        """Save HTML page for product."""
+    def _init_search_index(self, conn: sqlite3.Connection) -> None:
+        """Create FTS5 index over products kept in sync by triggers."""
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")
+            created = cursor.fetchone() is None
+
+            # External content table: the index stores only tokens, text stays in products
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                    name, id,
+                    content = 'products',
+                    content_rowid = 'rowid',
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+                    INSERT INTO products_fts (rowid, name, id) VALUES (new.rowid, new.name, new.id);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+                    INSERT INTO products_fts (products_fts, rowid, name, id) VALUES ('delete', old.rowid, old.name, old.id);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF name, id ON products BEGIN
+                    INSERT INTO products_fts (products_fts, rowid, name, id) VALUES ('delete', old.rowid, old.name, old.id);
+                    INSERT INTO products_fts (rowid, name, id) VALUES (new.rowid, new.name, new.id);
+                END
+            """)
+            if created:
+                cursor.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+                _LOGGER.info("Product search index built")
+
+            conn.commit()
+            self.fts_enabled = True
+        except sqlite3.OperationalError as err:
+            _LOGGER.warning("FTS5 is not available, product search falls back to LIKE: %s", err)
+
+    def _migrate_price_history(self, conn: sqlite3.Connection) -> None:
+        """Move legacy price_history rows into the price time-series tables."""
+        cursor = conn.cursor()
+        cursor.execute("SELECT product_id, price, timestamp FROM price_history ORDER BY timestamp")
+        rows = cursor.fetchall()
+        if not rows:
+            return
+
+        for row in rows:
+            try:
+                ts = int(datetime.fromisoformat(row["timestamp"]).timestamp())
+            except (ValueError, TypeError):
+                continue
+            price_minor = price_to_minor(row["price"]) if row["price"] and row["price"] > 0 else None
+            if price_minor is not None:
+                self._insert_price_point(cursor, row["product_id"], ts, price_minor)
+            self._update_price_stats(cursor, row["product_id"], ts, price_minor)
+
+        cursor.execute("DELETE FROM price_history")
+        conn.commit()
+        _LOGGER.info("Migrated %d price history rows to price time-series", len(rows))
+
+    def _migrate_pages(self, conn: sqlite3.Connection) -> None:
+        """Move HTML of a legacy pages table into the page store."""
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(pages)")
+        if "html" not in [row["name"] for row in cursor.fetchall()]:
+            return
+
+        cursor.execute("""
+            CREATE TABLE pages_new (
+                product_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                FOREIGN KEY (product_id) REFERENCES products(id)
+            )
+        """)
+        cursor.execute("SELECT product_id, html, timestamp FROM pages")
+        count = 0
+        for row in cursor.fetchall():
+            content_hash, size = self.page_store.put(row["html"] or "")
+            conn.execute("INSERT INTO pages_new (product_id, content_hash, size, timestamp) VALUES (?, ?, ?, ?)",
+                         (row["product_id"], content_hash, size, row["timestamp"]))
+            count += 1
+
+        cursor.execute("DROP TABLE pages")
+        cursor.execute("ALTER TABLE pages_new RENAME TO pages")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_timestamp ON pages(timestamp)")
+        conn.commit()
+        _LOGGER.info("Moved %d pages to page store", count)
+
+    def _insert_price_point(self, cursor: sqlite3.Cursor, product_id: str, ts: int, price_minor: int) -> None:
+        """Insert raw price point and fold it into hourly/daily rollups.
+
+        A point re-recorded at the same ts replaces the old one, and its
+        buckets and the product's price stats are rebuilt so it is not
+        counted twice.
+        """
+        cursor.execute("""
+            INSERT OR IGNORE INTO price_points (product_id, ts, price_minor)
+            VALUES (?, ?, ?)
+        """, (product_id, ts, price_minor))
+        if cursor.rowcount == 0:
+            cursor.execute("UPDATE price_points SET price_minor = ? WHERE product_id = ? AND ts = ?",
+                           (price_minor, product_id, ts))
+            self._rebuild_price_rollups(cursor, product_id, ts)
+            self._rebuild_price_stats(cursor, product_id)
+            return
+
+        for step in PRICE_ROLLUP_STEPS:
+            cursor.execute("""
+                INSERT INTO price_rollups (product_id, step, bucket, min_minor, max_minor, last_minor, last_ts, samples)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (product_id, step, bucket) DO UPDATE SET
+                    min_minor = MIN(min_minor, excluded.min_minor),
+                    max_minor = MAX(max_minor, excluded.max_minor),
+                    last_minor = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last_minor ELSE last_minor END,
+                    last_ts = MAX(last_ts, excluded.last_ts),
+                    samples = samples + 1
+            """, (product_id, step, ts - ts % step, price_minor, price_minor, price_minor, ts))
+
+    def _rebuild_price_rollups(self, cursor: sqlite3.Cursor, product_id: str, ts: int) -> None:
+        """Recompute hourly/daily buckets containing ts from raw price points."""
+        for step in PRICE_ROLLUP_STEPS:
+            bucket = ts - ts % step
+            cursor.execute("""
+                INSERT OR REPLACE INTO price_rollups (product_id, step, bucket, min_minor, max_minor,
+                                                      last_minor, last_ts, samples)
+                SELECT product_id, ?, ?, MIN(price_minor), MAX(price_minor),
+                       (SELECT price_minor FROM price_points
+                        WHERE product_id = p.product_id AND ts >= ? AND ts < ?
+                        ORDER BY ts DESC LIMIT 1),
+                       MAX(ts), COUNT(*)
+                FROM price_points AS p
+                WHERE product_id = ? AND ts >= ? AND ts < ?
+                GROUP BY product_id
+            """, (step, bucket, bucket, bucket + step, product_id, bucket, bucket + step))
+
+    @staticmethod
+    def _rebuild_price_stats(cursor: sqlite3.Cursor, product_id: str) -> None:
+        """Recompute minimum and last price of product from daily rollups (kept forever)."""
+        cursor.execute("""
+            SELECT min_minor, bucket FROM price_rollups
+            WHERE product_id = ? AND step = ?
+            ORDER BY min_minor, bucket LIMIT 1
+        """, (product_id, PRICE_STEP_DAY))
+        low = cursor.fetchone()
+        if low is None:
+            return
+        cursor.execute("""
+            SELECT last_minor, last_ts FROM price_rollups
+            WHERE product_id = ? AND step = ?
+            ORDER BY bucket DESC LIMIT 1
+        """, (product_id, PRICE_STEP_DAY))
+        last = cursor.fetchone()
+        # Exact time of the minimum while its raw points are kept, otherwise its day
+        cursor.execute("""
+            SELECT MIN(ts) FROM price_points
+            WHERE product_id = ? AND ts >= ? AND ts < ? AND price_minor = ?
+        """, (product_id, low["bucket"], low["bucket"] + PRICE_STEP_DAY, low["min_minor"]))
+        min_ts = cursor.fetchone()[0] or low["bucket"]
+        cursor.execute("""
+            UPDATE price_stats SET min_minor = ?, min_ts = ?, last_minor = ?, last_ts = ?
+            WHERE product_id = ?
+        """, (low["min_minor"], min_ts, last["last_minor"], last["last_ts"], product_id))
+
+    def _update_price_stats(self, cursor: sqlite3.Cursor, product_id: str, ts: int,
+                            price_minor: int | None) -> dict[str, Any]:
+        """Update running price stats for product. Returns previous stats.
+
+        A point older than the last one (out of order) can lower the minimum
+        but does not change the last price or availability.
+        """
+        cursor.execute("SELECT * FROM price_stats WHERE product_id = ?", (product_id,))
+        row = cursor.fetchone()
+        previous = {
+            "min_minor": row["min_minor"] if row else None,
+            "last_minor": row["last_minor"] if row else None,
+            "in_stock": bool(row["in_stock"]) if row else None
+        }
+
+        if price_minor is None:
+            # Product is not available, keep minimum and last known price
+            cursor.execute("""
+                INSERT INTO price_stats (product_id, in_stock) VALUES (?, 0)
+                ON CONFLICT (product_id) DO UPDATE SET in_stock = 0
+            """, (product_id,))
+        else:
+            cursor.execute("""
+                INSERT INTO price_stats (product_id, min_minor, min_ts, last_minor, last_ts, in_stock)
+                VALUES (?, ?, ?, ?, ?, 1)
+                ON CONFLICT (product_id) DO UPDATE SET
+                    min_ts = CASE WHEN min_minor IS NULL OR excluded.min_minor < min_minor
+                             THEN excluded.min_ts ELSE min_ts END,
+                    min_minor = CASE WHEN min_minor IS NULL OR excluded.min_minor < min_minor
+                                THEN excluded.min_minor ELSE min_minor END,
+                    last_minor = CASE WHEN last_ts IS NULL OR excluded.last_ts >= last_ts
+                                 THEN excluded.last_minor ELSE last_minor END,
+                    last_ts = CASE WHEN last_ts IS NULL OR excluded.last_ts >= last_ts
+                              THEN excluded.last_ts ELSE last_ts END,
+                    in_stock = CASE WHEN last_ts IS NULL OR excluded.last_ts >= last_ts
+                               THEN 1 ELSE in_stock END
+            """, (product_id, price_minor, ts, price_minor, ts))
+        return previous
+
+    def _notify_price_listeners(self, events: list[dict[str, Any]]) -> None:
+        """Pass committed price change events to registered listeners (after the batch commits inside batch())."""
+        pending = getattr(self._local, "batch_events", None)
+        if pending is not None:
+            pending.extend(events)
+            return
+        for event in events:
+            for listener in _price_listeners:
+                try:
+                    listener(event)
+                except Exception as listener_err:
+                    _LOGGER.error("Error in price listener: %s", listener_err)
+
+    def add_price_history(self, product_id: str, price: float, ts: int | None = None) -> bool:
+        """Add price point to price time-series.
+
+        A price of 0 or less marks the product as not available.
+        Registered price listeners are notified after commit.
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+
+            if ts is None:
+                ts = int(time.time())
+            price_minor = price_to_minor(price) if price and price > 0 else None
+            if price_minor is not None:
+                self._insert_price_point(cursor, product_id, ts, price_minor)
+            previous = self._update_price_stats(cursor, product_id, ts, price_minor)
+
+            cursor.execute("SELECT name FROM products WHERE id = ?", (product_id,))
+            product_row = cursor.fetchone()
+
+            conn.commit()
+            conn.close()
+            _LOGGER.debug("Price point added for product: %s, price: %s", product_id, price)
+
+            self._notify_price_listeners([{
+                "product_id": product_id,
+                "name": product_row["name"] if product_row and product_row["name"] else f"Товар {product_id}",
+                "ts": ts,
+                "price_minor": price_minor,
+                "previous": previous
+            }])
+            return True
+        except Exception as err:
+            _LOGGER.error("Error adding price history: %s", err)
+            conn.rollback()
+            conn.close()
+            return False
+
+    def get_price_stats(self, product_id: str) -> dict[str, Any] | None:
+        """Get running price stats for product."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM price_stats WHERE product_id = ?", (product_id,))
+            row = cursor.fetchone()
+            conn.close()
+
+            if row:
+                return {
+                    "product_id": row["product_id"],
+                    "min_price": price_from_minor(row["min_minor"]),
+                    "min_ts": row["min_ts"],
+                    "last_price": price_from_minor(row["last_minor"]),
+                    "last_ts": row["last_ts"],
+                    "in_stock": bool(row["in_stock"])
+                }
+            return None
+        except Exception as err:
+            _LOGGER.error("Error getting price stats: %s", err)
+            return None
+
+    def get_price_series(self, product_id: str, from_ts: int, to_ts: int,
+                         step: int | None = None) -> dict[str, Any]:
+        """Get price series for product in [from_ts, to_ts].
+
+        step is 0 for raw points, PRICE_STEP_HOUR or PRICE_STEP_DAY for buckets.
+        When step is None it is chosen from the requested range.
+        """
         try:
+            if step is None:
+                span = to_ts - from_ts
+                if span <= 2 * 86400 and from_ts >= int(time.time()) - PRICE_RAW_RETENTION:
+                    step = 0
+                elif span <= 90 * 86400:
+                    step = PRICE_STEP_HOUR
+                else:
+                    step = PRICE_STEP_DAY
+
             conn = self._get_connection()
             cursor = conn.cursor()
 
+            if step == 0:
+                cursor.execute("""
+                    SELECT ts, price_minor FROM price_points
+                    WHERE product_id = ? AND ts BETWEEN ? AND ?
+                    ORDER BY ts
+                """, (product_id, from_ts, to_ts))
+                points = [{
+                    "t": row["ts"],
+                    "min": price_from_minor(row["price_minor"]),
+                    "max": price_from_minor(row["price_minor"]),
+                    "last": price_from_minor(row["price_minor"])
+                } for row in cursor.fetchall()]
+            else:
+                cursor.execute("""
+                    SELECT bucket, min_minor, max_minor, last_minor FROM price_rollups
+                    WHERE product_id = ? AND step = ? AND bucket BETWEEN ? AND ?
+                    ORDER BY bucket
+                """, (product_id, step, from_ts - from_ts % step, to_ts))
+                points = [{
+                    "t": row["bucket"],
+                    "min": price_from_minor(row["min_minor"]),
+                    "max": price_from_minor(row["max_minor"]),
+                    "last": price_from_minor(row["last_minor"])
+                } for row in cursor.fetchall()]
+
+            conn.close()
+            return {"step": step, "points": points}
+        except Exception as err:
+            _LOGGER.error("Error getting price series: %s", err)
+            return {"step": step, "points": []}
+
+    def prune_price_history(self) -> int:
+        """Apply retention to raw price points and hourly rollups. Returns deleted rows count."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+
+            now = int(time.time())
+            cursor.execute("DELETE FROM price_points WHERE ts < ?", (now - PRICE_RAW_RETENTION,))
+            deleted = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM price_rollups WHERE step = ? AND bucket < ?",
+                (PRICE_STEP_HOUR, now - PRICE_HOURLY_RETENTION)
+            )
+            deleted += cursor.rowcount
+
+            conn.commit()
+            conn.close()
+            _LOGGER.info("Price history retention removed %d rows", deleted)
+            return deleted
+        except Exception as err:
+            _LOGGER.error("Error pruning price history: %s", err)
+            conn.rollback()
+            conn.close()
+            return 0
+
+    def save_page(self, product_id: str, html: str) -> bool:
+        """Save HTML page for product (content goes to the page store, metadata to the database)."""
+        conn = self._get_connection()
+        try:
+            content_hash, size = self.page_store.put(html)
+
+            cursor = conn.cursor()
+
             timestamp = datetime.now().isoformat()
             cursor.execute("""
-                INSERT OR REPLACE INTO pages (product_id, html, timestamp)
-                VALUES (?, ?, ?)
-            """, (product_id, html, timestamp))
+                INSERT OR REPLACE INTO pages (product_id, content_hash, size, timestamp)
+                VALUES (?, ?, ?, ?)
+            """, (product_id, content_hash, size, timestamp))
 
             conn.commit()
             conn.close()
@@ -269,6 +1088,8 @@ class Database:
             return True
         except Exception as err:
             _LOGGER.error("Error saving page: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
     def get_page(self, product_id: str) -> dict[str, Any] | None:
@@ -283,7 +1104,9 @@ class Database:
             if row:
                 return {
                     "product_id": row["product_id"],
-                    "html": row["html"],
+                    "html": self.page_store.get(row["content_hash"]),
+                    "content_hash": row["content_hash"],
+                    "size": row["size"],
                     "timestamp": row["timestamp"]
                 }
             return None
@@ -303,7 +1126,9 @@ class Database:
             pages = {}
             for row in rows:
                 pages[row["product_id"]] = {
-                    "html": row["html"],
+                    "html": self.page_store.get(row["content_hash"]),
+                    "content_hash": row["content_hash"],
+                    "size": row["size"],
                     "timestamp": row["timestamp"]
                 }
             return pages
@@ -311,13 +1136,32 @@ class Database:
             _LOGGER.error("Error getting pages: %s", err)
             return {}
 
+    def collect_page_garbage(self) -> int:
+        """Remove page blobs no longer referenced by any product. Returns number of removed blobs."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT content_hash FROM pages")
+            referenced = {row["content_hash"] for row in cursor.fetchall()}
+            conn.close()
+
+            removed = self.page_store.collect_garbage(referenced)
+            if removed:
+                _LOGGER.info("Removed %d unreferenced page blobs", removed)
+            return removed
+        except Exception as err:
+            _LOGGER.error("Error collecting page garbage: %s", err)
+            return 0
+
     def add_fetch_history(self, product_id: str, status: str, error_message: str | None = None, html_length: int | None = None) -> bool:
         """Add fetch history record."""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
 
             timestamp = datetime.now().isoformat()
+            if error_message and len(error_message) > FETCH_ERROR_MAX_LENGTH:
+                error_message = error_message[:FETCH_ERROR_MAX_LENGTH]
             cursor.execute("""
                 INSERT INTO fetch_history (product_id, timestamp, status, error_message, html_length)
                 VALUES (?, ?, ?, ?, ?)
@@ -329,6 +1173,8 @@ class Database:
             return True
         except Exception as err:
             _LOGGER.error("Error adding fetch history: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
     def get_last_fetch(self, product_id: str) -> dict[str, Any] | None:
@@ -424,10 +1270,92 @@ class Database:
             _LOGGER.error("Error getting last fetch any: %s", err)
             return None
 
+    def compact_fetch_history(self, keep: int = FETCH_HISTORY_KEEP) -> int:
+        """Roll fetch history rows beyond the last `keep` per product into daily counters.
+
+        Returns number of compacted rows.
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("DROP TABLE IF EXISTS temp.fetch_history_expired")
+            cursor.execute("""
+                CREATE TEMP TABLE fetch_history_expired AS
+                SELECT id, product_id, substr(timestamp, 1, 10) AS day, status
+                FROM (
+                    SELECT id, product_id, timestamp, status,
+                           ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY timestamp DESC) AS rn
+                    FROM fetch_history
+                )
+                WHERE rn > ?
+            """, (keep,))
+
+            cursor.execute("""
+                INSERT INTO fetch_history_daily (product_id, day, success_count, error_count)
+                SELECT product_id, day,
+                       SUM(status = 'success'),
+                       SUM(status != 'success')
+                FROM fetch_history_expired
+                GROUP BY product_id, day
+                ON CONFLICT (product_id, day) DO UPDATE SET
+                    success_count = success_count + excluded.success_count,
+                    error_count = error_count + excluded.error_count
+            """)
+            cursor.execute("DELETE FROM fetch_history WHERE id IN (SELECT id FROM fetch_history_expired)")
+            compacted = cursor.rowcount
+            cursor.execute("DROP TABLE fetch_history_expired")
+
+            conn.commit()
+            conn.close()
+            _LOGGER.info("Fetch history compacted: %d rows rolled up", compacted)
+            return compacted
+        except Exception as err:
+            _LOGGER.error("Error compacting fetch history: %s", err)
+            conn.rollback()
+            conn.close()
+            return 0
+
+    def get_fetch_history_daily(self, product_id: str, limit: int = 90) -> list[dict[str, Any]]:
+        """Get daily fetch counters of compacted history for product."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM fetch_history_daily
+                WHERE product_id = ?
+                ORDER BY day DESC
+                LIMIT ?
+            """, (product_id, limit))
+            rows = cursor.fetchall()
+            conn.close()
+
+            return [{
+                "day": row["day"],
+                "success_count": row["success_count"],
+                "error_count": row["error_count"]
+            } for row in rows]
+        except Exception as err:
+            _LOGGER.error("Error getting daily fetch history: %s", err)
+            return []
+
+    def optimize(self) -> bool:
+        """Return free pages to the OS and refresh query planner statistics."""
+        try:
+            conn = self._get_connection()
+            conn.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+            conn.execute("PRAGMA optimize")
+            conn.close()
+            _LOGGER.info("Database optimized, size: %d bytes", self.db_path.stat().st_size)
+            return True
+        except Exception as err:
+            _LOGGER.error("Error optimizing database: %s", err)
+            return False
+
     def set_cron_last_execution(self, job_name: str, duration: float | None = None, status: str | None = None, notes: str | None = None) -> bool:
         """Set last execution time for a cron job."""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
 
             timestamp = datetime.now().isoformat()
@@ -442,6 +1370,8 @@ class Database:
             return True
         except Exception as err:
             _LOGGER.error("Error saving cron execution: %s", err)
+            conn.rollback()
+            conn.close()
             return False
 
     def get_cron_last_execution(self, job_name: str) -> dict[str, Any] | None:
@@ -489,3 +1419,105 @@ class Database:
             _LOGGER.error("Error getting cron history: %s", err)
             return []
 
+    def add_cron_run(self, job_name: str, started_at: str, duration: float | None = None,
+                     status: str | None = None, notes: str | None = None) -> bool:
+        """Add cron job run to history and update its last execution."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO cron_runs (job_name, started_at, duration, status, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """, (job_name, started_at, duration, status, notes))
+            cursor.execute("""
+                INSERT OR REPLACE INTO cron_history (job_name, last_execution, duration, status, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """, (job_name, started_at, duration, status, notes))
+
+            conn.commit()
+            conn.close()
+            _LOGGER.debug("Cron run saved: %s at %s, duration: %s, status: %s", job_name, started_at, duration, status)
+            return True
+        except Exception as err:
+            _LOGGER.error("Error saving cron run: %s", err)
+            conn.rollback()
+            conn.close()
+            return False
+
+    def get_cron_runs(self, job_name: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        """Get cron job run history. If job_name is None, returns runs of all jobs."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            if job_name:
+                cursor.execute("""
+                    SELECT * FROM cron_runs
+                    WHERE job_name = ?
+                    ORDER BY started_at DESC
+                    LIMIT ?
+                """, (job_name, limit))
+            else:
+                cursor.execute("""
+                    SELECT * FROM cron_runs
+                    ORDER BY started_at DESC
+                    LIMIT ?
+                """, (limit,))
+
+            rows = cursor.fetchall()
+            conn.close()
+
+            return [{
+                "job_name": row["job_name"],
+                "started_at": row["started_at"],
+                "duration": row["duration"],
+                "status": row["status"],
+                "notes": row["notes"]
+            } for row in rows]
+        except Exception as err:
+            _LOGGER.error("Error getting cron runs: %s", err)
+            return []
+
+    def get_due_products(self, now_ts: int, limit: int) -> list[dict[str, Any]]:
+        """Get products whose page refresh is due, most overdue first."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.id, p.url, s.interval
+                FROM products p
+                LEFT JOIN product_schedule s ON s.product_id = p.id
+                WHERE s.next_fetch_ts IS NULL OR s.next_fetch_ts <= ?
+                ORDER BY COALESCE(s.next_fetch_ts, 0)
+                LIMIT ?
+            """, (now_ts, limit))
+            rows = cursor.fetchall()
+            conn.close()
+
+            return [{
+                "id": row["id"],
+                "url": row["url"],
+                "interval": row["interval"]
+            } for row in rows]
+        except Exception as err:
+            _LOGGER.error("Error getting due products: %s", err)
+            return []
+
+    def set_product_next_fetch(self, product_id: str, next_fetch_ts: int, interval: int) -> bool:
+        """Set next page refresh time for product."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO product_schedule (product_id, next_fetch_ts, interval)
+                VALUES (?, ?, ?)
+            """, (product_id, next_fetch_ts, interval))
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as err:
+            _LOGGER.error("Error setting product next fetch: %s", err)
+            conn.rollback()
+            conn.close()
+            return False
@@ -0,0 +1,259 @@
+"""Shared HTTP fetcher for Ozon pages."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+COOKIES_FILE = "/data/ozon_cookies.pickle"
+COOKIES_SAVE_INTERVAL = 60  # Persist cookie jar at most once a minute
+
+REQUEST_TIMEOUT = 30  # seconds
+CONNECTION_LIMIT = 10  # Total pooled connections
+CONNECTION_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds
+
+# Adaptive rate control (per host)
+THROTTLE_STATUSES = {403, 429, 503}  # Answers treated as "slow down"
+RATE_INITIAL_LIMIT = 2  # Concurrent requests per host at start
+RATE_MIN_INTERVAL = 0.5  # Min seconds between request starts when healthy
+RATE_MAX_INTERVAL = 60.0  # Max seconds between request starts when throttled
+RATE_MAX_COOLDOWN = 600.0  # Max pause after throttling without Retry-After
+ERROR_RATE_ALPHA = 0.2  # Smoothing of the error rate average
+
+
+def get_browser_headers(url: str = "") -> dict[str, str]:
+    """Get browser-like headers for HTTP requests."""
+    # Determine referer based on URL
+    referer = "https://www.ozon.ru/"
+    if url:
+        if "ozon.by" in url:
+            referer = "https://www.ozon.by/"
+        elif "ozon.ru" in url:
+            referer = "https://www.ozon.ru/"
+
+    return {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0",
+        "DNT": "1",
+        "Referer": referer
+    }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRateState:
+    """Rate control state of a single host."""
+
+    def __init__(self) -> None:
+        """Initialize host state."""
+        self.limit = RATE_INITIAL_LIMIT
+        self.in_flight = 0
+        self.interval = RATE_MIN_INTERVAL
+        self.next_start = 0.0
+        self.blocked_until = 0.0
+        self.successes = 0
+        self.throttled = 0
+        self.error_rate = 0.0
+        self.condition = asyncio.Condition()
+
+
+class RateController:
+    """AIMD concurrency and pacing control per host.
+
+    Concurrency grows by one after `limit` successful requests in a row and
+    is halved when the host throttles (403/429/503), together with doubling
+    the interval between requests. Retry-After is honoured when present.
+    """
+
+    def __init__(self, max_limit: int = CONNECTION_LIMIT_PER_HOST) -> None:
+        """Initialize rate controller."""
+        self.max_limit = max_limit
+        self._hosts: dict[str, HostRateState] = {}
+
+    def _state(self, host: str) -> HostRateState:
+        """Get or create host state."""
+        if host not in self._hosts:
+            self._hosts[host] = HostRateState()
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Wait for a request slot on host (concurrency limit, pacing and cooldown)."""
+        state = self._state(host)
+        async with state.condition:
+            while state.in_flight >= state.limit:
+                await state.condition.wait()
+            state.in_flight += 1
+            now = time.time()
+            start_at = max(now, state.next_start, state.blocked_until)
+            state.next_start = start_at + state.interval
+        try:
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            yield
+        finally:
+            async with state.condition:
+                state.in_flight -= 1
+                state.condition.notify_all()
+
+    def record(self, host: str, status: int | None, retry_after: str | None = None) -> None:
+        """Record request outcome (status None means a network error or timeout)."""
+        state = self._state(host)
+        failed = status is None or status in THROTTLE_STATUSES or status >= 500
+        state.error_rate += ERROR_RATE_ALPHA * ((1.0 if failed else 0.0) - state.error_rate)
+
+        if status in THROTTLE_STATUSES:
+            state.throttled += 1
+            state.successes = 0
+            state.limit = max(1, state.limit // 2)
+            state.interval = min(RATE_MAX_INTERVAL, state.interval * 2)
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = min(RATE_MAX_COOLDOWN, state.interval * 2 ** min(state.throttled, 6))
+            state.blocked_until = max(state.blocked_until, time.time() + wait)
+            _LOGGER.warning("Host %s throttled (HTTP %s): concurrency=%d, interval=%.1fs, pause=%.0fs",
+                            host, status, state.limit, state.interval, wait)
+        elif failed:
+            state.successes = 0
+            state.interval = min(RATE_MAX_INTERVAL, state.interval * 1.5)
+        else:
+            state.throttled = 0
+            state.successes += 1
+            state.interval = max(RATE_MIN_INTERVAL, state.interval * 0.9)
+            if state.successes >= state.limit and state.limit < self.max_limit:
+                state.limit += 1
+                state.successes = 0
+                _LOGGER.debug("Host %s: concurrency raised to %d", host, state.limit)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Get current rate control state per host."""
+        now = time.time()
+        return {host: {
+            "limit": state.limit,
+            "in_flight": state.in_flight,
+            "interval": round(state.interval, 2),
+            "error_rate": round(state.error_rate, 3),
+            "paused_for": round(max(0.0, state.blocked_until - now), 1)
+        } for host, state in self._hosts.items()}
+
+
+class OzonFetcher:
+    """Long-lived HTTP client with pooled keep-alive connections and persistent cookies.
+
+    Brotli responses are decoded by aiohttp when the Brotli package is installed.
+    """
+
+    def __init__(self, cookies_file: str = COOKIES_FILE) -> None:
+        """Initialize fetcher."""
+        self._cookies_file = Path(cookies_file)
+        self._session: aiohttp.ClientSession | None = None
+        self._cookies_saved_at = 0.0
+        self.rate_controller = RateController()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get or create shared aiohttp session."""
+        if self._session is None or self._session.closed:
+            cookie_jar = aiohttp.CookieJar()
+            if self._cookies_file.exists():
+                try:
+                    cookie_jar.load(self._cookies_file)
+                    _LOGGER.info("Loaded cookies from %s", self._cookies_file)
+                except Exception as err:
+                    _LOGGER.warning("Could not load cookies from %s: %s", self._cookies_file, err)
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=cookie_jar,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+        return self._session
+
+    def save_cookies(self, force: bool = False) -> None:
+        """Persist cookie jar (throttled unless force is set)."""
+        if self._session is None or self._session.closed:
+            return
+        if not force and time.time() - self._cookies_saved_at < COOKIES_SAVE_INTERVAL:
+            return
+        try:
+            self._cookies_file.parent.mkdir(parents=True, exist_ok=True)
+            self._session.cookie_jar.save(self._cookies_file)
+            self._cookies_saved_at = time.time()
+        except Exception as err:
+            _LOGGER.warning("Could not save cookies to %s: %s", self._cookies_file, err)
+
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET url with browser headers over the shared session, paced by the rate controller."""
+        session = await self.get_session()
+        headers = get_browser_headers(url)
+        headers.update(kwargs.pop("headers", {}))
+        host = urlparse(url).hostname or ""
+        async with self.rate_controller.slot(host):
+            _LOGGER.debug("Sending GET request to URL=%s with headers=%s", url, headers)
+            recorded = False
+            try:
+                async with session.get(url, headers=headers, **kwargs) as response:
+                    self.rate_controller.record(host, response.status, response.headers.get("Retry-After"))
+                    recorded = True
+                    yield response
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                # Errors while the caller reads the body belong to an already recorded request
+                if not recorded:
+                    self.rate_controller.record(host, None)
+                raise
+        self.save_cookies()
+
+    async def close(self) -> None:
+        """Save cookies and close session."""
+        self.save_cookies(force=True)
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+_fetcher: OzonFetcher | None = None
+
+
+def get_fetcher() -> OzonFetcher:
+    """Get shared fetcher instance."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = OzonFetcher()
+    return _fetcher
@@ -4,13 +4,19 @@ import asyncio
 import json
 import logging
 import os
+import random
 import sys
+import time
 from pathlib import Path
 
 from ozon_api import OzonAPI
 from storage import OzonStorage
-from web_server import run_web_server
-from database import Database
+from web_server import run_web_server, fetch_and_save_page, set_scheduler
+from async_database import AsyncDatabase, get_async_database
+from database import add_price_listener
+from fetcher import get_fetcher
+from price_alerts import PriceAlertEngine
+from scheduler import Scheduler, adaptive_interval
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,9 +28,16 @@ logging.basicConfig(
 )
 
 CONFIG_FILE = "/data/options.json"
-SCAN_INTERVAL = 3600  # 1 hour in seconds
 WEB_PORT = 8099
 
+# Job intervals in seconds
+FAVORITES_INTERVAL = 3600  # 1 hour
+CRAWL_INTERVAL = 300  # Check for due product pages every 5 minutes
+CLEANUP_INTERVAL = 86400  # 1 day
+
+CRAWL_BATCH_SIZE = 10  # Max pages per crawl run
+CRAWL_DELAY = (2.0, 8.0)  # Random pause between page requests, seconds
+
 
 def load_config() -> dict:
     """Load configuration from options.json."""
@@ -42,46 +55,53 @@ def load_config() -> dict:
         sys.exit(1)
 
 
-async def fetch_loop(api: OzonAPI, storage: OzonStorage, db: Database):
-    """Main fetch loop."""
-    while True:
-        start_time = None
-        try:
-            _LOGGER.info("Fetching favorites from Ozon...")
-            
-            # Start measuring execution time
-            import time
-            start_time = time.time()
-            
-            favorites = await api.get_favorites()
-            
-            # Save to storage
-            storage.save_favorites(favorites)
-            
-            _LOGGER.info("Fetched %d favorites from Ozon", len(favorites))
-            
-            # Log favorites
-            for item in favorites:
-                _LOGGER.info("Item: %s, Price: %s", item.get("name"), item.get("price"))
-            
-            # Calculate execution duration
-            duration = time.time() - start_time if start_time else None
-            
-            # Record successful cron execution with duration
-            db.set_cron_last_execution("fetch_favorites", duration, "success", f"Fetched {len(favorites)} items")
-            
-        except Exception as err:
-            _LOGGER.error("Error in main loop: %s", err)
-            
-            # Calculate execution duration even on error
-            import time
-            duration = time.time() - start_time if start_time else None
-            
-            # Record failed cron execution with duration
-            db.set_cron_last_execution("fetch_favorites", duration, "error", str(err))
+async def fetch_favorites(api: OzonAPI, storage: OzonStorage) -> str:
+    """Fetch favorites from Ozon and save them to storage."""
+    _LOGGER.info("Fetching favorites from Ozon...")
+    favorites = await api.get_favorites()
+    
+    # Save to storage
+    await storage.save_favorites(favorites)
+    
+    _LOGGER.info("Fetched %d favorites from Ozon", len(favorites))
+    
+    # Log favorites
+    for item in favorites:
+        _LOGGER.info("Item: %s, Price: %s", item.get("name"), item.get("price"))
+    
+    return f"Fetched {len(favorites)} items"
+
+
+async def crawl_pages(db: AsyncDatabase) -> str:
+    """Fetch pages of products whose refresh is due, spread over time."""
+    due = await db.get_due_products(int(time.time()), CRAWL_BATCH_SIZE)
+    if not due:
+        return "No products due"
+    
+    success_count = 0
+    for index, product in enumerate(due):
+        if index:
+            # Pause between requests so pages are not fetched in bursts
+            await asyncio.sleep(random.uniform(*CRAWL_DELAY))
+        result = await fetch_and_save_page(product["id"], product["url"])
+        success = result["status"] == "success"
+        if success:
+            success_count += 1
         
-        # Wait before next update
-        await asyncio.sleep(SCAN_INTERVAL)
+        interval = await adaptive_interval(db, product["id"], success)
+        next_fetch = int(time.time() + interval * random.uniform(0.9, 1.1))
+        await db.set_product_next_fetch(product["id"], next_fetch, interval)
+    
+    return f"Fetched {success_count}/{len(due)} pages"
+
+
+async def cleanup(db: AsyncDatabase) -> str:
+    """Apply retention to stored history and compact the database."""
+    deleted = await db.prune_price_history()
+    compacted = await db.compact_fetch_history()
+    blobs = await db.collect_page_garbage()
+    await db.optimize()
+    return f"Removed {deleted} price rows, compacted {compacted} fetch rows, removed {blobs} page blobs"
 
 
 async def main():
@@ -99,29 +119,44 @@ async def main():
     _LOGGER.info("Using Ozon site: %s", site)
     
     # Initialize API, storage and database
-    api = OzonAPI(site)
+    api = OzonAPI(site, get_fetcher())
     storage = OzonStorage()
-    db = Database()
+    db = get_async_database()
+    
+    # Start price alerts (rules are evaluated as each new price is stored)
+    alerts = PriceAlertEngine(config)
+    add_price_listener(alerts.on_price_change)
+    alerts.start()
     
     # Start web server
     _LOGGER.info("Starting web server on port %d", WEB_PORT)
     web_runner = await run_web_server(WEB_PORT)
     
-    # Start fetch loop as background task
-    fetch_task = asyncio.create_task(fetch_loop(api, storage, db))
+    # Register scheduled jobs
+    scheduler = Scheduler(db)
+    scheduler.add_job("fetch_favorites", lambda: fetch_favorites(api, storage), FAVORITES_INTERVAL)
+    scheduler.add_job("page_crawl", lambda: crawl_pages(db), CRAWL_INTERVAL, jitter=0.3)
+    scheduler.add_job("cleanup", lambda: cleanup(db), CLEANUP_INTERVAL)
+    set_scheduler(scheduler)
+    
+    # Start scheduler as background task
+    scheduler_task = asyncio.create_task(scheduler.run())
     
     try:
-        # Keep running - wait for fetch loop (which runs forever)
+        # Keep running - wait for scheduler (which runs forever)
         # Web server is already running in background
-        await fetch_task
+        await scheduler_task
     except KeyboardInterrupt:
         _LOGGER.info("Shutting down...")
-        fetch_task.cancel()
+        scheduler_task.cancel()
         try:
-            await fetch_task
+            await scheduler_task
         except asyncio.CancelledError:
             pass
     finally:
+        await alerts.close()
+        await get_fetcher().close()
+        db.close()
         await web_runner.cleanup()
 
 
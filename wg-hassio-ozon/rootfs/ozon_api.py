@@ -4,16 +4,19 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from fetcher import OzonFetcher, get_fetcher
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class OzonAPI:
     """Class to interact with Ozon via direct links."""
 
-    def __init__(self, site: str) -> None:
+    def __init__(self, site: str, fetcher: OzonFetcher | None = None) -> None:
         """Initialize Ozon API client."""
         self.site = site
         self.base_url = f"https://{site}"
+        self.fetcher = fetcher or get_fetcher()
 
     async def get_favorites(self) -> list[dict[str, Any]]:
         """Get favorite items from Ozon by fetching pages directly."""
@@ -29,13 +32,11 @@ class OzonAPI:
             _LOGGER.debug("Fetching favorites from Ozon (%s)", self.site)
             
             # Placeholder - replace with actual page fetching
-            # import aiohttp
-            # async with aiohttp.ClientSession() as session:
-            #     async with session.get(f"{self.base_url}/some-page") as response:
-            #         html = await response.text()
-            #         # Parse HTML and extract items
-            #         items = parse_items(html)
-            #         return items
+            # async with self.fetcher.get(f"{self.base_url}/some-page") as response:
+            #     html = await response.text()
+            #     # Parse HTML and extract items
+            #     items = parse_items(html)
+            #     return items
             
             # Temporary mock data for testing
             return [
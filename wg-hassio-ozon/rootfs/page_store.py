@@ -0,0 +1,69 @@
+"""Content-addressed on-disk store for raw Ozon HTML pages."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPRESS_LEVEL = 6
+
+
+class PageStore:
+    """Store pages as gzip files named by the SHA-256 of their content.
+
+    Identical pages are stored once, whichever products they belong to.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize page store."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        """Get blob path, fanned out by the first two hex digits."""
+        return self.root / digest[:2] / f"{digest}.gz"
+
+    def put(self, html: str) -> tuple[str, int]:
+        """Store page. Returns (content hash, uncompressed size in bytes)."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(data, COMPRESS_LEVEL))
+                os.replace(tmp_path, path)
+            except Exception:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+        return digest, len(data)
+
+    def get(self, digest: str) -> str | None:
+        """Read page by content hash (memory-mapped)."""
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return gzip.decompress(mapped).decode("utf-8")
+        except FileNotFoundError:
+            _LOGGER.warning("Page blob not found: %s", digest)
+            return None
+
+    def collect_garbage(self, referenced: set[str]) -> int:
+        """Remove blobs whose hash is not referenced. Returns number of removed blobs."""
+        removed = 0
+        for path in self.root.glob("*/*.gz"):
+            if path.name[:-3] not in referenced:
+                path.unlink(missing_ok=True)
+                removed += 1
+        for path in self.root.glob("*/*.tmp"):
+            path.unlink(missing_ok=True)
+        return removed
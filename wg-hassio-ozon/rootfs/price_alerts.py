@@ -0,0 +1,166 @@
+"""Price drop detection and notifications for Ozon add-on."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Any
+
+import aiohttp
+
+from database import price_from_minor
+
+_LOGGER = logging.getLogger(__name__)
+
+ALERT_FLUSH_INTERVAL = 60  # Send collected alerts once a minute
+ALERT_BATCH_SIZE = 20  # Max alerts per notification message
+
+# Currency symbol of prices per Ozon site
+SITE_CURRENCIES = {
+    "ozon.ru": "₽",
+    "ozon.by": "BYN",
+    "ozon.kz": "₸",
+}
+DEFAULT_SITE = "ozon.by"
+
+
+class PriceAlertEngine:
+    """Evaluate price alert rules as each new price lands and notify HA in batches."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize price alert engine from add-on options."""
+        self.ha_token = os.environ.get("SUPERVISOR_TOKEN")
+        self.ha_url = os.environ.get("HASSIO_URL", "http://supervisor/core")
+        self.drop_percent = float(config.get("alert_drop_percent", 10) or 0)
+        self.drop_absolute = float(config.get("alert_drop_absolute", 0) or 0)
+        self.all_time_low = bool(config.get("alert_all_time_low", True))
+        self.back_in_stock = bool(config.get("alert_back_in_stock", True))
+        self.notify_services = list(config.get("notify_services") or []) or ["persistent_notification"]
+        site = (config.get("site") or DEFAULT_SITE).lower().removeprefix("www.")
+        self.currency = SITE_CURRENCIES.get(site, SITE_CURRENCIES[DEFAULT_SITE])
+        self._pending: deque[dict[str, Any]] = deque()
+        self._task: asyncio.Task | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._running = False
+
+    def evaluate(self, event: dict[str, Any]) -> list[dict[str, Any]]:
+        """Evaluate rules for a price change event using running stats only."""
+        alerts = []
+        price = price_from_minor(event["price_minor"])
+        previous = event["previous"]
+        last_price = price_from_minor(previous.get("last_minor"))
+        min_price = price_from_minor(previous.get("min_minor"))
+
+        if price is None:
+            return alerts
+
+        if self.back_in_stock and previous.get("in_stock") is False:
+            alerts.append({"rule": "back_in_stock", "price": price})
+
+        if last_price and price < last_price:
+            drop = last_price - price
+            if self.drop_absolute > 0 and drop >= self.drop_absolute:
+                alerts.append({"rule": "absolute", "price": price, "old_price": last_price})
+            elif self.drop_percent > 0 and drop / last_price * 100 >= self.drop_percent:
+                alerts.append({"rule": "percent", "price": price, "old_price": last_price})
+
+        if self.all_time_low and min_price is not None and price < min_price:
+            alerts.append({"rule": "all_time_low", "price": price, "old_price": min_price})
+
+        for alert in alerts:
+            alert["product_id"] = event["product_id"]
+            alert["name"] = event["name"]
+        return alerts
+
+    def on_price_change(self, event: dict[str, Any]) -> None:
+        """Price listener: queue alerts for the next batch."""
+        alerts = self.evaluate(event)
+        if alerts:
+            _LOGGER.info("Price alerts for product %s: %s", event["product_id"],
+                         [alert["rule"] for alert in alerts])
+            self._pending.extend(alerts)
+
+    def format_alert(self, alert: dict[str, Any]) -> str:
+        """Format alert as a message line."""
+        name = alert["name"]
+        price = alert["price"]
+        old_price = alert.get("old_price")
+        currency = self.currency
+        if alert["rule"] == "back_in_stock":
+            return f"{name}: снова в наличии, {price:g} {currency}"
+        if alert["rule"] == "all_time_low":
+            return f"{name}: минимальная цена {price:g} {currency} (была {old_price:g} {currency})"
+        percent = (old_price - price) / old_price * 100
+        return f"{name}: цена снизилась до {price:g} {currency} (было {old_price:g} {currency}, -{percent:.0f}%)"
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create aiohttp session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def flush(self) -> int:
+        """Send pending alerts to notify services. Returns number of alerts sent."""
+        if not self._pending:
+            return 0
+
+        alerts = []
+        while self._pending:
+            alerts.append(self._pending.popleft())
+
+        if not self.ha_token:
+            _LOGGER.warning("SUPERVISOR_TOKEN not found, dropping %d price alerts", len(alerts))
+            return 0
+
+        session = await self._get_session()
+        headers = {
+            "Authorization": f"Bearer {self.ha_token}",
+            "Content-Type": "application/json"
+        }
+        for start in range(0, len(alerts), ALERT_BATCH_SIZE):
+            batch = alerts[start:start + ALERT_BATCH_SIZE]
+            payload = {
+                "title": "Ozon: изменение цен",
+                "message": "\n".join(self.format_alert(alert) for alert in batch)
+            }
+            for service_name in self.notify_services:
+                try:
+                    api_url = f"{self.ha_url}/api/services/notify/{service_name}"
+                    async with session.post(api_url, headers=headers, json=payload) as resp:
+                        if resp.status != 200:
+                            response_text = await resp.text()
+                            _LOGGER.warning("Failed to send price alerts via %s: status %s, response: %s",
+                                            service_name, resp.status, response_text[:200])
+                except Exception as service_err:
+                    _LOGGER.error("Error sending price alerts via %s: %s", service_name, service_err)
+
+        _LOGGER.info("Sent %d price alerts to %s", len(alerts), self.notify_services)
+        return len(alerts)
+
+    async def _flush_loop(self) -> None:
+        """Background loop sending collected alerts."""
+        while self._running:
+            try:
+                await asyncio.sleep(ALERT_FLUSH_INTERVAL)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as err:
+                _LOGGER.error("Error in price alert loop: %s", err, exc_info=True)
+
+    def start(self) -> None:
+        """Start background alert delivery."""
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+        _LOGGER.info("Price alerts started (drop: %s%% / %s, all-time low: %s, back in stock: %s)",
+                     self.drop_percent, self.drop_absolute, self.all_time_low, self.back_in_stock)
+
+    async def close(self) -> None:
+        """Stop background delivery, send remaining alerts and close session."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+        if self._session and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,120 @@
+"""Persistent job scheduler for Ozon add-on."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from async_database import AsyncDatabase
+
+_LOGGER = logging.getLogger(__name__)
+
+CATCHUP_SPREAD = 60  # Missed and first runs start within a minute, staggered
+
+# Per-product adaptive page refresh
+PRODUCT_MIN_INTERVAL = 3600  # Volatile prices: refresh every hour
+PRODUCT_MAX_INTERVAL = 86400  # Stable prices: refresh once a day
+PRODUCT_DEFAULT_INTERVAL = 6 * 3600  # No price history yet
+PRODUCT_RETRY_INTERVAL = 1800  # Retry failed fetches after 30 minutes
+
+
+class Job:
+    """Scheduled job."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[str | None]],
+                 interval: int, jitter: float = 0.1) -> None:
+        """Initialize job."""
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.next_run = 0.0
+
+    def next_delay(self) -> float:
+        """Interval until next run with random jitter applied."""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+async def adaptive_interval(db: AsyncDatabase, product_id: str, success: bool) -> int:
+    """Refresh interval for product based on how recently its price changed.
+
+    Products whose price changed recently are refreshed more often,
+    products with a stable price back off to PRODUCT_MAX_INTERVAL.
+    """
+    if not success:
+        return PRODUCT_RETRY_INTERVAL
+
+    stats = await db.get_price_stats(product_id)
+    if not stats or not stats.get("last_ts"):
+        return PRODUCT_DEFAULT_INTERVAL
+
+    age = int(time.time()) - stats["last_ts"]
+    return max(PRODUCT_MIN_INTERVAL, min(PRODUCT_MAX_INTERVAL, age // 4))
+
+
+class Scheduler:
+    """Run named jobs on their own intervals, with jitter and catch-up after restart."""
+
+    def __init__(self, db: AsyncDatabase) -> None:
+        """Initialize scheduler."""
+        self._db = db
+        self._jobs: dict[str, Job] = {}
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[str | None]],
+                interval: int, jitter: float = 0.1) -> None:
+        """Register job. func returns optional notes stored in run history."""
+        self._jobs[name] = Job(name, func, interval, jitter)
+
+    async def _initial_next_run(self, job: Job, now: float) -> float:
+        """Get first run time from last recorded execution (missed runs are caught up)."""
+        last = await self._db.get_cron_last_execution(job.name)
+        if last:
+            try:
+                next_run = datetime.fromisoformat(last["last_execution"]).timestamp() + job.interval
+                if next_run > now:
+                    return next_run
+                _LOGGER.info("Job %s missed its run, catching up", job.name)
+            except (ValueError, TypeError):
+                pass
+        return now + random.uniform(0, CATCHUP_SPREAD)
+
+    def get_jobs(self) -> list[dict[str, Any]]:
+        """Get registered jobs with their next run time."""
+        return [{
+            "name": job.name,
+            "interval": job.interval,
+            "next_run": datetime.fromtimestamp(job.next_run).isoformat() if job.next_run else None
+        } for job in self._jobs.values()]
+
+    async def run_job(self, job: Job) -> None:
+        """Run job once and record it in run history."""
+        started_at = datetime.now().isoformat()
+        start_time = time.time()
+        try:
+            _LOGGER.info("Running job %s", job.name)
+            notes = await job.func()
+            status = "success"
+        except Exception as err:
+            _LOGGER.error("Error in job %s: %s", job.name, err, exc_info=True)
+            notes = str(err)
+            status = "error"
+        duration = time.time() - start_time
+        await self._db.add_cron_run(job.name, started_at, duration, status, notes)
+        _LOGGER.info("Job %s finished: %s in %.2fs (%s)", job.name, status, duration, notes)
+
+    async def run(self) -> None:
+        """Run scheduler loop forever."""
+        now = time.time()
+        for job in self._jobs.values():
+            job.next_run = await self._initial_next_run(job, now)
+
+        while True:
+            job = min(self._jobs.values(), key=lambda item: item.next_run)
+            delay = job.next_run - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.run_job(job)
+            job.next_run = time.time() + job.next_delay()
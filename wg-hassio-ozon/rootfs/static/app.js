@@ -0,0 +1,276 @@
+async function loadFavorites() {
+    const list = document.getElementById('favorites-list');
+
+    list.innerHTML = '<div class="loading">Загрузка...</div>';
+
+    try {
+        // Use relative path for Ingress
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/favorites';
+        const response = await fetch(apiUrl);
+        console.log('Response:', response);
+        console.log('Response status:', response.status);
+        console.log('Response ok:', response.ok);
+        console.log('API URL:', apiUrl);
+
+        const data = await response.json();
+        console.log('Data:', data);
+        console.log('Data favorites:', data.favorites);
+
+        if (data.success) {
+            if (data.favorites.length === 0) {
+                list.innerHTML = '<div class="loading">Нет товаров в базе</div>';
+            } else {
+                list.innerHTML = data.favorites.map(item => {
+                    const name = escapeHtml(item.name || 'Unknown');
+                    const url = item.url || '#';
+                    const price = formatPrice(item.price || 0);
+                    const itemId = item.id || 'unknown';
+                    const lastFetch = item.last_fetch;
+
+                    let lastFetchHtml = '';
+                    if (lastFetch) {
+                        const status = lastFetch.status || 'unknown';
+                        const timestamp = lastFetch.timestamp ? new Date(lastFetch.timestamp).toLocaleString('ru-RU') : '';
+                        const statusClass = status === 'success' ? 'status-success' : (status === 'error' ? 'status-error' : 'status-unknown');
+                        const statusText = status === 'success' ? 'Успешно' : (status === 'error' ? 'Ошибка' : 'Неизвестно');
+
+                        lastFetchHtml = `
+                            <div class="item-info">
+                                <div class="last-fetch">
+                                    <span class="status-badge ${statusClass}">${statusText}</span>
+                                    <span>${timestamp || ''}</span>
+                                </div>
+                            </div>
+                        `;
+                    } else {
+                        lastFetchHtml = `
+                            <div class="item-info">
+                                <div class="last-fetch">
+                                    <span class="status-badge status-unknown">Не загружалось</span>
+                                </div>
+                            </div>
+                        `;
+                    }
+
+                    return `
+                    <div class="favorite-item">
+                        <div>
+                            <div class="item-name">
+                                ${url !== '#' ? `<a href="${escapeHtml(url)}" target="_blank">${name}</a>` : name}
+                            </div>
+                            ${lastFetchHtml}
+                        </div>
+                        <div class="item-actions">
+                            <div class="item-price">${price} ₽</div>
+                            <button class="fetch-btn" onclick="fetchProductPage('${escapeHtml(itemId)}', '${escapeHtml(url)}', this)">Загрузить страницу</button>
+                        </div>
+                    </div>
+                `;
+                }).join('');
+            }
+        } else {
+            list.innerHTML = '<div class="loading">Ошибка: ' + escapeHtml(data.error) + '</div>';
+        }
+    } catch (error) {
+        list.innerHTML = '<div class="loading">Ошибка загрузки: ' + escapeHtml(error.message) + '</div>';
+    }
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function formatPrice(price) {
+    return new Intl.NumberFormat('ru-RU').format(price);
+}
+
+// Modal functions
+function openModal() {
+    document.getElementById('addModal').style.display = 'block';
+    document.getElementById('itemUrl').focus();
+}
+
+function closeModal() {
+    document.getElementById('addModal').style.display = 'none';
+    document.getElementById('addForm').reset();
+    document.getElementById('errorMessage').style.display = 'none';
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modal = document.getElementById('addModal');
+    if (event.target == modal) {
+        closeModal();
+    }
+}
+
+// Add item function
+async function addItem(event) {
+    event.preventDefault();
+    const urlInput = document.getElementById('itemUrl');
+    const url = urlInput.value.trim();
+    const errorDiv = document.getElementById('errorMessage');
+
+    if (!url) {
+        errorDiv.textContent = 'Введите ссылку на товар';
+        errorDiv.style.display = 'block';
+        return;
+    }
+
+    // Validate Ozon URL
+    if (!url.includes('ozon.') || !url.includes('/product/')) {
+        errorDiv.textContent = 'Введите корректную ссылку на товар Ozon';
+        errorDiv.style.display = 'block';
+        return;
+    }
+
+    errorDiv.style.display = 'none';
+
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/favorites';
+        const response = await fetch(apiUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ url: url })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            closeModal();
+            loadFavorites(); // Reload list
+        } else {
+            errorDiv.textContent = data.error || 'Ошибка при добавлении товара';
+            errorDiv.style.display = 'block';
+        }
+    } catch (error) {
+        errorDiv.textContent = 'Ошибка: ' + error.message;
+        errorDiv.style.display = 'block';
+    }
+}
+
+// Fetch product page function
+async function fetchProductPage(productId, url, button) {
+    if (!url || url === '#') {
+        alert('Нет ссылки на товар');
+        return;
+    }
+
+    button.disabled = true;
+    button.textContent = 'Загрузка...';
+
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/fetch-page';
+        const response = await fetch(apiUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                url: url,
+                product_id: productId
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            alert('Страница успешно загружена и сохранена!');
+        } else {
+            alert('Ошибка: ' + (data.error || 'Неизвестная ошибка'));
+        }
+    } catch (error) {
+        alert('Ошибка: ' + error.message);
+    } finally {
+        button.disabled = false;
+        button.textContent = 'Загрузить страницу';
+    }
+}
+
+// Load last fetch info
+async function loadLastFetchInfo() {
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/last-fetch';
+        const response = await fetch(apiUrl);
+        const data = await response.json();
+
+        const badge = document.getElementById('last-fetch-badge');
+        if (data.success && data.last_fetch) {
+            const timestamp = new Date(data.last_fetch.timestamp);
+            const formatted = timestamp.toLocaleString('ru-RU');
+            badge.textContent = `Последний запрос: ${formatted}`;
+            badge.classList.remove('empty');
+        } else {
+            badge.textContent = 'Запросов ещё не было';
+            badge.classList.add('empty');
+        }
+    } catch (error) {
+        const badge = document.getElementById('last-fetch-badge');
+        badge.textContent = 'Ошибка загрузки';
+        badge.classList.add('empty');
+    }
+}
+
+// Parse all products function (reads NDJSON progress stream)
+async function parseAllProducts() {
+    const button = document.getElementById('parse-all-btn');
+    const originalText = button.textContent;
+
+    button.disabled = true;
+    button.textContent = 'Парсинг...';
+
+    try {
+        const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/parse-all/stream';
+        const response = await fetch(apiUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let summary = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const event = JSON.parse(line);
+                if (event.type === 'result') {
+                    const speed = (event.bytes_per_sec / 1024).toFixed(0);
+                    button.textContent = `Парсинг... ${event.done}/${event.total} (${event.pages_per_sec.toFixed(2)} стр/с, ${speed} КБ/с)`;
+                } else if (event.type === 'done') {
+                    summary = event;
+                }
+            }
+        }
+
+        if (summary && summary.success) {
+            alert(`Парсинг завершен!\nВсего: ${summary.total}\nУспешно: ${summary.success_count}\nОшибок: ${summary.error_count}`);
+            loadFavorites(); // Reload list to show updated fetch times
+            loadLastFetchInfo(); // Update last fetch badge
+        } else {
+            alert('Ошибка при парсинге: ' + ((summary && summary.error) || 'Неизвестная ошибка'));
+        }
+    } catch (error) {
+        alert('Ошибка: ' + error.message);
+    } finally {
+        button.disabled = false;
+        button.textContent = originalText;
+    }
+}
+
+// Load on page load
+loadFavorites();
+loadLastFetchInfo();
@@ -0,0 +1,103 @@
+"""Static assets of the add-on web UI: content-hashed, pre-compressed, cached for good."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are optional, gzip is always built
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+INDEX_FILE = "index.html"
+
+HASH_LENGTH = 12  # Hex digits of SHA-256 in asset file names
+COMPRESS_MIN_SIZE = 256  # Smaller assets are not worth compressing, bytes
+MAX_RENDERED_PAGES = 16  # Rendered index pages kept per ingress path
+
+# Hashed assets never change under the same name; the index must be revalidated
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+
+
+class StaticAssets:
+    """Hashed copies of static assets and the index page referencing them.
+
+    Every asset next to index.html is copied once at startup to
+    <name>.<hash><ext> with .gz and .br variants, which aiohttp's static
+    route serves according to Accept-Encoding. The index refers to assets
+    as "static/<name>" and gets the hashed names when rendered.
+    """
+
+    def __init__(self, source_dir: Path = STATIC_DIR) -> None:
+        """Initialize static assets."""
+        self.source_dir = Path(source_dir)
+        self.build_dir = Path(tempfile.mkdtemp(prefix="static-"))
+        self.names: dict[str, str] = {}  # source name -> hashed name
+        self._template = (self.source_dir / INDEX_FILE).read_text(encoding="utf-8")
+        self._pages: dict[str, tuple[str, str]] = {}  # base path -> (html, etag)
+        self._build()
+
+    def _build(self) -> None:
+        """Write hashed and compressed copies of assets to the build directory."""
+        for path in sorted(self.source_dir.iterdir()):
+            if not path.is_file() or path.name == INDEX_FILE:
+                continue
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+            hashed = f"{path.stem}.{digest}{path.suffix}"
+            target = self.build_dir / hashed
+            target.write_bytes(data)
+            if len(data) >= COMPRESS_MIN_SIZE:
+                target.with_name(f"{hashed}.gz").write_bytes(gzip.compress(data, 9, mtime=0))
+                if brotli is not None:
+                    target.with_name(f"{hashed}.br").write_bytes(brotli.compress(data))
+            self.names[path.name] = hashed
+        _LOGGER.debug("Static assets built in %s: %s", self.build_dir, self.names)
+
+    def render_index(self, base: str = "") -> tuple[str, str]:
+        """Get index page with hashed asset URLs under base path. Returns (html, etag)."""
+        page = self._pages.get(base)
+        if page is None:
+            html = self._template
+            for name, hashed in self.names.items():
+                html = html.replace(f'"static/{name}"', f'"{base}/static/{hashed}"')
+            etag = hashlib.sha256(html.encode("utf-8")).hexdigest()[:HASH_LENGTH * 2]
+            if len(self._pages) >= MAX_RENDERED_PAGES:
+                self._pages.clear()
+            page = self._pages[base] = (html, etag)
+        return page
+
+    async def index(self, request: web.Request) -> web.Response:
+        """Serve index page, answering 304 when the browser has it already."""
+        # Behind ingress the page lives under /api/hassio_ingress/<token>
+        base = request.headers.get("X-Ingress-Path", "").rstrip("/")
+        html, etag = self.render_index(base)
+
+        if request.if_none_match and any(tag.value == etag for tag in request.if_none_match):
+            response = web.Response(status=304, headers={"Cache-Control": INDEX_CACHE_CONTROL})
+        else:
+            response = web.Response(text=html, content_type="text/html",
+                                    headers={"Cache-Control": INDEX_CACHE_CONTROL})
+        response.etag = etag
+        return response
+
+    def setup(self, app: web.Application) -> None:
+        """Add index and static routes to app."""
+        app.router.add_get("/", self.index)
+        app.router.add_static("/static", self.build_dir)
+        app.on_response_prepare.append(_set_static_cache_control)
+
+
+async def _set_static_cache_control(request: web.Request, response: web.StreamResponse) -> None:
+    """Mark hashed static assets as immutable."""
+    if request.path.startswith("/static/") and response.status in (200, 304):
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
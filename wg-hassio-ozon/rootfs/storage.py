@@ -4,7 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from database import Database
+from async_database import get_async_database
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,28 +14,26 @@ class OzonStorage:
 
     def __init__(self) -> None:
         """Initialize storage."""
-        self.db = Database()
+        self.db = get_async_database()
 
-    def save_favorites(self, favorites: list[dict[str, Any]]) -> None:
+    async def save_favorites(self, favorites: list[dict[str, Any]]) -> None:
         """Save favorites to database."""
         try:
+            valid = []
             for item in favorites:
-                product_id = item.get("id", "")
-                url = item.get("url", "")
-                name = item.get("name", "")
-                price = item.get("price", 0)
-                
-                if product_id and url:
-                    self.db.add_product(product_id, url, name, price)
+                if item.get("id", "") and item.get("url", ""):
+                    valid.append(item)
                 else:
                     _LOGGER.warning("Skipping invalid item: %s", item)
+            
+            await self.db.upsert_products(valid)
         except Exception as err:
             _LOGGER.error("Error saving favorites: %s", err)
 
-    def get_favorites(self) -> list[dict[str, Any]]:
+    async def get_favorites(self) -> list[dict[str, Any]]:
         """Get favorites from database."""
         try:
-            return self.db.get_all_products()
+            return await self.db.get_all_products()
         except Exception as err:
             _LOGGER.error("Error getting favorites: %s", err)
             return []
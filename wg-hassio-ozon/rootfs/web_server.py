@@ -7,101 +7,94 @@ import json
 import logging
 import re
 import time
-from aiohttp import web, ClientSession
+from datetime import datetime
+from typing import Any, AsyncIterator
 
-from database import Database
+from aiohttp import web
+
+from async_database import get_async_database
+from database import PRICE_STEP_DAY, PRICE_STEP_HOUR
+from fetcher import get_fetcher
+from static_assets import StaticAssets
 
 _LOGGER = logging.getLogger(__name__)
 
-# Initialize database
-db = Database()
+# Initialize database (async access, writes go through a single writer thread)
+db = get_async_database()
 
+# Web UI (index page and hashed static assets)
+assets = StaticAssets()
+
+# Job scheduler (set from main)
+_scheduler = None
+
+
+def set_scheduler(scheduler) -> None:
+    """Set job scheduler instance."""
+    global _scheduler
+    _scheduler = scheduler
+
+
+CRAWL_WORKERS = 4  # Max concurrent page fetches for parse-all
+
+# Price series step names accepted by the API
+PRICE_STEPS = {
+    "raw": 0,
+    "hour": PRICE_STEP_HOUR,
+    "day": PRICE_STEP_DAY,
+}
 
-def get_browser_headers(url: str = "") -> dict[str, str]:
-    """Get browser-like headers for HTTP requests."""
-    # Determine referer based on URL
-    referer = "https://www.ozon.ru/"
-    if url:
-        if "ozon.by" in url:
-            referer = "https://www.ozon.by/"
-        elif "ozon.ru" in url:
-            referer = "https://www.ozon.ru/"
-    
-    return {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-        "Cache-Control": "max-age=0",
-        "DNT": "1",
-        "Referer": referer
-    }
+
+def parse_timestamp(value: str | None, default: int) -> int:
+    """Parse epoch seconds or ISO date/datetime string into epoch seconds."""
+    if not value:
+        return default
+    try:
+        return int(float(value))
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
 
 
 async def get_favorites(request: web.Request) -> web.Response:
-    """Get favorites from database with last fetch info."""
+    """Get favorites from database with last fetch info.
+
+    Query parameters:
+        limit: page size (omit to return all products)
+        offset: number of products to skip
+        sort: created_at, updated_at, name, price or last_fetch
+        order: asc or desc
+    """
     try:
         _LOGGER.debug("Getting favorites from database")
         
-        # Get products from database
-        favorites = db.get_all_products()
-        _LOGGER.debug("Retrieved %d products from database", len(favorites))
+        # Parse pagination and sorting parameters
+        try:
+            limit = request.query.get("limit")
+            limit = max(1, min(int(limit), 1000)) if limit else None
+            offset = max(0, int(request.query.get("offset", 0)))
+        except (ValueError, TypeError):
+            return web.json_response({
+                "success": False,
+                "error": "Invalid limit or offset",
+                "favorites": [],
+                "count": 0
+            }, status=400)
+        sort = request.query.get("sort", "created_at")
+        order = request.query.get("order", "desc")
         
-        # Ensure all items have required fields
-        result = []
-        for item in favorites:
-            try:
-                product_id = str(item.get("id", "")) if item.get("id") else ""
-                
-                # Add last fetch info for each product
-                last_fetch = None
-                if product_id:
-                    try:
-                        last_fetch = db.get_last_fetch(product_id)
-                    except Exception as fetch_err:
-                        _LOGGER.warning("Error getting last fetch for product %s: %s", product_id, fetch_err)
-                
-                # Ensure price is a valid number
-                price = item.get("price", 0)
-                try:
-                    price = float(price) if price is not None else 0.0
-                except (ValueError, TypeError):
-                    price = 0.0
-                
-                product_data = {
-                    "id": product_id,
-                    "url": str(item.get("url", "")) if item.get("url") else "",
-                    "name": str(item.get("name", "")) if item.get("name") else f"Товар {product_id}",
-                    "price": price
-                }
-                
-                if last_fetch:
-                    product_data["last_fetch"] = {
-                        "timestamp": str(last_fetch.get("timestamp", "")),
-                        "status": str(last_fetch.get("status", "")),
-                        "error_message": str(last_fetch.get("error_message", "")) if last_fetch.get("error_message") else None
-                    }
-                else:
-                    product_data["last_fetch"] = None
-                
-                result.append(product_data)
-            except Exception as item_err:
-                _LOGGER.warning("Error processing product item: %s, item: %s", item_err, item)
-                continue
+        # Products and their last fetch status come from a single query
+        result, total = await db.get_products_with_last_fetch(limit, offset, sort, order)
         
         response_data = {
             "success": True,
             "favorites": result,
-            "count": len(result)
+            "count": len(result),
+            "total": total,
+            "limit": limit,
+            "offset": offset
         }
         
-        _LOGGER.debug("Returning %d products", len(result))
+        _LOGGER.debug("Returning %d of %d products", len(result), total)
         return web.json_response(response_data)
     except Exception as err:
         _LOGGER.error("Error getting favorites: %s", err, exc_info=True)
@@ -121,6 +114,107 @@ async def get_favorites(request: web.Request) -> web.Response:
             )
 
 
+async def get_jobs(request: web.Request) -> web.Response:
+    """Get scheduled jobs and their run history."""
+    try:
+        job_name = request.query.get("job")
+        try:
+            limit = max(1, min(int(request.query.get("limit", 100)), 1000))
+        except ValueError:
+            limit = 100
+        
+        return web.json_response({
+            "success": True,
+            "jobs": _scheduler.get_jobs() if _scheduler else [],
+            "runs": await db.get_cron_runs(job_name, limit)
+        })
+    except Exception as err:
+        _LOGGER.error("Error getting jobs: %s", err)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
+async def get_fetch_stats(request: web.Request) -> web.Response:
+    """Get adaptive rate control state per host."""
+    return web.json_response({
+        "success": True,
+        "hosts": get_fetcher().rate_controller.get_stats()
+    })
+
+
+async def search_products(request: web.Request) -> web.Response:
+    """Search products by name (prefix matching, ranked)."""
+    try:
+        query = request.query.get("q", "").strip()
+        try:
+            limit = max(1, min(int(request.query.get("limit", 50)), 200))
+            offset = max(0, int(request.query.get("offset", 0)))
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": "Invalid limit or offset"
+            }, status=400)
+        
+        products, total = await db.search_products(query, limit, offset)
+        return web.json_response({
+            "success": True,
+            "query": query,
+            "products": products,
+            "count": len(products),
+            "total": total
+        })
+    except Exception as err:
+        _LOGGER.error("Error searching products: %s", err)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
+async def get_product_prices(request: web.Request) -> web.Response:
+    """Get price series for product (raw points or hourly/daily min/max/last buckets)."""
+    try:
+        product_id = request.match_info["product_id"]
+        
+        now = int(time.time())
+        try:
+            to_ts = parse_timestamp(request.query.get("to"), now)
+            from_ts = parse_timestamp(request.query.get("from"), to_ts - 30 * 86400)
+        except ValueError:
+            return web.json_response({
+                "success": False,
+                "error": "Invalid from/to value"
+            }, status=400)
+        
+        step_name = request.query.get("step")
+        if step_name and step_name not in PRICE_STEPS:
+            return web.json_response({
+                "success": False,
+                "error": f"Invalid step, expected one of: {', '.join(PRICE_STEPS)}"
+            }, status=400)
+        step = PRICE_STEPS[step_name] if step_name else None
+        
+        series = await db.get_price_series(product_id, from_ts, to_ts, step)
+        step_value = series["step"]
+        
+        return web.json_response({
+            "success": True,
+            "product_id": product_id,
+            "from": from_ts,
+            "to": to_ts,
+            "step": next((name for name, value in PRICE_STEPS.items() if value == step_value), step_value),
+            "points": series["points"]
+        })
+    except Exception as err:
+        _LOGGER.error("Error getting product prices: %s", err)
+        return web.json_response({
+            "success": False,
+            "error": str(err)
+        }, status=500)
+
+
 async def add_favorite(request: web.Request) -> web.Response:
     """Add favorite item to storage."""
     try:
@@ -142,7 +236,7 @@ async def add_favorite(request: web.Request) -> web.Response:
             }, status=400)
         
         # Check if URL already exists
-        if db.product_exists(url):
+        if await db.product_exists(url):
             return web.json_response({
                 "success": False,
                 "error": "Товар с такой ссылкой уже существует"
@@ -157,7 +251,7 @@ async def add_favorite(request: web.Request) -> web.Response:
             product_id = hashlib.md5(url.encode()).hexdigest()[:16]
         
         # Add product to database
-        if db.add_product(product_id, url, f"Товар {product_id}", 0):
+        if await db.add_product(product_id, url, f"Товар {product_id}", 0):
             new_item = {
                 "id": product_id,
                 "url": url,
@@ -192,7 +286,7 @@ async def add_favorite(request: web.Request) -> web.Response:
 async def get_last_fetch_info(request: web.Request) -> web.Response:
     """Get last fetch info for any product."""
     try:
-        last_fetch = db.get_last_fetch_any()
+        last_fetch = await db.get_last_fetch_any()
         
         if last_fetch:
             return web.json_response({
@@ -216,13 +310,145 @@ async def get_last_fetch_info(request: web.Request) -> web.Response:
         }, status=500)
 
 
+async def fetch_and_save_page(product_id: str, url: str) -> dict[str, Any]:
+    """Fetch product page, save it and record the attempt in fetch history.
+
+    Returns result dict with status "success" or "error"; http_status is set
+    when the server answered with a non-200 status.
+    """
+    try:
+        start_time = time.time()
+        _LOGGER.info("Fetching page for product ID=%s, URL=%s", product_id, url)
+        
+        async with get_fetcher().get(url) as response:
+            elapsed_time = time.time() - start_time
+            _LOGGER.info("Response received for product ID=%s: status=%d, elapsed=%.2fs, headers=%s", 
+                       product_id, response.status, elapsed_time, dict(response.headers))
+            
+            if response.status == 200:
+                html = await response.text()
+                html_size = len(html)
+                _LOGGER.info("HTML content received for product ID=%s: size=%d bytes", product_id, html_size)
+                
+                # Save to database
+                if await db.save_page(product_id, html):
+                    # Record successful fetch in history
+                    await db.add_fetch_history(product_id, "success", None, html_size)
+                    _LOGGER.info("Page saved successfully for product ID=%s: size=%d bytes, total_time=%.2fs", 
+                               product_id, html_size, time.time() - start_time)
+                    return {
+                        "product_id": product_id,
+                        "status": "success",
+                        "html_length": html_size
+                    }
+                
+                error_msg = "Ошибка сохранения страницы в базу данных"
+                _LOGGER.error("Failed to save page to database for product ID=%s", product_id)
+                await db.add_fetch_history(product_id, "error", error_msg)
+                return {
+                    "product_id": product_id,
+                    "status": "error",
+                    "error": error_msg
+                }
+            
+            # Try to read error response body for debugging
+            try:
+                error_body = await response.text()
+                _LOGGER.error("HTTP error for product ID=%s: status=%d, response_body (first 500 chars)=%s", 
+                            product_id, response.status, error_body[:500])
+            except:
+                _LOGGER.error("HTTP error for product ID=%s: status=%d, could not read response body", 
+                            product_id, response.status)
+            
+            error_msg = f"HTTP {response.status}: Не удалось загрузить страницу"
+            await db.add_fetch_history(product_id, "error", error_msg)
+            return {
+                "product_id": product_id,
+                "status": "error",
+                "error": error_msg,
+                "http_status": response.status
+            }
+    except asyncio.TimeoutError as timeout_err:
+        error_msg = f"Timeout: запрос превысил 30 секунд"
+        _LOGGER.error("Timeout error for product ID=%s, URL=%s: %s", product_id, url, timeout_err)
+        await db.add_fetch_history(product_id, "error", error_msg)
+        return {
+            "product_id": product_id,
+            "status": "error",
+            "error": error_msg
+        }
+    except Exception as fetch_err:
+        error_msg = f"Ошибка загрузки: {str(fetch_err)}"
+        _LOGGER.error("Exception while fetching page for product ID=%s, URL=%s: %s (type=%s)", 
+                     product_id, url, fetch_err, type(fetch_err).__name__, exc_info=True)
+        await db.add_fetch_history(product_id, "error", error_msg)
+        return {
+            "product_id": product_id,
+            "status": "error",
+            "error": error_msg
+        }
+
+
+async def crawl_product(product: dict[str, Any]) -> dict[str, Any]:
+    """Fetch page of a single product, returning result with its elapsed time."""
+    product_id = product.get("id", "")
+    url = product.get("url", "")
+    
+    if not url or url == "#":
+        _LOGGER.warning("Product %s: No URL provided, skipping", product_id)
+        return {
+            "product_id": product_id,
+            "status": "error",
+            "error": "Нет ссылки на товар",
+            "elapsed": 0.0
+        }
+    
+    start_time = time.time()
+    result = await fetch_and_save_page(product_id, url)
+    result["elapsed"] = round(time.time() - start_time, 3)
+    return result
+
+
+async def crawl_products(products: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Fetch pages of products, yielding results as they complete.
+
+    Up to CRAWL_WORKERS fetches run at once; the fetcher's rate controller
+    decides how many of them actually hit the same host concurrently.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for product in products:
+        pending.put_nowait(product)
+    results: asyncio.Queue = asyncio.Queue()
+    
+    async def worker() -> None:
+        while not pending.empty():
+            product = pending.get_nowait()
+            try:
+                await results.put(await crawl_product(product))
+            except Exception as err:
+                await results.put({
+                    "product_id": product.get("id", ""),
+                    "status": "error",
+                    "error": str(err),
+                    "elapsed": 0.0
+                })
+    
+    workers = [asyncio.create_task(worker()) for _ in range(min(CRAWL_WORKERS, len(products)))]
+    try:
+        for _ in range(len(products)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+
+
 async def parse_all_products(request: web.Request) -> web.Response:
     """Parse all product pages."""
     try:
         _LOGGER.info("Starting parse_all_products - fetching all product pages")
         
         # Get all products from database
-        products = db.get_all_products()
+        products = await db.get_all_products()
         
         if not products:
             return web.json_response({
@@ -237,98 +463,14 @@ async def parse_all_products(request: web.Request) -> web.Response:
         error_count = 0
         results = []
         
-        async with ClientSession() as session:
-            for product in products:
-                product_id = product.get("id", "")
-                url = product.get("url", "")
-                
-                if not url or url == "#":
-                    _LOGGER.warning("Product %s: No URL provided, skipping", product_id)
-                    error_count += 1
-                    results.append({
-                        "product_id": product_id,
-                        "status": "error",
-                        "error": "Нет ссылки на товар"
-                    })
-                    continue
-                
-                try:
-                    start_time = time.time()
-                    _LOGGER.info("Fetching page for product ID=%s, URL=%s", product_id, url)
-                    
-                    headers = get_browser_headers(url)
-                    async with session.get(url, headers=headers, timeout=30) as response:
-                        elapsed_time = time.time() - start_time
-                        _LOGGER.info("Response received for product ID=%s: status=%d, elapsed=%.2fs, headers=%s", 
-                                   product_id, response.status, elapsed_time, dict(response.headers))
-                        
-                        if response.status == 200:
-                            html = await response.text()
-                            html_size = len(html)
-                            _LOGGER.info("HTML content received for product ID=%s: size=%d bytes", product_id, html_size)
-                            
-                            # Save to database
-                            if db.save_page(product_id, html):
-                                # Record successful fetch in history
-                                db.add_fetch_history(product_id, "success", None, html_size)
-                                
-                                success_count += 1
-                                results.append({
-                                    "product_id": product_id,
-                                    "status": "success",
-                                    "html_length": html_size
-                                })
-                                _LOGGER.info("Page saved successfully for product ID=%s: size=%d bytes, total_time=%.2fs", 
-                                           product_id, html_size, time.time() - start_time)
-                            else:
-                                error_msg = "Ошибка сохранения страницы в базу данных"
-                                _LOGGER.error("Failed to save page to database for product ID=%s", product_id)
-                                db.add_fetch_history(product_id, "error", error_msg)
-                                error_count += 1
-                                results.append({
-                                    "product_id": product_id,
-                                    "status": "error",
-                                    "error": error_msg
-                                })
-                        else:
-                            # Try to read error response body for debugging
-                            try:
-                                error_body = await response.text()
-                                _LOGGER.error("HTTP error for product ID=%s: status=%d, response_body (first 500 chars)=%s", 
-                                            product_id, response.status, error_body[:500])
-                            except:
-                                _LOGGER.error("HTTP error for product ID=%s: status=%d, could not read response body", 
-                                            product_id, response.status)
-                            
-                            error_msg = f"HTTP {response.status}: Не удалось загрузить страницу"
-                            db.add_fetch_history(product_id, "error", error_msg)
-                            error_count += 1
-                            results.append({
-                                "product_id": product_id,
-                                "status": "error",
-                                "error": error_msg
-                            })
-                except asyncio.TimeoutError as timeout_err:
-                    error_msg = f"Timeout: запрос превысил 30 секунд"
-                    _LOGGER.error("Timeout error for product ID=%s, URL=%s: %s", product_id, url, timeout_err)
-                    db.add_fetch_history(product_id, "error", error_msg)
-                    error_count += 1
-                    results.append({
-                        "product_id": product_id,
-                        "status": "error",
-                        "error": error_msg
-                    })
-                except Exception as fetch_err:
-                    error_msg = f"Ошибка загрузки: {str(fetch_err)}"
-                    _LOGGER.error("Exception while fetching page for product ID=%s, URL=%s: %s (type=%s)", 
-                                 product_id, url, fetch_err, type(fetch_err).__name__, exc_info=True)
-                    db.add_fetch_history(product_id, "error", error_msg)
-                    error_count += 1
-                    results.append({
-                        "product_id": product_id,
-                        "status": "error",
-                        "error": error_msg
-                    })
+        async for result in crawl_products(products):
+            if result["status"] == "success":
+                success_count += 1
+            else:
+                error_count += 1
+            result.pop("http_status", None)
+            result.pop("elapsed", None)
+            results.append(result)
         
         _LOGGER.info("parse_all_products completed: %d success, %d errors", success_count, error_count)
         
@@ -349,6 +491,77 @@ async def parse_all_products(request: web.Request) -> web.Response:
         }, status=500)
 
 
+async def parse_all_products_stream(request: web.Request) -> web.StreamResponse:
+    """Parse all product pages, streaming each result as NDJSON line.
+
+    Every "result" line carries aggregate progress and throughput;
+    the final "done" line carries the totals.
+    """
+    response = web.StreamResponse(headers={
+        "Content-Type": "application/x-ndjson",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    await response.prepare(request)
+    
+    async def send(data: dict[str, Any]) -> None:
+        await response.write((json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8"))
+    
+    try:
+        _LOGGER.info("Starting parse_all_products_stream - fetching all product pages")
+        products = await db.get_all_products()
+        total = len(products)
+        await send({"type": "start", "total": total})
+        
+        start_time = time.time()
+        done = 0
+        success_count = 0
+        error_count = 0
+        total_bytes = 0
+        
+        async for result in crawl_products(products):
+            done += 1
+            if result["status"] == "success":
+                success_count += 1
+                total_bytes += result.get("html_length", 0)
+            else:
+                error_count += 1
+            elapsed = max(time.time() - start_time, 1e-6)
+            
+            await send({
+                "type": "result",
+                **result,
+                "done": done,
+                "total": total,
+                "success_count": success_count,
+                "error_count": error_count,
+                "pages_per_sec": round(done / elapsed, 3),
+                "bytes_per_sec": round(total_bytes / elapsed)
+            })
+        
+        elapsed = time.time() - start_time
+        _LOGGER.info("parse_all_products_stream completed: %d success, %d errors, %.2fs", 
+                    success_count, error_count, elapsed)
+        await send({
+            "type": "done",
+            "success": True,
+            "total": total,
+            "success_count": success_count,
+            "error_count": error_count,
+            "bytes": total_bytes,
+            "elapsed": round(elapsed, 3)
+        })
+    except (ConnectionResetError, asyncio.CancelledError):
+        _LOGGER.info("Client disconnected from parse-all stream")
+        raise
+    except Exception as err:
+        _LOGGER.error("Error in parse_all_products_stream: %s", err)
+        await send({"type": "done", "success": False, "error": str(err)})
+    
+    await response.write_eof()
+    return response
+
+
 async def fetch_product_page(request: web.Request) -> web.Response:
     """Fetch HTML page for a product."""
     try:
@@ -370,88 +583,20 @@ async def fetch_product_page(request: web.Request) -> web.Response:
             else:
                 product_id = "unknown"
         
-        _LOGGER.info("Fetching page for product ID=%s, URL=%s", product_id, url)
-        
         # Fetch HTML page
-        start_time = time.time()
-        try:
-            async with ClientSession() as session:
-                headers = get_browser_headers(url)
-                _LOGGER.debug("Sending GET request to URL=%s with headers=%s", url, headers)
-                
-                async with session.get(url, headers=headers, timeout=30) as response:
-                    elapsed_time = time.time() - start_time
-                    _LOGGER.info("Response received for product ID=%s: status=%d, elapsed=%.2fs, headers=%s", 
-                               product_id, response.status, elapsed_time, dict(response.headers))
-                    
-                    if response.status == 200:
-                        html = await response.text()
-                        html_size = len(html)
-                        _LOGGER.info("HTML content received for product ID=%s: size=%d bytes", product_id, html_size)
-                        
-                        # Save to database
-                        if db.save_page(product_id, html):
-                            # Record successful fetch in history
-                            db.add_fetch_history(product_id, "success", None, html_size)
-                            
-                            total_time = time.time() - start_time
-                            _LOGGER.info("Page saved successfully for product ID=%s: size=%d bytes, total_time=%.2fs", 
-                                       product_id, html_size, total_time)
-                            return web.json_response({
-                                "success": True,
-                                "message": "Страница успешно загружена и сохранена",
-                                "product_id": product_id,
-                                "html_length": html_size
-                            })
-                        else:
-                            # Record error in history
-                            error_msg = "Ошибка сохранения страницы в базу данных"
-                            _LOGGER.error("Failed to save page to database for product ID=%s", product_id)
-                            db.add_fetch_history(product_id, "error", error_msg)
-                            
-                            return web.json_response({
-                                "success": False,
-                                "error": error_msg
-                            }, status=500)
-                    else:
-                        # Try to read error response body for debugging
-                        try:
-                            error_body = await response.text()
-                            _LOGGER.error("HTTP error for product ID=%s: status=%d, response_body (first 500 chars)=%s", 
-                                        product_id, response.status, error_body[:500])
-                        except:
-                            _LOGGER.error("HTTP error for product ID=%s: status=%d, could not read response body", 
-                                        product_id, response.status)
-                        
-                        error_msg = f"HTTP {response.status}: Не удалось загрузить страницу"
-                        # Record error in history
-                        db.add_fetch_history(product_id, "error", error_msg)
-                        
-                        return web.json_response({
-                            "success": False,
-                            "error": error_msg
-                        }, status=response.status)
-        except asyncio.TimeoutError as timeout_err:
-            error_msg = f"Timeout: запрос превысил 30 секунд"
-            _LOGGER.error("Timeout error for product ID=%s, URL=%s: %s", product_id, url, timeout_err)
-            db.add_fetch_history(product_id, "error", error_msg)
-            
-            return web.json_response({
-                "success": False,
-                "error": error_msg
-            }, status=500)
-        except Exception as fetch_err:
-            error_msg = f"Ошибка загрузки: {str(fetch_err)}"
-            _LOGGER.error("Exception while fetching page for product ID=%s, URL=%s: %s (type=%s)", 
-                         product_id, url, fetch_err, type(fetch_err).__name__, exc_info=True)
-            
-            # Record error in history
-            db.add_fetch_history(product_id, "error", error_msg)
-            
+        result = await fetch_and_save_page(product_id, url)
+        
+        if result["status"] == "success":
             return web.json_response({
-                "success": False,
-                "error": error_msg
-            }, status=500)
+                "success": True,
+                "message": "Страница успешно загружена и сохранена",
+                "product_id": product_id,
+                "html_length": result["html_length"]
+            })
+        return web.json_response({
+            "success": False,
+            "error": result["error"]
+        }, status=result.get("http_status", 500))
             
     except Exception as err:
         _LOGGER.error("Error in fetch_product_page: %s", err)
@@ -461,596 +606,20 @@ async def fetch_product_page(request: web.Request) -> web.Response:
         }, status=500)
 
 
-async def index(request: web.Request) -> web.Response:
-    """Serve index page."""
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Ozon Add-on</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-                background: white;
-                padding: 30px;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            h1 {
-                color: #03a9f4;
-                margin-top: 0;
-                display: flex;
-                align-items: center;
-                gap: 15px;
-            }
-            .last-fetch-badge {
-                font-size: 12px;
-                padding: 4px 12px;
-                background: #e3f2fd;
-                color: #1976d2;
-                border-radius: 12px;
-                font-weight: normal;
-            }
-            .last-fetch-badge.empty {
-                background: #f5f5f5;
-                color: #999;
-            }
-            .stats {
-                display: flex;
-                gap: 20px;
-                margin: 20px 0;
-            }
-            .stat-card {
-                flex: 1;
-                padding: 20px;
-                background: #f8f9fa;
-                border-radius: 4px;
-                text-align: center;
-            }
-            .stat-value {
-                font-size: 32px;
-                font-weight: bold;
-                color: #03a9f4;
-            }
-            .stat-label {
-                color: #666;
-                margin-top: 5px;
-            }
-            .favorites-list {
-                margin-top: 30px;
-            }
-            .favorite-item {
-                padding: 15px;
-                border-bottom: 1px solid #e0e0e0;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            .item-actions {
-                display: flex;
-                gap: 10px;
-                align-items: center;
-            }
-            .fetch-btn {
-                background: #ff9800;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 14px;
-            }
-            .fetch-btn:hover {
-                background: #f57c00;
-            }
-            .fetch-btn:disabled {
-                background: #ccc;
-                cursor: not-allowed;
-            }
-            .favorite-item:last-child {
-                border-bottom: none;
-            }
-            .item-name {
-                font-weight: 500;
-                color: #333;
-            }
-            .item-name a {
-                color: #03a9f4;
-                text-decoration: none;
-            }
-            .item-name a:hover {
-                text-decoration: underline;
-            }
-            .item-price {
-                font-size: 18px;
-                font-weight: bold;
-                color: #03a9f4;
-            }
-            .item-info {
-                display: flex;
-                flex-direction: column;
-                gap: 5px;
-                font-size: 12px;
-                color: #666;
-            }
-            .last-fetch {
-                display: flex;
-                align-items: center;
-                gap: 5px;
-            }
-            .status-badge {
-                padding: 2px 8px;
-                border-radius: 12px;
-                font-size: 11px;
-                font-weight: 500;
-            }
-            .status-success {
-                background: #4caf50;
-                color: white;
-            }
-            .status-error {
-                background: #f44336;
-                color: white;
-            }
-            .status-unknown {
-                background: #ccc;
-                color: #333;
-            }
-            .refresh-btn {
-                background: #03a9f4;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-                margin-top: 20px;
-            }
-            .refresh-btn:hover {
-                background: #0288d1;
-            }
-            .loading {
-                text-align: center;
-                padding: 20px;
-                color: #666;
-            }
-            .add-btn {
-                background: #4caf50;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-                margin-bottom: 20px;
-            }
-            .add-btn:hover {
-                background: #45a049;
-            }
-            .parse-all-btn {
-                background: #ff9800;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-            }
-            .parse-all-btn:hover {
-                background: #f57c00;
-            }
-            .parse-all-btn:disabled {
-                background: #ccc;
-                cursor: not-allowed;
-            }
-            .modal {
-                display: none;
-                position: fixed;
-                z-index: 1000;
-                left: 0;
-                top: 0;
-                width: 100%;
-                height: 100%;
-                background-color: rgba(0,0,0,0.5);
-            }
-            .modal-content {
-                background-color: white;
-                margin: 15% auto;
-                padding: 30px;
-                border-radius: 8px;
-                width: 90%;
-                max-width: 500px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            .modal-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 20px;
-            }
-            .modal-header h2 {
-                margin: 0;
-                color: #03a9f4;
-            }
-            .close {
-                color: #aaa;
-                font-size: 28px;
-                font-weight: bold;
-                cursor: pointer;
-            }
-            .close:hover {
-                color: #000;
-            }
-            .form-group {
-                margin-bottom: 20px;
-            }
-            .form-group label {
-                display: block;
-                margin-bottom: 8px;
-                color: #333;
-                font-weight: 500;
-            }
-            .form-group input {
-                width: 100%;
-                padding: 10px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                font-size: 16px;
-                box-sizing: border-box;
-            }
-            .form-group input:focus {
-                outline: none;
-                border-color: #03a9f4;
-            }
-            .modal-footer {
-                display: flex;
-                justify-content: flex-end;
-                gap: 10px;
-                margin-top: 20px;
-            }
-            .btn {
-                padding: 10px 20px;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-            }
-            .btn-primary {
-                background: #03a9f4;
-                color: white;
-            }
-            .btn-primary:hover {
-                background: #0288d1;
-            }
-            .btn-secondary {
-                background: #ccc;
-                color: #333;
-            }
-            .btn-secondary:hover {
-                background: #bbb;
-            }
-            .error-message {
-                color: #f44336;
-                margin-top: 10px;
-                font-size: 14px;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>
-                Товары из базы
-                <span class="last-fetch-badge" id="last-fetch-badge">Загрузка...</span>
-            </h1>
-            <div style="display: flex; gap: 10px; margin-bottom: 20px;">
-                <button class="add-btn" onclick="openModal()">+ Добавить товар</button>
-                <button class="parse-all-btn" onclick="parseAllProducts()" id="parse-all-btn">Парсить все товары</button>
-            </div>
-            <div class="favorites-list" id="favorites-list">
-                <div class="loading">Загрузка...</div>
-            </div>
-        </div>
-        
-        <!-- Modal -->
-        <div id="addModal" class="modal">
-            <div class="modal-content">
-                <div class="modal-header">
-                    <h2>Добавить товар</h2>
-                    <span class="close" onclick="closeModal()">&times;</span>
-                </div>
-                <form id="addForm" onsubmit="addItem(event)">
-                    <div class="form-group">
-                        <label for="itemUrl">Ссылка на товар:</label>
-                        <input type="url" id="itemUrl" name="url" placeholder="https://ozon.by/product/..." required>
-                        <div id="errorMessage" class="error-message" style="display: none;"></div>
-                    </div>
-                    <div class="modal-footer">
-                        <button type="button" class="btn btn-secondary" onclick="closeModal()">Отмена</button>
-                        <button type="submit" class="btn btn-primary">Добавить</button>
-                    </div>
-                </form>
-            </div>
-        </div>
-        <script>
-            async function loadFavorites() {
-                const list = document.getElementById('favorites-list');
-                
-                list.innerHTML = '<div class="loading">Загрузка...</div>';
-                
-                try {
-                    // Use relative path for Ingress
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/favorites';
-                    const response = await fetch(apiUrl);
-                    console.log('Response:', response);
-                    console.log('Response status:', response.status);
-                    console.log('Response ok:', response.ok);
-                    console.log('API URL:', apiUrl);
-                    
-                    const data = await response.json();
-                    console.log('Data:', data);
-                    console.log('Data favorites:', data.favorites);
-                    
-                    if (data.success) {
-                        if (data.favorites.length === 0) {
-                            list.innerHTML = '<div class="loading">Нет товаров в базе</div>';
-                        } else {
-                            list.innerHTML = data.favorites.map(item => {
-                                const name = escapeHtml(item.name || 'Unknown');
-                                const url = item.url || '#';
-                                const price = formatPrice(item.price || 0);
-                                const itemId = item.id || 'unknown';
-                                const lastFetch = item.last_fetch;
-                                
-                                let lastFetchHtml = '';
-                                if (lastFetch) {
-                                    const status = lastFetch.status || 'unknown';
-                                    const timestamp = lastFetch.timestamp ? new Date(lastFetch.timestamp).toLocaleString('ru-RU') : '';
-                                    const statusClass = status === 'success' ? 'status-success' : (status === 'error' ? 'status-error' : 'status-unknown');
-                                    const statusText = status === 'success' ? 'Успешно' : (status === 'error' ? 'Ошибка' : 'Неизвестно');
-                                    
-                                    lastFetchHtml = `
-                                        <div class="item-info">
-                                            <div class="last-fetch">
-                                                <span class="status-badge ${statusClass}">${statusText}</span>
-                                                <span>${timestamp || ''}</span>
-                                            </div>
-                                        </div>
-                                    `;
-                                } else {
-                                    lastFetchHtml = `
-                                        <div class="item-info">
-                                            <div class="last-fetch">
-                                                <span class="status-badge status-unknown">Не загружалось</span>
-                                            </div>
-                                        </div>
-                                    `;
-                                }
-                                
-                                return `
-                                <div class="favorite-item">
-                                    <div>
-                                        <div class="item-name">
-                                            ${url !== '#' ? `<a href="${escapeHtml(url)}" target="_blank">${name}</a>` : name}
-                                        </div>
-                                        ${lastFetchHtml}
-                                    </div>
-                                    <div class="item-actions">
-                                        <div class="item-price">${price} ₽</div>
-                                        <button class="fetch-btn" onclick="fetchProductPage('${escapeHtml(itemId)}', '${escapeHtml(url)}', this)">Загрузить страницу</button>
-                                    </div>
-                                </div>
-                            `;
-                            }).join('');
-                        }
-                    } else {
-                        list.innerHTML = '<div class="loading">Ошибка: ' + escapeHtml(data.error) + '</div>';
-                    }
-                } catch (error) {
-                    list.innerHTML = '<div class="loading">Ошибка загрузки: ' + escapeHtml(error.message) + '</div>';
-                }
-            }
-            
-            function escapeHtml(text) {
-                const div = document.createElement('div');
-                div.textContent = text;
-                return div.innerHTML;
-            }
-            
-            function formatPrice(price) {
-                return new Intl.NumberFormat('ru-RU').format(price);
-            }
-            
-            // Modal functions
-            function openModal() {
-                document.getElementById('addModal').style.display = 'block';
-                document.getElementById('itemUrl').focus();
-            }
-            
-            function closeModal() {
-                document.getElementById('addModal').style.display = 'none';
-                document.getElementById('addForm').reset();
-                document.getElementById('errorMessage').style.display = 'none';
-            }
-            
-            // Close modal when clicking outside
-            window.onclick = function(event) {
-                const modal = document.getElementById('addModal');
-                if (event.target == modal) {
-                    closeModal();
-                }
-            }
-            
-            // Add item function
-            async function addItem(event) {
-                event.preventDefault();
-                const urlInput = document.getElementById('itemUrl');
-                const url = urlInput.value.trim();
-                const errorDiv = document.getElementById('errorMessage');
-                
-                if (!url) {
-                    errorDiv.textContent = 'Введите ссылку на товар';
-                    errorDiv.style.display = 'block';
-                    return;
-                }
-                
-                // Validate Ozon URL
-                if (!url.includes('ozon.') || !url.includes('/product/')) {
-                    errorDiv.textContent = 'Введите корректную ссылку на товар Ozon';
-                    errorDiv.style.display = 'block';
-                    return;
-                }
-                
-                errorDiv.style.display = 'none';
-                
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/favorites';
-                    const response = await fetch(apiUrl, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({ url: url })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        closeModal();
-                        loadFavorites(); // Reload list
-                    } else {
-                        errorDiv.textContent = data.error || 'Ошибка при добавлении товара';
-                        errorDiv.style.display = 'block';
-                    }
-                } catch (error) {
-                    errorDiv.textContent = 'Ошибка: ' + error.message;
-                    errorDiv.style.display = 'block';
-                }
-            }
-            
-            // Fetch product page function
-            async function fetchProductPage(productId, url, button) {
-                if (!url || url === '#') {
-                    alert('Нет ссылки на товар');
-                    return;
-                }
-                
-                button.disabled = true;
-                button.textContent = 'Загрузка...';
-                
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/fetch-page';
-                    const response = await fetch(apiUrl, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({
-                            url: url,
-                            product_id: productId
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        alert('Страница успешно загружена и сохранена!');
-                    } else {
-                        alert('Ошибка: ' + (data.error || 'Неизвестная ошибка'));
-                    }
-                } catch (error) {
-                    alert('Ошибка: ' + error.message);
-                } finally {
-                    button.disabled = false;
-                    button.textContent = 'Загрузить страницу';
-                }
-            }
-            
-            // Load last fetch info
-            async function loadLastFetchInfo() {
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/last-fetch';
-                    const response = await fetch(apiUrl);
-                    const data = await response.json();
-                    
-                    const badge = document.getElementById('last-fetch-badge');
-                    if (data.success && data.last_fetch) {
-                        const timestamp = new Date(data.last_fetch.timestamp);
-                        const formatted = timestamp.toLocaleString('ru-RU');
-                        badge.textContent = `Последний запрос: ${formatted}`;
-                        badge.classList.remove('empty');
-                    } else {
-                        badge.textContent = 'Запросов ещё не было';
-                        badge.classList.add('empty');
-                    }
-                } catch (error) {
-                    const badge = document.getElementById('last-fetch-badge');
-                    badge.textContent = 'Ошибка загрузки';
-                    badge.classList.add('empty');
-                }
-            }
-            
-            // Parse all products function
-            async function parseAllProducts() {
-                const button = document.getElementById('parse-all-btn');
-                const originalText = button.textContent;
-                
-                button.disabled = true;
-                button.textContent = 'Парсинг...';
-                
-                try {
-                    const apiUrl = window.location.pathname.replace(/\/$/, '') + '/api/parse-all';
-                    const response = await fetch(apiUrl, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        }
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        alert(`Парсинг завершен!\nВсего: ${data.total}\nУспешно: ${data.success_count}\nОшибок: ${data.error_count}`);
-                        loadFavorites(); // Reload list to show updated fetch times
-                        loadLastFetchInfo(); // Update last fetch badge
-                    } else {
-                        alert('Ошибка при парсинге: ' + (data.error || 'Неизвестная ошибка'));
-                    }
-                } catch (error) {
-                    alert('Ошибка: ' + error.message);
-                } finally {
-                    button.disabled = false;
-                    button.textContent = originalText;
-                }
-            }
-            
-            // Load on page load
-            loadFavorites();
-            loadLastFetchInfo();
-        </script>
-    </body>
-    </html>
-    """
-    return web.Response(text=html, content_type="text/html")
-
-
 def create_app() -> web.Application:
     """Create web application."""
     app = web.Application()
-    app.router.add_get("/", index)
+    assets.setup(app)
     app.router.add_get("/api/favorites", get_favorites)
     app.router.add_post("/api/favorites", add_favorite)
     app.router.add_post("/api/fetch-page", fetch_product_page)
     app.router.add_post("/api/parse-all", parse_all_products)
+    app.router.add_post("/api/parse-all/stream", parse_all_products_stream)
     app.router.add_get("/api/last-fetch", get_last_fetch_info)
+    app.router.add_get("/api/products/search", search_products)
+    app.router.add_get("/api/products/{product_id}/prices", get_product_prices)
+    app.router.add_get("/api/jobs", get_jobs)
+    app.router.add_get("/api/fetch-stats", get_fetch_stats)
     return app
 
 